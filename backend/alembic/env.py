@@ -8,7 +8,7 @@ from alembic import context
 
 # Import all models so Alembic detects them
 from app.models import *  # noqa: F401, F403
-from app.database import Base
+from app.database import Base, connect_args
 from app.config import settings
 
 config = context.config
@@ -38,6 +38,7 @@ async def run_async_migrations() -> None:
         config.get_section(config.config_ini_section, {}),
         prefix="sqlalchemy.",
         poolclass=pool.NullPool,
+        connect_args=connect_args(),
     )
     async with connectable.connect() as connection:
         await connection.run_sync(do_run_migrations)
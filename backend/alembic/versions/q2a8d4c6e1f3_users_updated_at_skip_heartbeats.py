@@ -0,0 +1,50 @@
+"""users updated_at trigger: skip heartbeat-only updates
+
+Revision ID: q2a8d4c6e1f3
+Revises: p1f4c2a90e6b
+Create Date: 2026-10-19 09:12:40.118203
+
+The session heartbeat flush (app/services/heartbeat_service.py) updates
+only users.session_last_active, every few seconds per active user. The
+BEFORE UPDATE trigger set_users_updated_at stamped updated_at on each of
+those writes, so updated_at stopped meaning "account last edited".
+
+The trigger now has a WHEN clause: it fires only when some column other
+than session_last_active (and updated_at itself) changes.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'q2a8d4c6e1f3'
+down_revision: Union[str, None] = 'p1f4c2a90e6b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS set_users_updated_at ON users")
+    op.execute(
+        """
+        CREATE TRIGGER set_users_updated_at
+            BEFORE UPDATE ON users
+            FOR EACH ROW
+            WHEN ((to_jsonb(OLD) - 'session_last_active' - 'updated_at')
+                  IS DISTINCT FROM (to_jsonb(NEW) - 'session_last_active' - 'updated_at'))
+            EXECUTE FUNCTION update_updated_at_column()
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS set_users_updated_at ON users")
+    op.execute(
+        """
+        CREATE TRIGGER set_users_updated_at
+            BEFORE UPDATE ON users
+            FOR EACH ROW
+            EXECUTE FUNCTION update_updated_at_column()
+        """
+    )
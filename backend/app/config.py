@@ -29,19 +29,98 @@ class Settings(BaseSettings):
     # admin + prod backends so the same laptop script can target either.
     BACKUP_INGEST_SECRET: str | None = None
 
+    # Bearer token Prometheus must send to scrape /metrics. If unset, the
+    # endpoint is disabled (returns 503).
+    METRICS_TOKEN: str | None = None
+    # Each worker publishes its metrics to METRICS_DIR every
+    # METRICS_SNAPSHOT_SECONDS so a scrape of any worker reports all of them
+    # (app/core/metrics.py); "" limits a scrape to the worker that answers.
+    METRICS_DIR: str = "/tmp/ssmspl-metrics"
+    METRICS_SNAPSHOT_SECONDS: int = 5
+
+    # SQL diagnostics (app/core/query_stats.py): log statements slower than
+    # SLOW_QUERY_MS, and any statement repeated more than N_PLUS_ONE_THRESHOLD
+    # times within one request.
+    SLOW_QUERY_MS: int = 200
+    N_PLUS_ONE_THRESHOLD: int = 10
+
+    # Event-loop watchdog (app/core/loop_monitor.py): sample loop lag every
+    # LOOP_MONITOR_INTERVAL_MS; capture the loop's stack when it is blocked
+    # for LOOP_STALL_THRESHOLD_MS or longer.
+    LOOP_MONITOR_INTERVAL_MS: int = 100
+    LOOP_STALL_THRESHOLD_MS: int = 250
+
+    # On-demand request profiles (app/core/profiler.py), shared by all
+    # workers in the container; the newest 50 are kept.
+    PROFILE_DIR: str = "/tmp/ssmspl-profiles"
+
+    # Worker memory (app/core/memory.py). RSS is sampled every
+    # MEMORY_SAMPLE_SECONDS; a worker that stays above WORKER_MAX_RSS_MB
+    # recycles itself (0 disables). TRACEMALLOC_FRAMES > 0 starts tracing
+    # at boot; it can also be toggled at runtime from the system-health API.
+    MEMORY_SAMPLE_SECONDS: int = 60
+    WORKER_MAX_RSS_MB: int = 768
+    TRACEMALLOC_FRAMES: int = 0
+    MEMORY_DIAG_DIR: str = "/tmp/ssmspl-memory"
+
+    # Each worker opens its DB pool and prepares the hot statements before
+    # serving (app/core/db_warmup.py), giving up after this many seconds.
+    # 0 disables the warm-up.
+    DB_WARMUP_TIMEOUT_S: float = 15
+
+    # QR PNGs (app/core/qr_cache.py): rendered on a thread pool, cached per
+    # worker (QR_CACHE_SIZE entries, ~50 KB each) and on disk in QR_CACHE_DIR,
+    # shared by the workers; "" disables the disk cache.
+    QR_RENDER_POOL_SIZE: int = 2
+    QR_CACHE_SIZE: int = 128
+    QR_CACHE_DIR: str = "/tmp/ssmspl-qr"
+    QR_CACHE_MAX_AGE_DAYS: int = 3
+    # ESC/POS receipts cached per worker (app/services/receipt_service.py)
+    PRINT_CACHE_SIZE: int = 256
+    # Portal item catalogue per route and booking network graph
+    # (app/core/catalogue_cache.py); master-data edits clear them in every
+    # worker through Redis, else on expiry. Also the network's browser max-age.
+    CATALOGUE_CACHE_TTL_SECONDS: int = 60
+
     # Security
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 5  # Short-lived — refresh tokens handle session continuity
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
     SESSION_IDLE_TIMEOUT_MINUTES: int = 10  # Force-logout after this many minutes of inactivity
+    # bcrypt runs on a bounded thread pool (app/core/crypto_executor.py).
+    # Work admitted beyond CRYPTO_QUEUE_LIMIT (running + waiting) gets a fast 503.
+    CRYPTO_POOL_SIZE: int = 2
+    CRYPTO_QUEUE_LIMIT: int = 32
+    # Verified access-token payloads cached per worker (app/core/token_cache.py)
+    TOKEN_CACHE_SIZE: int = 2048
+    # QR scan pre-filter (app/core/scan_guard.py). Codes that matched no
+    # booking or ticket are answered 404 from memory for SCAN_NEGATIVE_TTL_SECONDS.
+    # QR_ACCEPT_UNSIGNED keeps bare-UUID payloads (pre-HMAC QRs) working.
+    # SCAN_RATE_LIMIT applies per signed-in checker device.
+    SCAN_NEGATIVE_TTL_SECONDS: int = 30
+    SCAN_NEGATIVE_CACHE_SIZE: int = 4096
+    QR_ACCEPT_UNSIGNED: bool = True
+    SCAN_RATE_LIMIT: str = "90/minute"
 
     # Database
     DATABASE_URL: str
+    # Per-worker pool (app/database.py). DB_POOL_SIZE × gunicorn workers,
+    # plus overflow, must stay under Postgres max_connections unless
+    # PgBouncer sits in between.
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    # DATABASE_URL points at PgBouncer in transaction pooling mode: no
+    # prepared statement caching, and DB_POOL_SIZE=0 selects NullPool.
+    PGBOUNCER_TRANSACTION_MODE: bool = False
     # Optional secondary DB for sync-check diagnostics. Points to ssmspl_sync (mirrors prod).
     # When unset, the sync-check endpoint is disabled.
     SYNC_DATABASE_URL: str | None = None
 
+    # Optional offline IP-range database for session geolocation, built with
+    # scripts/build_geoip_db.py. When unset, lookups go to ip-api.com.
+    GEOIP_DB_PATH: str = ""
+
     # CORS
     ALLOWED_ORIGINS: str = "http://localhost:3000"
 
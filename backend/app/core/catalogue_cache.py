@@ -0,0 +1,113 @@
+"""Per-worker cache of the portal's online item catalogue, keyed by route.
+
+The portal booking form reloads the bookable items and their rates on
+every from/to change, and the answer only changes when someone edits an
+item or a rate.
+
+- Entries live CATALOGUE_CACHE_TTL_SECONDS at most (0 disables the cache).
+- `invalidate()` is awaited after every committed item or rate write
+  (item_service, item_rate_service). It drops the affected route, or
+  everything, in this worker at once, and broadcasts the drop on
+  INVALIDATE_CHANNEL over the token blacklist's Redis pub/sub, so every
+  other worker, in this container or another one on the same Redis (the
+  admin portal edits, the customer portal reads), drops it too. When
+  Redis is down, other workers catch up when their entry expires; after
+  the subscription comes back they clear everything. Booking creation
+  always re-reads rates from the database, so a stale catalogue can show
+  an old price but never charge one.
+- Every drop bumps a generation counter. A reader takes `generation()`
+  before its query and passes it to `put()`; if an invalidation landed
+  in between, the rows it read may predate the write and are not stored.
+- Each entry carries an ETag (a digest of the items), so the portal can
+  revalidate with If-None-Match and get a 304.
+- The booking network graph (booking_service.get_network_graph) is cached
+  the same way in one extra slot. Any invalidation drops it, so branch,
+  route and schedule writes call `invalidate()` too.
+"""
+import hashlib
+import time
+
+import orjson
+
+from app.config import settings
+from app.services import token_blacklist
+
+INVALIDATE_CHANNEL = "catalogue:invalidate"
+
+# route_id -> (expires (monotonic), etag, items)
+_entries: dict[int, tuple[float, str, list[dict]]] = {}
+# (expires (monotonic), etag, graph) of the booking network graph
+_network: tuple[float, str, dict] | None = None
+_generation = 0
+
+
+def generation() -> int:
+    return _generation
+
+
+def get(route_id: int) -> tuple[str, list[dict]] | None:
+    entry = _entries.get(route_id)
+    if entry is None:
+        return None
+    if entry[0] <= time.monotonic():
+        _entries.pop(route_id, None)
+        return None
+    return entry[1], entry[2]
+
+
+def _etag(value) -> str:
+    return '"' + hashlib.sha256(orjson.dumps(value)).hexdigest()[:20] + '"'
+
+
+def put(route_id: int, items: list[dict], read_generation: int) -> str:
+    """Store a route's catalogue, read under `read_generation`, and return its ETag."""
+    etag = _etag(items)
+    if settings.CATALOGUE_CACHE_TTL_SECONDS > 0 and read_generation == _generation:
+        _entries[route_id] = (time.monotonic() + settings.CATALOGUE_CACHE_TTL_SECONDS, etag, items)
+    return etag
+
+
+def get_network() -> tuple[str, dict] | None:
+    global _network
+    if _network is None:
+        return None
+    if _network[0] <= time.monotonic():
+        _network = None
+        return None
+    return _network[1], _network[2]
+
+
+def put_network(graph: dict, read_generation: int) -> str:
+    """Store the booking network graph, read under `read_generation`, and return its ETag."""
+    global _network
+    etag = _etag(graph)
+    if settings.CATALOGUE_CACHE_TTL_SECONDS > 0 and read_generation == _generation:
+        _network = (time.monotonic() + settings.CATALOGUE_CACHE_TTL_SECONDS, etag, graph)
+    return etag
+
+
+def _drop(route_id: int | None) -> None:
+    global _generation, _network
+    _generation += 1
+    _network = None
+    if route_id is None:
+        _entries.clear()
+    else:
+        _entries.pop(route_id, None)
+
+
+async def invalidate(route_id: int | None = None) -> None:
+    """Drop one route's catalogue, or all of them, in every worker."""
+    _drop(route_id)
+    await token_blacklist.publish(INVALIDATE_CHANNEL, "" if route_id is None else str(route_id))
+
+
+def _on_broadcast(data: str | None) -> None:
+    # None: the subscription was (re)established and drops may have been missed
+    try:
+        _drop(int(data) if data else None)
+    except ValueError:
+        _drop(None)
+
+
+token_blacklist.subscribe_channel(INVALIDATE_CHANNEL, _on_broadcast)
@@ -0,0 +1,76 @@
+"""Bounded thread pool for CPU-heavy crypto (bcrypt) off the event loop.
+
+A bcrypt check costs ~250ms of pure CPU. Run inline, it stalls every other
+request on the worker; at shift change, when dozens of billing operators
+log in at once, in-flight ticket requests queue up behind the hashes.
+
+bcrypt releases the GIL while hashing, so a small thread pool lets the
+event loop keep serving while hashes run. The pool is bounded in both
+threads (CRYPTO_POOL_SIZE) and admitted work (CRYPTO_QUEUE_LIMIT,
+running + waiting). Beyond that limit callers get an immediate 503 with
+Retry-After instead of joining a queue they would time out in anyway.
+
+The executor is created lazily on first use so it is never created in the
+gunicorn master before fork (preload_app=True).
+"""
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, TypeVar
+
+from fastapi import HTTPException, status
+
+from app.config import settings
+
+T = TypeVar("T")
+
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+_admitted = 0
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=settings.CRYPTO_POOL_SIZE,
+                    thread_name_prefix="crypto",
+                )
+    return _executor
+
+
+async def run_crypto(fn: Callable[..., T], *args) -> T:
+    """Run `fn(*args)` on the crypto pool, or raise 503 if the pool is saturated."""
+    global _admitted
+    if _admitted >= settings.CRYPTO_QUEUE_LIMIT:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Server busy. Please try again in a moment.",
+            headers={"Retry-After": "1"},
+        )
+    _admitted += 1
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_get_executor(), fn, *args)
+    finally:
+        _admitted -= 1
+
+
+def get_stats() -> dict:
+    """Current pool occupancy, for health/metrics reporting."""
+    return {
+        "pool_size": settings.CRYPTO_POOL_SIZE,
+        "queue_limit": settings.CRYPTO_QUEUE_LIMIT,
+        "admitted": _admitted,
+    }
+
+
+def shutdown() -> None:
+    """Stop the pool (lifespan shutdown). A later call recreates it lazily."""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
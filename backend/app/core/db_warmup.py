@@ -0,0 +1,117 @@
+"""Connection and statement warm-up, run in each worker before it serves.
+
+A fresh worker (deploy, RSS recycle) otherwise opens its pool connections
+and prepares statements on live requests: the first ticket or scan on each
+connection pays the TCP/auth handshake, SQLAlchemy's statement compilation
+and asyncpg's server-side PREPARE.
+
+`warm_up()` checks out DB_POOL_SIZE connections at once, so each one is
+opened rather than the same one reused, and runs the hot statements on
+every connection: the SQL compiled cache is per engine, but asyncpg's
+prepared statement cache is per connection. Behind PgBouncer
+(PGBOUNCER_TRANSACTION_MODE) nothing is prepared for reuse, so only the
+compiled cache and the client-side pool get warmed; with NullPool, a
+single pass warms the compiled cache.
+
+- rate lookups (`get_current_rate`, the batch check in `_enforce_db_rates`)
+- the single-statement verification lookup by QR code
+- the ticket and ticket-item INSERTs of `create_ticket`, as EXPLAIN only:
+  the server parses and plans them (loading the tables, indexes and
+  constraints into the backend's caches) but writes nothing, fires no
+  triggers and takes no row locks
+
+Reads use ids/codes that match no row. The statements must stay shaped
+like the service queries (same columns, same filters), or the warm-up
+prepares statements nobody runs.
+
+Failures are logged and never block startup; the worker just starts cold.
+"""
+from __future__ import annotations
+
+import asyncio
+import datetime
+import logging
+import time
+import uuid
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.database import AsyncSessionLocal
+
+logger = logging.getLogger("ssmspl.db")
+
+_NO_CODE = uuid.UUID(int=0)
+
+
+async def _warm_reads(session: AsyncSession) -> None:
+    from app.models.item_rate import ItemRate
+    from app.models.ticket import Ticket, TicketItem
+    from app.services.verification_service import _by_code_statement
+
+    statements = [
+        select(ItemRate)
+        .where(ItemRate.item_id == 0, ItemRate.route_id == 0, ItemRate.is_active == True)
+        .limit(1),
+        select(ItemRate.item_id, ItemRate.rate, ItemRate.levy).where(
+            ItemRate.item_id.in_([0]), ItemRate.route_id == 0, ItemRate.is_active == True,
+        ),
+        _by_code_statement(_NO_CODE),
+        select(func.coalesce(func.max(Ticket.id), 0)),
+        select(func.coalesce(func.max(TicketItem.id), 0)),
+    ]
+    for stmt in statements:
+        await session.execute(stmt)
+
+
+async def _warm_ticket_insert(session: AsyncSession) -> None:
+    from app.models.ticket import Ticket, TicketItem
+
+    # Same columns create_ticket sets, so the plan covers the same INSERT
+    statements = [
+        insert(Ticket).values(
+            id=-1, branch_id=0, ticket_no=0, ticket_date=datetime.date.today(),
+            departure=datetime.time(0, 0), route_id=0, amount=0, discount=0,
+            payment_mode_id=0, is_cancelled=False, net_amount=0,
+            status="CONFIRMED", verification_code=_NO_CODE, boat_id=None, ref_no=None,
+            created_by=None, is_multi_ticket=False, generated_at=datetime.datetime.now(datetime.timezone.utc),
+        ),
+        insert(TicketItem).values(
+            id=-1, ticket_id=-1, item_id=0, rate=0, levy=0, quantity=1,
+            vehicle_no=None, vehicle_name=None, is_cancelled=False,
+        ),
+    ]
+    conn = await session.connection()
+    for stmt in statements:
+        compiled = stmt.compile(dialect=conn.dialect)
+        params = tuple(compiled.params[name] for name in compiled.positiontup)
+        await conn.exec_driver_sql("EXPLAIN " + compiled.string, params)
+
+
+async def _warm_connection() -> None:
+    async with AsyncSessionLocal() as session:
+        try:
+            await _warm_reads(session)
+            await _warm_ticket_insert(session)
+        finally:
+            await session.rollback()
+
+
+async def warm_up() -> None:
+    """Open the pool and prepare the hot statements on every connection."""
+    if settings.DB_WARMUP_TIMEOUT_S <= 0:
+        return
+    connections = max(settings.DB_POOL_SIZE, 1)
+    start = time.perf_counter()
+    try:
+        await asyncio.wait_for(
+            asyncio.gather(*(_warm_connection() for _ in range(connections))),
+            timeout=settings.DB_WARMUP_TIMEOUT_S,
+        )
+    except Exception as e:  # noqa: BLE001 — a cold start beats no start
+        logger.warning("DB warm-up skipped, worker starts cold: %r", e)
+        return
+    logger.info(
+        "DB warm-up: %d connections ready in %.0fms", connections, (time.perf_counter() - start) * 1000,
+    )
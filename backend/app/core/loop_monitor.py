@@ -0,0 +1,138 @@
+"""Event-loop lag watchdog with stack capture for blocking calls.
+
+Anything synchronous on the event loop (PDF/QR rendering, a docker SDK
+call, a stray time.sleep) stalls every request on the worker, and nothing
+in the request metrics says which call it was.
+
+Two halves:
+
+- `loop_lag_loop()` runs on the loop: it sleeps LOOP_MONITOR_INTERVAL_MS
+  and records how late it woke up (`event_loop_lag_seconds`). Each tick
+  also stamps a heartbeat.
+- A daemon watchdog thread checks the heartbeat. When the loop is overdue
+  by LOOP_STALL_THRESHOLD_MS it grabs the loop thread's Python stack
+  (`sys._current_frames()`) and the running task *while the loop is still
+  blocked*, so the capture shows the offending call rather than whatever
+  runs after it. One capture per stall; the loop fills in the total
+  blocked time once it wakes up.
+
+Both run per worker and are started from the app lifespan (after fork).
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from datetime import datetime, timezone
+
+from app.config import settings
+from app.core import metrics
+
+logger = logging.getLogger("ssmspl.loop")
+
+STACK_DEPTH = 15
+WINDOW_S = 300
+
+_loop: asyncio.AbstractEventLoop | None = None
+_loop_thread_id: int | None = None
+_last_beat = 0.0
+_samples: deque[tuple[float, float]] = deque(maxlen=4096)
+_stalls: deque[dict] = deque(maxlen=20)
+_stalls_lock = threading.Lock()
+_pending: dict | None = None
+_stop: threading.Event | None = None
+
+
+def _capture(overdue: float) -> None:
+    global _pending
+    frame = sys._current_frames().get(_loop_thread_id)
+    stack = "".join(traceback.format_stack(frame)[-STACK_DEPTH:]) if frame else ""
+    task_name = None
+    try:
+        task = asyncio.current_task(_loop)
+        if task is not None:
+            task_name = f"{task.get_name()} ({task.get_coro().__qualname__})"
+    except Exception:  # noqa: BLE001 — best effort from a foreign thread
+        pass
+    record = {
+        "mono": time.monotonic(),
+        "at": datetime.now(timezone.utc).isoformat(),
+        "task": task_name,
+        "blocked_ms": None,
+        "stack": stack,
+    }
+    with _stalls_lock:
+        _stalls.append(record)
+        _pending = record
+    logger.warning(
+        "Event loop blocked for %.0fms+ in %s\n%s", overdue * 1000, task_name or "<no task>", stack,
+    )
+
+
+def _watchdog(stop: threading.Event) -> None:
+    interval = settings.LOOP_MONITOR_INTERVAL_MS / 1000
+    threshold = settings.LOOP_STALL_THRESHOLD_MS / 1000
+    captured_beat = 0.0
+    while not stop.wait(interval / 2):
+        beat = _last_beat
+        if not beat or beat == captured_beat:
+            continue
+        overdue = time.monotonic() - beat - interval
+        if overdue >= threshold:
+            captured_beat = beat
+            _capture(overdue)
+
+
+async def loop_lag_loop() -> None:
+    """Measure loop lag forever; starts the watchdog thread on first run."""
+    global _loop, _loop_thread_id, _last_beat, _pending, _stop
+    _loop = asyncio.get_running_loop()
+    _loop_thread_id = threading.get_ident()
+    _stop = threading.Event()
+    threading.Thread(target=_watchdog, args=(_stop,), name="loop-watchdog", daemon=True).start()
+
+    interval = settings.LOOP_MONITOR_INTERVAL_MS / 1000
+    threshold = settings.LOOP_STALL_THRESHOLD_MS / 1000
+    try:
+        while True:
+            start = time.monotonic()
+            _last_beat = start
+            await asyncio.sleep(interval)
+            lag = max(time.monotonic() - start - interval, 0.0)
+            metrics.LOOP_LAG.observe(lag)
+            _samples.append((start, lag))
+            if lag >= threshold:
+                metrics.LOOP_STALLS.inc()
+                with _stalls_lock:
+                    if _pending is not None:
+                        _pending["blocked_ms"] = round(lag * 1000)
+                        _pending = None
+    finally:
+        _stop.set()
+        _last_beat = 0.0
+
+
+def get_stats(recent: int = 5) -> dict:
+    """Lag over the last WINDOW_S seconds plus the most recent stall captures."""
+    cutoff = time.monotonic() - WINDOW_S
+    lags = sorted(lag for t, lag in list(_samples) if t >= cutoff)
+    with _stalls_lock:
+        stalls = [s for s in _stalls if s["mono"] >= cutoff]
+    p99 = lags[min(int(len(lags) * 0.99), len(lags) - 1)] if lags else None
+    return {
+        "running": bool(_last_beat),
+        "interval_ms": settings.LOOP_MONITOR_INTERVAL_MS,
+        "threshold_ms": settings.LOOP_STALL_THRESHOLD_MS,
+        "window_s": WINDOW_S,
+        "lag_p99_ms": round(p99 * 1000, 1) if p99 is not None else None,
+        "lag_max_ms": round(lags[-1] * 1000, 1) if lags else None,
+        "stalls_total": int(metrics.LOOP_STALLS.get()),
+        "stalls_in_window": len(stalls),
+        "recent_stalls": [
+            {k: v for k, v in s.items() if k != "mono"} for s in reversed(stalls[-recent:])
+        ],
+    }
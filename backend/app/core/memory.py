@@ -0,0 +1,284 @@
+"""Per-worker memory diagnostics: RSS history, tracemalloc reports, RSS recycling.
+
+`memory_loop()` runs in every worker (started from the app lifespan) and,
+every MEMORY_SAMPLE_SECONDS:
+
+- records the worker's RSS for the health status (the
+  `process_resident_memory_bytes` gauge reads it live);
+- if tracemalloc is on, takes a snapshot and writes this worker's report
+  to MEMORY_DIAG_DIR/worker-<pid>.json: top allocators by line and by
+  file, plus growth since the baseline snapshot and since the previous
+  one. A line that keeps growing across reports is the leak;
+- recycles the worker (SIGTERM to itself; gunicorn forks a fresh one)
+  once RSS has stayed above WORKER_MAX_RSS_MB for RECYCLE_AFTER_SAMPLES
+  samples. This replaces gunicorn's blind max_requests restarts.
+
+Tracing is switched on for all workers at once through a control file in
+the same directory (`set_tracing()`, called from the system-health API),
+or from boot with TRACEMALLOC_FRAMES. tracemalloc slows allocation-heavy
+code noticeably, so leave it off outside a leak hunt.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import random
+import signal
+import time
+import tracemalloc
+from collections import deque
+from datetime import datetime, timezone
+from pathlib import Path
+
+import psutil
+
+from app.config import settings
+
+logger = logging.getLogger("ssmspl.memory")
+
+HISTORY_LEN = 360  # 6h at the default 60s sample
+RECYCLE_AFTER_SAMPLES = 3
+TOP_N = 25
+# Deepest traceback the control API accepts (TracemallocControl.frames)
+MAX_TRACE_FRAMES = 25
+
+_process: psutil.Process | None = None
+_started = time.time()
+_history: deque[tuple[float, int]] = deque(maxlen=HISTORY_LEN)
+_baseline_rss: int | None = None
+_over_limit = 0
+_recycling = False
+
+_baseline: tracemalloc.Snapshot | None = None
+_baseline_at: str | None = None
+_previous: tracemalloc.Snapshot | None = None
+_control_nonce: str | None = None
+
+_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+def current_rss() -> int:
+    global _process
+    # Imported in the gunicorn master (preload_app); re-bind after fork
+    if _process is None or _process.pid != os.getpid():
+        _process = psutil.Process()
+    return _process.memory_info().rss
+
+
+def _diag_dir() -> Path:
+    return Path(settings.MEMORY_DIAG_DIR)
+
+
+def _under_gunicorn() -> bool:
+    # Set by the post_fork hook in gunicorn.conf.py; a bare uvicorn process
+    # must never SIGTERM itself.
+    return os.environ.get("SSMSPL_GUNICORN_WORKER") == "1"
+
+
+# ─── tracemalloc ────────────────────────────────────────────────────────
+
+def set_tracing(enabled: bool, frames: int = 1) -> dict:
+    """Ask every worker to start/stop tracing (applied on their next sample).
+
+    Each call also resets the workers' baseline snapshot.
+    """
+    control = {"enabled": enabled, "frames": frames, "nonce": os.urandom(4).hex()}
+    d = _diag_dir()
+    d.mkdir(parents=True, exist_ok=True)
+    (d / "control.json").write_text(json.dumps(control))
+    return control
+
+
+def _read_control() -> dict | None:
+    try:
+        return json.loads((_diag_dir() / "control.json").read_text())
+    except (OSError, ValueError):
+        return None
+
+
+def _apply_control() -> None:
+    global _control_nonce, _baseline, _baseline_at, _previous
+    control = _read_control()
+    if control is None or control.get("nonce") == _control_nonce:
+        return
+    _control_nonce = control.get("nonce")
+    _baseline = _baseline_at = _previous = None
+    if control.get("enabled"):
+        frames = max(1, min(int(control.get("frames", 1)), MAX_TRACE_FRAMES))
+        if tracemalloc.is_tracing() and tracemalloc.get_traceback_limit() != frames:
+            tracemalloc.stop()
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+            logger.info("tracemalloc started in worker %s (%d frames)", os.getpid(), frames)
+    elif tracemalloc.is_tracing():
+        tracemalloc.stop()
+        logger.info("tracemalloc stopped in worker %s", os.getpid())
+        (_diag_dir() / f"worker-{os.getpid()}.json").unlink(missing_ok=True)
+
+
+def _stat_rows(stats, diff: bool = False) -> list[dict]:
+    rows = []
+    for s in stats[:TOP_N]:
+        frame = s.traceback[0]
+        row = {
+            "where": f"{frame.filename}:{frame.lineno}",
+            "size_kb": round(s.size / 1024, 1),
+            "count": s.count,
+        }
+        if len(s.traceback) > 1:
+            row["traceback"] = [f"{f.filename}:{f.lineno}" for f in s.traceback]
+        if diff:
+            row["size_diff_kb"] = round(s.size_diff / 1024, 1)
+            row["count_diff"] = s.count_diff
+        rows.append(row)
+    return rows
+
+
+def _build_report() -> dict:
+    global _baseline, _baseline_at, _previous
+    snapshot = tracemalloc.take_snapshot().filter_traces(_FILTERS)
+    now = datetime.now(timezone.utc).isoformat()
+    if _baseline is None:
+        _baseline, _baseline_at = snapshot, now
+    key = "traceback" if tracemalloc.get_traceback_limit() > 1 else "lineno"
+    current, peak = tracemalloc.get_traced_memory()
+    report = {
+        "worker": os.getpid(),
+        "taken_at": now,
+        "baseline_at": _baseline_at,
+        "frames": tracemalloc.get_traceback_limit(),
+        "traced_mb": round(current / 2**20, 1),
+        "traced_peak_mb": round(peak / 2**20, 1),
+        "rss_mb": round(current_rss() / 2**20, 1),
+        "top_lines": _stat_rows(snapshot.statistics(key)),
+        "top_files": _stat_rows(snapshot.statistics("filename"))[:10],
+        "growth_since_baseline": _stat_rows(snapshot.compare_to(_baseline, key), diff=True),
+        "growth_since_previous": (
+            _stat_rows(snapshot.compare_to(_previous, key), diff=True)[:10] if _previous else []
+        ),
+    }
+    _previous = snapshot
+    return report
+
+
+def _write_report() -> None:
+    """Build this worker's report and publish it atomically (blocking; run in a thread)."""
+    report = _build_report()
+    d = _diag_dir()
+    d.mkdir(parents=True, exist_ok=True)
+    tmp = d / f".worker-{os.getpid()}.json.tmp"
+    tmp.write_text(json.dumps(report))
+    tmp.replace(d / f"worker-{os.getpid()}.json")
+
+
+def read_reports() -> dict:
+    """Latest tracemalloc report of every live worker, plus the tracing switch."""
+    d = _diag_dir()
+    reports = []
+    if d.exists():
+        for p in sorted(d.glob("worker-*.json")):
+            try:
+                report = json.loads(p.read_text())
+            except (OSError, ValueError):
+                continue
+            if not psutil.pid_exists(report.get("worker", -1)):
+                p.unlink(missing_ok=True)
+                continue
+            reports.append(report)
+    return {"control": _read_control(), "workers": reports}
+
+
+# ─── RSS ────────────────────────────────────────────────────────────────
+
+def _check_recycle(rss: int) -> None:
+    global _over_limit, _recycling
+    limit = settings.WORKER_MAX_RSS_MB * 2**20
+    if not limit or _recycling or not _under_gunicorn():
+        return
+    if _baseline_rss is not None and _baseline_rss >= limit:
+        # Already over the limit at boot: recycling would only loop
+        if _over_limit == 0:
+            logger.error(
+                "Worker %s starts at %d MB, above WORKER_MAX_RSS_MB=%d; RSS recycling disabled",
+                os.getpid(), _baseline_rss // 2**20, settings.WORKER_MAX_RSS_MB,
+            )
+        _over_limit = -1
+        return
+    _over_limit = _over_limit + 1 if rss > limit else 0
+    if _over_limit >= RECYCLE_AFTER_SAMPLES:
+        _recycling = True
+        asyncio.get_running_loop().create_task(_recycle(rss))
+
+
+async def _recycle(rss: int) -> None:
+    # Jitter so workers that grow in step don't all restart together
+    await asyncio.sleep(random.uniform(0, settings.MEMORY_SAMPLE_SECONDS))
+    logger.warning(
+        "Recycling worker %s: RSS %d MB above WORKER_MAX_RSS_MB=%d for %d samples (up %.0f min)",
+        os.getpid(), rss // 2**20, settings.WORKER_MAX_RSS_MB, RECYCLE_AFTER_SAMPLES,
+        (time.time() - _started) / 60,
+    )
+    # Graceful: the uvicorn worker finishes in-flight requests and runs the
+    # lifespan shutdown; the gunicorn master forks a replacement.
+    os.kill(os.getpid(), signal.SIGTERM)
+
+
+def rss_status() -> dict:
+    """This worker's RSS now and over time, plus sibling workers' RSS."""
+    rss = current_rss()
+    now = time.time()
+    history = list(_history)
+    out = {
+        "worker": os.getpid(),
+        "uptime_min": round((now - _started) / 60, 1),
+        "rss_mb": round(rss / 2**20, 1),
+        "start_rss_mb": round(_baseline_rss / 2**20, 1) if _baseline_rss else None,
+        "peak_rss_mb": round(max([rss] + [r for _, r in history]) / 2**20, 1),
+        "limit_mb": settings.WORKER_MAX_RSS_MB or None,
+        "tracemalloc": tracemalloc.is_tracing(),
+        # One point per 10 samples keeps the payload small (~36 points / 6h)
+        "history": [
+            {"t": datetime.fromtimestamp(t, timezone.utc).isoformat(), "rss_mb": round(r / 2**20, 1)}
+            for t, r in history[::-10][::-1]
+        ],
+    }
+    # Trend only once there is enough history for it to mean anything
+    if len(history) >= 2 and history[-1][0] - history[0][0] >= 600:
+        hours = (history[-1][0] - history[0][0]) / 3600
+        out["growth_mb_per_h"] = round((history[-1][1] - history[0][1]) / 2**20 / hours, 1)
+    if _under_gunicorn():
+        try:
+            out["workers"] = [
+                {"pid": p.pid, "rss_mb": round(p.memory_info().rss / 2**20, 1)}
+                for p in psutil.Process(os.getppid()).children()
+            ]
+        except psutil.Error:
+            pass
+    return out
+
+
+async def memory_loop() -> None:
+    global _baseline_rss, _started
+    _started = time.time()
+    if settings.TRACEMALLOC_FRAMES and not tracemalloc.is_tracing():
+        tracemalloc.start(settings.TRACEMALLOC_FRAMES)
+    while True:
+        try:
+            rss = current_rss()
+            if _baseline_rss is None:
+                _baseline_rss = rss
+            _history.append((time.time(), rss))
+            _check_recycle(rss)
+            _apply_control()
+            if tracemalloc.is_tracing():
+                await asyncio.to_thread(_write_report)
+        except Exception:
+            logger.exception("Memory sample failed")
+        await asyncio.sleep(settings.MEMORY_SAMPLE_SECONDS)
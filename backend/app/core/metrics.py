@@ -0,0 +1,363 @@
+"""In-process request/DB metrics with Prometheus text exposition.
+
+Deliberately tiny (no prometheus_client dependency): counters, gauges and
+fixed-bucket histograms keyed by label tuples, all plain dicts updated from
+the event loop thread. Recording costs a couple of dict lookups and one
+bisect per request.
+
+Metrics are recorded per worker, but a scrape reports all of them. Every
+worker writes its rendered series to METRICS_DIR/worker-<pid>.json every
+METRICS_SNAPSHOT_SECONDS (`metrics_snapshot_loop()`, started from the app
+lifespan). The worker that answers the scrape renders its own series live
+and merges in the latest snapshot of every other live worker, so whichever
+worker nginx picks, Prometheus sees every process. Peers lag by at most one
+snapshot interval. Every series carries a `worker` label (the PID);
+aggregate with sum() / histogram_quantile() over `worker`. A worker that
+exits removes its file, and files of dead PIDs are dropped at scrape time.
+METRICS_DIR="" limits a scrape to the answering worker.
+"""
+from __future__ import annotations
+
+import asyncio
+import bisect
+import logging
+import os
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Callable
+
+import orjson
+import psutil
+
+from app.config import settings
+
+logger = logging.getLogger("ssmspl.metrics")
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _fmt_labels(names: tuple[str, ...], values: tuple, extra: str = "") -> str:
+    parts = [f'{n}="{_escape(str(v))}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _fmt_num(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+
+class _Metric(ABC):
+    kind = ""
+
+    def __init__(self, name: str, help_text: str, labels: tuple[str, ...] = ()):
+        self.name = name
+        self.help = help_text
+        self.labels = labels
+        REGISTRY.append(self)
+
+    @abstractmethod
+    def render(self, worker: str) -> list[str]:
+        """Exposition lines of every series, each labelled with `worker`."""
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name, help_text, labels=()):
+        super().__init__(name, help_text, labels)
+        self.values: dict[tuple, float] = {}
+
+    def inc(self, labels: tuple = (), amount: float = 1) -> None:
+        self.values[labels] = self.values.get(labels, 0) + amount
+
+    def get(self, labels: tuple = ()) -> float:
+        return self.values.get(labels, 0)
+
+    def render(self, worker: str) -> list[str]:
+        return [
+            f"{self.name}{_fmt_labels(self.labels, k, worker)} {_fmt_num(v)}"
+            for k, v in self.values.items()
+        ]
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(self, name, help_text, labels=(), collect: Callable[[], float] | None = None):
+        super().__init__(name, help_text, labels)
+        self.values: dict[tuple, float] = {}
+        self._collect = collect
+
+    def inc(self, labels: tuple = (), amount: float = 1) -> None:
+        self.values[labels] = self.values.get(labels, 0) + amount
+
+    def dec(self, labels: tuple = (), amount: float = 1) -> None:
+        self.values[labels] = self.values.get(labels, 0) - amount
+
+    def set(self, value: float, labels: tuple = ()) -> None:
+        self.values[labels] = value
+
+    def get(self, labels: tuple = ()) -> float:
+        if self._collect is not None:
+            return self._collect()
+        return self.values.get(labels, 0)
+
+    def render(self, worker: str) -> list[str]:
+        if self._collect is not None:
+            try:
+                self.values[()] = self._collect()
+            except Exception:  # noqa: BLE001 — a broken collector must not break the scrape
+                return []
+        return [
+            f"{self.name}{_fmt_labels(self.labels, k, worker)} {_fmt_num(v)}"
+            for k, v in self.values.items()
+        ]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, help_text, labels=(), buckets: tuple[float, ...] = LATENCY_BUCKETS):
+        super().__init__(name, help_text, labels)
+        self.buckets = buckets
+        # labels -> [per-bucket counts (last = +Inf), sum, count]
+        self.values: dict[tuple, list] = {}
+
+    def observe(self, value: float, labels: tuple = ()) -> None:
+        entry = self.values.get(labels)
+        if entry is None:
+            entry = self.values[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        entry[0][bisect.bisect_left(self.buckets, value)] += 1
+        entry[1] += value
+        entry[2] += 1
+
+    def quantile(self, q: float, labels: tuple = ()) -> float | None:
+        """Upper bound of the bucket holding the q-quantile (None if no data)."""
+        entry = self.values.get(labels)
+        if not entry or not entry[2]:
+            return None
+        target = q * entry[2]
+        running = 0
+        for bound, n in zip(self.buckets + (float("inf"),), entry[0]):
+            running += n
+            if running >= target:
+                return bound
+        return float("inf")
+
+    def render(self, worker: str) -> list[str]:
+        lines = []
+        for k, (counts, total, count) in self.values.items():
+            running = 0
+            for bound, n in zip(self.buckets + (float("inf"),), counts):
+                running += n
+                le = f'le="{_fmt_num(bound)}"'
+                lines.append(f"{self.name}_bucket{_fmt_labels(self.labels, k, worker + ',' + le)} {running}")
+            lines.append(f"{self.name}_sum{_fmt_labels(self.labels, k, worker)} {_fmt_num(total)}")
+            lines.append(f"{self.name}_count{_fmt_labels(self.labels, k, worker)} {count}")
+        return lines
+
+
+REGISTRY: list[_Metric] = []
+
+
+def _families() -> list[list]:
+    """This worker's series as [name, help, kind, lines] per non-empty metric."""
+    worker = f'worker="{os.getpid()}"'
+    out = []
+    for metric in REGISTRY:
+        lines = metric.render(worker)
+        if lines:
+            out.append([metric.name, metric.help, metric.kind, lines])
+    return out
+
+
+def _snapshot_path(pid: int) -> Path | None:
+    if not settings.METRICS_DIR:
+        return None
+    return Path(settings.METRICS_DIR) / f"worker-{pid}.json"
+
+
+def write_snapshot(families: list[list] | None = None) -> None:
+    """Publish this worker's series for the other workers' scrapes (atomic)."""
+    path = _snapshot_path(os.getpid())
+    if path is None:
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.tmp")
+    tmp.write_bytes(orjson.dumps(_families() if families is None else families))
+    tmp.replace(path)
+
+
+def _peer_families() -> list[list]:
+    """Latest snapshot of every other live worker."""
+    own = _snapshot_path(os.getpid())
+    if own is None or not own.parent.exists():
+        return []
+    out = []
+    for p in sorted(own.parent.glob("worker-*.json")):
+        if p == own:
+            continue
+        try:
+            pid = int(p.stem.removeprefix("worker-"))
+            if not psutil.pid_exists(pid):
+                p.unlink(missing_ok=True)
+                continue
+            out.extend(orjson.loads(p.read_bytes()))
+        except (OSError, ValueError):
+            continue
+    return out
+
+
+def render_prometheus() -> str:
+    """Metrics of every live worker in Prometheus text exposition format 0.0.4."""
+    own = _families()
+    try:
+        write_snapshot(own)
+        peers = _peer_families()
+    except OSError as e:
+        logger.warning("Metrics snapshot dir unusable, scraping this worker only: %r", e)
+        peers = []
+    # One HELP/TYPE block per metric, holding the lines of all workers
+    merged: dict[str, list] = {}
+    for name, help_text, kind, lines in own + peers:
+        entry = merged.setdefault(name, [help_text, kind, []])
+        entry[2].extend(lines)
+    out = []
+    for name, (help_text, kind, lines) in merged.items():
+        out.append(f"# HELP {name} {help_text}")
+        out.append(f"# TYPE {name} {kind}")
+        out.extend(lines)
+    return "\n".join(out) + "\n"
+
+
+async def metrics_snapshot_loop() -> None:
+    """Publish this worker's snapshot every METRICS_SNAPSHOT_SECONDS; remove it on exit."""
+    if not settings.METRICS_DIR:
+        return
+    try:
+        while True:
+            try:
+                families = _families()
+                await asyncio.to_thread(write_snapshot, families)
+            except Exception:
+                logger.exception("Metrics snapshot failed")
+            await asyncio.sleep(settings.METRICS_SNAPSHOT_SECONDS)
+    finally:
+        _snapshot_path(os.getpid()).unlink(missing_ok=True)
+
+
+# ─── HTTP ───────────────────────────────────────────────────────────────
+
+HTTP_REQUESTS = Counter(
+    "http_requests_total", "HTTP requests by route template and status.", ("method", "route", "status")
+)
+HTTP_LATENCY = Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template.", ("method", "route")
+)
+HTTP_RESPONSE_SIZE = Histogram(
+    "http_response_size_bytes", "HTTP response body size by route template.", ("method", "route"),
+    buckets=SIZE_BUCKETS,
+)
+HTTP_IN_FLIGHT = Gauge("http_requests_in_flight", "HTTP requests currently being served.")
+HTTP_DB_QUERIES = Histogram(
+    "http_request_db_queries", "SQL statements issued per request by route template.", ("method", "route"),
+    buckets=(1, 2, 3, 5, 8, 13, 21, 34, 55, 89),
+)
+HTTP_DB_TIME = Histogram(
+    "http_request_db_seconds", "Time spent in SQL per request by route template.", ("method", "route")
+)
+
+
+# ─── Event loop ─────────────────────────────────────────────────────────
+
+LOOP_LAG = Histogram(
+    "event_loop_lag_seconds", "How late the event loop woke from a timed sleep (app/core/loop_monitor.py).",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+LOOP_STALLS = Counter(
+    "event_loop_stalls_total", "Ticks where loop lag exceeded LOOP_STALL_THRESHOLD_MS."
+)
+
+
+# ─── QR scans ───────────────────────────────────────────────────────────
+
+SCAN_REJECTED = Counter(
+    "qr_scan_rejected_total",
+    "QR scans answered without a DB lookup (app/core/scan_guard.py).",
+    labels=("reason",),
+)
+
+
+# ─── Process ────────────────────────────────────────────────────────────
+
+def _rss() -> float:
+    from app.core.memory import current_rss
+    return current_rss()
+
+
+PROCESS_RSS = Gauge("process_resident_memory_bytes", "Resident set size of this worker.", collect=_rss)
+
+
+# ─── DB pool ────────────────────────────────────────────────────────────
+
+def _pool_stat(name: str) -> int:
+    from app.database import get_engine
+    # NullPool (PgBouncer mode, DB_POOL_SIZE=0) keeps no counters
+    stat = getattr(get_engine().pool, name, None)
+    return max(stat(), 0) if stat else 0
+
+
+DB_POOL_WAIT = Histogram("db_pool_wait_seconds", "Time spent waiting to check out a DB connection.")
+DB_POOL_SIZE = Gauge("db_pool_size", "Configured DB pool size.", collect=lambda: _pool_stat("size"))
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out", "DB connections currently checked out.", collect=lambda: _pool_stat("checkedout")
+)
+DB_POOL_OVERFLOW = Gauge(
+    "db_pool_overflow", "DB connections open beyond pool_size.", collect=lambda: _pool_stat("overflow")
+)
+
+
+def pool_stats() -> dict:
+    return {
+        "size": _pool_stat("size"),
+        "checked_out": _pool_stat("checkedout"),
+        "overflow": _pool_stat("overflow"),
+        "wait_p95_s": DB_POOL_WAIT.quantile(0.95),
+    }
+
+
+def http_summary(top: int = 5) -> dict:
+    """Compact per-route view for the system-health snapshot."""
+    total = sum(HTTP_REQUESTS.values.values())
+    errors = sum(v for (_, _, status), v in HTTP_REQUESTS.values.items() if status.startswith("5"))
+    routes = []
+    for (method, route), (_, seconds, count) in HTTP_LATENCY.values.items():
+        routes.append({
+            "route": f"{method} {route}",
+            "count": count,
+            "mean_ms": round(seconds / count * 1000, 1),
+            "p95_ms": _ms(HTTP_LATENCY.quantile(0.95, (method, route))),
+        })
+    routes.sort(key=lambda r: r["mean_ms"], reverse=True)
+    return {
+        "requests": int(total),
+        "errors_5xx": int(errors),
+        "in_flight": int(HTTP_IN_FLIGHT.get()),
+        "slowest_routes": routes[:top],
+    }
+
+
+def _ms(seconds: float | None) -> float | None:
+    if seconds is None:
+        return None
+    if seconds == float("inf"):
+        return float(LATENCY_BUCKETS[-1] * 1000)
+    return round(seconds * 1000, 1)
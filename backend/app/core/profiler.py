@@ -0,0 +1,172 @@
+"""Single-request wall-clock sampling profiler.
+
+Armed per request by ProfilerMiddleware (app/middleware/profiler.py) for
+SUPER_ADMIN callers only. Nothing here runs unless a request asks for it.
+
+A sampler thread wakes every SAMPLE_INTERVAL_S and records one stack for
+the profiled request's asyncio task:
+
+- task running on the loop: the loop thread's real Python stack
+  (`sys._current_frames()`), so CPU-bound work shows up where it happens;
+- task suspended: the coroutine await chain (`cr_await`), ending in an
+  `[await]` leaf, so time spent waiting on the DB, Redis or HTTP is
+  attributed to the awaiting line. If the awaited future is already done
+  the leaf is `[ready, loop busy]`: the request could run but another task
+  held the loop.
+
+Stacks are written in the collapsed "folded" format (`a;b;c 4200`, counts
+in microseconds of wall time), which flamegraph.pl, speedscope and inferno
+read directly. Profiles go to PROFILE_DIR so any worker can serve them
+back via /api/profiler.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from types import FrameType
+
+from app.config import settings
+
+SAMPLE_INTERVAL_S = 0.001
+KEEP_PROFILES = 50
+
+_busy = threading.Lock()
+
+
+def _label(frame: FrameType) -> str:
+    code = frame.f_code
+    where = "/".join(code.co_filename.rsplit("/", 2)[-2:])
+    return f"{code.co_name} ({where}:{code.co_firstlineno})".replace(";", ":")
+
+
+class RequestSampler:
+    """Samples one asyncio task from a background thread until stopped."""
+
+    def __init__(self, task: asyncio.Task, entry_frame: FrameType):
+        self.task = task
+        self.loop = task.get_loop()
+        self.loop_thread_id = threading.get_ident()
+        # Frames above the middleware (uvicorn/server plumbing) are cut off
+        self.entry_frame = entry_frame
+        self.stacks: Counter[str] = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+        self.started = 0.0
+        self.elapsed = 0.0
+
+    def start(self) -> None:
+        self.started = time.perf_counter()
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+        self.elapsed = time.perf_counter() - self.started
+
+    def _run(self) -> None:
+        last = time.perf_counter()
+        while not self._stop.wait(SAMPLE_INTERVAL_S):
+            # CPU-bound Python holds the GIL for up to the switch interval
+            # (5ms), so samples arrive unevenly; weight each by the wall
+            # time it stands for, in microseconds.
+            now = time.perf_counter()
+            weight, last = round((now - last) * 1_000_000), now
+            try:
+                frames = self._sample()
+            except Exception:  # noqa: BLE001 — a torn read just drops one sample
+                continue
+            if frames:
+                self.stacks[";".join(frames)] += weight
+                self.samples += 1
+
+    def _sample(self) -> list[str]:
+        if self.task.done():
+            return []
+        if asyncio.current_task(self.loop) is self.task:
+            frame = sys._current_frames().get(self.loop_thread_id)
+            chain = []
+            while frame is not None:
+                chain.append(frame)
+                frame = frame.f_back
+            chain.reverse()
+            leaf = None
+        else:
+            chain, awaited = [], self.task.get_coro()
+            while awaited is not None:
+                frame = getattr(awaited, "cr_frame", None) or getattr(awaited, "gi_frame", None)
+                if frame is None:
+                    break
+                chain.append(frame)
+                awaited = getattr(awaited, "cr_await", None) or getattr(awaited, "gi_yieldfrom", None)
+            ready = isinstance(awaited, asyncio.Future) and awaited.done()
+            leaf = "[ready, loop busy]" if ready else "[await]"
+        if self.entry_frame in chain:
+            chain = chain[chain.index(self.entry_frame):]
+        labels = [_label(f) for f in chain]
+        if leaf:
+            labels.append(leaf)
+        return labels
+
+    def folded(self) -> str:
+        return "".join(f"{stack} {n}\n" for stack, n in self.stacks.most_common())
+
+
+def try_acquire() -> bool:
+    """One profiled request per worker at a time."""
+    return _busy.acquire(blocking=False)
+
+
+def release() -> None:
+    _busy.release()
+
+
+def _profile_dir() -> Path:
+    return Path(settings.PROFILE_DIR)
+
+
+def save(profile_id: str, sampler: RequestSampler, meta: dict) -> None:
+    """Write `<id>.folded` + `<id>.json` and prune to KEEP_PROFILES (blocking; run in a thread)."""
+    d = _profile_dir()
+    d.mkdir(parents=True, exist_ok=True)
+    (d / f"{profile_id}.folded").write_text(sampler.folded())
+    meta = {
+        **meta,
+        "id": profile_id,
+        "worker": os.getpid(),
+        "duration_ms": round(sampler.elapsed * 1000, 1),
+        "samples": sampler.samples,
+        "interval_ms": SAMPLE_INTERVAL_S * 1000,
+    }
+    (d / f"{profile_id}.json").write_text(json.dumps(meta))
+    metas = sorted(d.glob("*.json"), key=lambda p: p.stat().st_mtime, reverse=True)
+    for old in metas[KEEP_PROFILES:]:
+        old.unlink(missing_ok=True)
+        old.with_suffix(".folded").unlink(missing_ok=True)
+
+
+def list_profiles() -> list[dict]:
+    d = _profile_dir()
+    if not d.exists():
+        return []
+    out = []
+    for p in sorted(d.glob("*.json"), key=lambda p: p.stat().st_mtime, reverse=True):
+        try:
+            out.append(json.loads(p.read_text()))
+        except (OSError, ValueError):
+            continue
+    return out
+
+
+def read_profile(profile_id: str) -> str | None:
+    # ids are hex; anything else cannot name a file we wrote
+    if not profile_id.isalnum():
+        return None
+    p = _profile_dir() / f"{profile_id}.folded"
+    return p.read_text() if p.exists() else None
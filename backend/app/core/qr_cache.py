@@ -0,0 +1,238 @@
+"""Cached, off-loop QR rendering for the ticket and booking QR endpoints.
+
+A styled QR (qr_image.render_qr_png) costs tens of milliseconds of pure
+CPU. Rendered inline it stalls every other request on the worker, and the
+same ticket's QR is fetched again on every reprint and page refresh.
+
+- Rendering runs on a small thread pool (QR_RENDER_POOL_SIZE), created
+  lazily so it never exists in the gunicorn master before fork.
+- Finished images are kept in a per-worker LRU (QR_CACHE_SIZE entries,
+  keyed by verification_code and format) and on disk under QR_CACHE_DIR, which all
+  workers in the container share. Files older than QR_CACHE_MAX_AGE_DAYS
+  are pruned now and then; QR_CACHE_DIR="" turns the disk cache off.
+- Concurrent requests for one code share a single render.
+- Formats (FORMATS): the styled PNG, plus the plain thermal renderings
+  of qr_thermal (1-bit PNG, SVG, ESC/POS raster).
+- Ticket creation queues the new codes (`schedule_prerender()`); a
+  per-worker loop (`prerender_loop()`, started from the app lifespan)
+  renders them in PRERENDER_FORMATS, so the print that follows finds them
+  ready. The loop runs outside the request, so the renders never count
+  towards the creating request's latency.
+- A code's QR never changes, so responses carry an ETag and an immutable
+  Cache-Control; a matching If-None-Match is answered 304 without
+  rendering anything.
+
+The disk file name includes the payload signature, so rotating
+SECRET_KEY never serves a QR signed with the old key. Bump RENDER_VERSION
+when the QR styling changes.
+"""
+import asyncio
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from fastapi import Request
+from fastapi.responses import Response
+
+from app.config import settings
+from app.services.qr_service import generate_qr_payload, qr_signature
+
+logger = logging.getLogger("ssmspl")
+
+RENDER_VERSION = 1
+PRUNE_EVERY = 500  # disk writes between prunes
+CACHE_CONTROL = "private, max-age=31536000, immutable"
+
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+_memory: OrderedDict[tuple[str, str], bytes] = OrderedDict()
+_inflight: dict[tuple[str, str], asyncio.Future] = {}
+
+# format -> (media type, file suffix)
+FORMATS = {
+    "styled": ("image/png", "png"),
+    "thermal": ("image/png", "thermal.png"),
+    "svg": ("image/svg+xml", "svg"),
+    "escpos": ("application/octet-stream", "escpos"),
+}
+# Formats a new ticket's print asks for: the browser receipt's styled PNG
+# (frontend/src/lib/print-receipt.ts). Add a format here once a client
+# prints with it.
+PRERENDER_FORMATS = ("styled",)
+# Pending batches of new codes; bounded, a full queue skips the warm-up
+PRERENDER_QUEUE_SIZE = 64
+_prerender_queue: asyncio.Queue[list[str]] | None = None
+_writes = 0
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=settings.QR_RENDER_POOL_SIZE,
+                    thread_name_prefix="qr-render",
+                )
+    return _executor
+
+
+def etag(verification_code: str, fmt: str = "styled") -> str:
+    return f'"qr{RENDER_VERSION}-{fmt}-{qr_signature(verification_code)}"'
+
+
+# ─── disk ───────────────────────────────────────────────────────────────
+
+def _disk_path(payload: str, fmt: str) -> Path | None:
+    if not settings.QR_CACHE_DIR:
+        return None
+    return Path(settings.QR_CACHE_DIR) / f"v{RENDER_VERSION}" / f"{payload}.{FORMATS[fmt][1]}"
+
+
+def _prune(directory: Path) -> None:
+    cutoff = time.time() - settings.QR_CACHE_MAX_AGE_DAYS * 86400
+    removed = 0
+    for p in directory.iterdir():
+        try:
+            if p.stat().st_mtime < cutoff:
+                p.unlink()
+                removed += 1
+        except OSError:
+            continue
+    if removed:
+        logger.info("QR cache: pruned %d files from %s", removed, directory)
+
+
+def _render(payload: str, fmt: str) -> bytes:
+    if fmt == "styled":
+        from app.services.qr_image import render_qr_png
+        return render_qr_png(payload)
+    from app.services.qr_thermal import render_qr_thermal
+    return render_qr_thermal(payload, "png" if fmt == "thermal" else fmt)
+
+
+def _load_or_render(payload: str, fmt: str) -> bytes:
+    """Disk cache hit, or render and store (blocking; runs on the pool)."""
+    global _writes
+    path = _disk_path(payload, fmt)
+    if path is not None:
+        try:
+            return path.read_bytes()
+        except OSError:
+            pass
+
+    content = _render(payload, fmt)
+
+    if path is not None:
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Atomic publish: another worker may be reading the same file
+            tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp.write_bytes(content)
+            tmp.replace(path)
+        except OSError as e:
+            logger.warning("QR cache: could not write %s: %r", path, e)
+        else:
+            _writes += 1
+            if _writes % PRUNE_EVERY == 0:
+                _prune(path.parent)
+    return content
+
+
+# ─── memory ─────────────────────────────────────────────────────────────
+
+def _remember(key: tuple[str, str], content: bytes) -> None:
+    if settings.QR_CACHE_SIZE <= 0:
+        return
+    _memory[key] = content
+    _memory.move_to_end(key)
+    while len(_memory) > settings.QR_CACHE_SIZE:
+        _memory.popitem(last=False)
+
+
+async def get_qr(verification_code: str, fmt: str = "styled") -> bytes:
+    """The QR image for a verification code, from cache or rendered off the event loop."""
+    key = (verification_code, fmt)
+    content = _memory.get(key)
+    if content is not None:
+        _memory.move_to_end(key)
+        return content
+
+    pending = _inflight.get(key)
+    if pending is not None:
+        return await asyncio.shield(pending)
+
+    loop = asyncio.get_running_loop()
+    future = loop.run_in_executor(
+        _get_executor(), _load_or_render, generate_qr_payload(verification_code), fmt,
+    )
+    _inflight[key] = future
+    try:
+        content = await asyncio.shield(future)
+    finally:
+        _inflight.pop(key, None)
+    _remember(key, content)
+    return content
+
+
+async def qr_response(request: Request, verification_code: str, fmt: str = "styled") -> Response:
+    """Image response with ETag/immutable caching; 304 when the client already has it."""
+    tag = etag(verification_code, fmt)
+    headers = {"ETag": tag, "Cache-Control": CACHE_CONTROL}
+    if tag in request.headers.get("if-none-match", ""):
+        return Response(status_code=304, headers=headers)
+    content = await get_qr(verification_code, fmt)
+    return Response(content=content, media_type=FORMATS[fmt][0], headers=headers)
+
+
+async def _warm(verification_code: str, fmt: str) -> None:
+    try:
+        await get_qr(verification_code, fmt)
+    except Exception:
+        logger.exception("QR pre-render failed for %s (%s)", verification_code, fmt)
+
+
+async def prerender(verification_codes: list[str]) -> None:
+    """Warm the cache for freshly created tickets.
+
+    The counter prints right after creating a ticket; its QR request then
+    hits the cache, or joins the render this started. All renders are
+    queued at once; the pool bounds concurrency.
+    """
+    await asyncio.gather(*(
+        _warm(code, fmt) for code in verification_codes if code for fmt in PRERENDER_FORMATS
+    ))
+
+
+def schedule_prerender(verification_codes: list[str]) -> None:
+    """Hand new codes to this worker's pre-render loop. Never blocks."""
+    if _prerender_queue is None:
+        return
+    try:
+        _prerender_queue.put_nowait(verification_codes)
+    except asyncio.QueueFull:
+        logger.debug("QR pre-render queue full; skipping %d codes", len(verification_codes))
+
+
+async def prerender_loop() -> None:
+    """Background worker: drain the pre-render queue one batch at a time."""
+    global _prerender_queue
+    _prerender_queue = asyncio.Queue(maxsize=PRERENDER_QUEUE_SIZE)
+    try:
+        while True:
+            await prerender(await _prerender_queue.get())
+    finally:
+        _prerender_queue = None
+
+
+def shutdown() -> None:
+    """Stop the pool (lifespan shutdown). A later call recreates it lazily."""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
@@ -0,0 +1,131 @@
+"""Per-request SQL accounting: query count, DB time, slow queries, N+1 hints.
+
+SQLAlchemy cursor-execute hooks add every statement's count and duration to
+the QueryStats object held in a contextvar. MetricsMiddleware opens one per
+HTTP request; SQLAlchemy's greenlet bridge carries the context into the
+driver calls, so the hooks see the right request.
+
+- Statements slower than SLOW_QUERY_MS are logged with their route.
+- A statement text executed more than N_PLUS_ONE_THRESHOLD times in one
+  request (the shape of a per-row lookup in a loop) is logged once per
+  request as a likely N+1.
+- `query_budget()` lets a test pin an endpoint's query count:
+
+      with query_budget(3):
+          await client.get("/api/verification/scan", params=...)
+
+  It raises QueryBudgetExceeded if more statements run inside the block.
+  Accounting nests: a statement counts towards every open QueryStats, so
+  a budget around a test client call sees the queries of the request
+  MetricsMiddleware opens inside it.
+"""
+from __future__ import annotations
+
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.config import settings
+
+logger = logging.getLogger("ssmspl.sql")
+
+
+@dataclass
+class QueryStats:
+    count: int = 0
+    seconds: float = 0.0
+    # ASGI scope of the request, read lazily for the route label
+    scope: dict | None = None
+    statements: dict[str, int] = field(default_factory=dict)
+    flagged: set[str] = field(default_factory=set)
+    # enclosing accounting (a query_budget around the request), also counted
+    parent: QueryStats | None = None
+
+    @property
+    def route(self) -> str:
+        if self.scope is None:
+            return "<background>"
+        route = self.scope.get("route")
+        return f'{self.scope.get("method")} {getattr(route, "path", self.scope.get("path"))}'
+
+
+_current: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+def start(scope: dict | None = None) -> tuple[QueryStats, object]:
+    """Begin accounting for the current context. Returns (stats, reset token)."""
+    stats = QueryStats(scope=scope, parent=_current.get())
+    return stats, _current.set(stats)
+
+
+def stop(token) -> None:
+    _current.reset(token)
+
+
+def current() -> QueryStats | None:
+    return _current.get()
+
+
+@contextmanager
+def query_budget(max_queries: int):
+    """Fail if the block issues more than `max_queries` SQL statements."""
+    stats, token = start()
+    try:
+        yield stats
+    finally:
+        stop(token)
+    if stats.count > max_queries:
+        repeated = sorted(stats.statements.items(), key=lambda kv: kv[1], reverse=True)[:3]
+        detail = "; ".join(f"{n}x {sql[:120]}" for sql, n in repeated)
+        raise QueryBudgetExceeded(
+            f"{stats.count} queries issued, budget is {max_queries}. Most repeated: {detail}"
+        )
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._query_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - context._query_start
+    stats = _current.get()
+    if elapsed * 1000 >= settings.SLOW_QUERY_MS:
+        logger.warning(
+            "Slow query %.0fms [%s]: %s",
+            elapsed * 1000,
+            stats.route if stats else "<background>",
+            " ".join(statement.split())[:500],
+        )
+    if stats is None:
+        return
+    outer = stats
+    while outer is not None:
+        outer.count += 1
+        outer.seconds += elapsed
+        outer.statements[statement] = outer.statements.get(statement, 0) + 1
+        outer = outer.parent
+    # N+1 hints are per request: only the innermost accounting logs them
+    n = stats.statements[statement]
+    if n > settings.N_PLUS_ONE_THRESHOLD and statement not in stats.flagged:
+        stats.flagged.add(statement)
+        logger.warning(
+            "Possible N+1 [%s]: same statement run %d+ times in one request: %s",
+            stats.route,
+            n,
+            " ".join(statement.split())[:300],
+        )
+
+
+def install(engine: AsyncEngine) -> None:
+    """Attach the cursor hooks to an engine (called from app.database.get_engine)."""
+    event.listen(engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine.sync_engine, "after_cursor_execute", _after_cursor_execute)
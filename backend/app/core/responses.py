@@ -0,0 +1,74 @@
+"""orjson-backed JSON response for large list and report payloads.
+
+FastAPI's default path for a `response_model` endpoint walks the returned
+dicts in Python, validates them against the model, dumps them back to
+primitives and then runs `json.dumps`. For report and list endpoints whose
+services already build dicts in the exact schema shape, that is thousands of
+redundant per-value conversions.
+
+Two ways to use it:
+
+- `response_class=FastJSONResponse` on a route keeps response-model
+  validation but renders the validated primitives with orjson.
+- Returning `FastJSONResponse(data)` from a route skips validation and
+  encoding entirely (FastAPI passes a Response through untouched). Only do
+  this where the service builds the dict itself; keep `response_model` on
+  the decorator so the OpenAPI schema is unchanged.
+
+Output matches Pydantic's JSON mode: dates/datetimes/times as ISO 8601
+(UTC as `Z`), UUIDs as strings, Decimal as a string.
+"""
+import json
+import logging
+from decimal import Decimal
+from typing import Any
+
+from starlette.responses import JSONResponse
+
+logger = logging.getLogger("ssmspl")
+
+
+def _default(obj: Any) -> Any:
+    # Pydantic serialises Decimal as a string in JSON mode; keep the wire
+    # format identical whether or not a route goes through its model.
+    if isinstance(obj, Decimal):
+        return str(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+try:
+    import orjson
+
+    _OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+    def dumps(content: Any) -> bytes:
+        return orjson.dumps(content, default=_default, option=_OPTIONS)
+
+    ORJSON_AVAILABLE = True
+
+except ImportError:
+    logger.warning("orjson not installed — FastJSONResponse falls back to json")
+
+    def _stdlib_default(obj: Any) -> Any:
+        if hasattr(obj, "isoformat"):
+            value = obj.isoformat()
+            return value[:-6] + "Z" if value.endswith("+00:00") else value
+        if hasattr(obj, "hex") and hasattr(obj, "int"):  # uuid.UUID
+            return str(obj)
+        return _default(obj)
+
+    def dumps(content: Any) -> bytes:
+        return json.dumps(
+            content, default=_stdlib_default, ensure_ascii=False, allow_nan=False, separators=(",", ":"),
+        ).encode("utf-8")
+
+    ORJSON_AVAILABLE = False
+
+
+class FastJSONResponse(JSONResponse):
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -0,0 +1,72 @@
+"""Pre-DB filter for QR scans.
+
+A misbehaving scanner (a smudged code read over and over, a phone pointed
+at the wrong QR, a replayed list of junk) would otherwise put every read
+on the unique-index lookups. Before a scan reaches Postgres:
+
+- the payload must carry a valid HMAC signature (qr_service); bare UUIDs
+  from pre-HMAC QRs pass only while QR_ACCEPT_UNSIGNED is on;
+- a code that matched no booking or ticket within the last
+  SCAN_NEGATIVE_TTL_SECONDS is answered 404 from this per-worker cache.
+  Codes are random UUIDs minted at creation, so a code unknown now only
+  becomes known in the rare print-before-commit case, which the short TTL
+  covers;
+- the scan endpoints are rate-limited per checker device (user + session,
+  see middleware/rate_limit.get_device_key) rather than per IP, since a
+  whole jetty often shares one NAT address.
+
+Rejections are counted in `qr_scan_rejected_total{reason}`.
+"""
+import time
+import uuid
+from collections import OrderedDict
+
+from fastapi import HTTPException, status
+
+from app.config import settings
+from app.core import metrics
+from app.services.qr_service import verify_qr_payload
+
+# code -> expiry (monotonic)
+_missing: OrderedDict[uuid.UUID, float] = OrderedDict()
+
+
+def _reject(reason: str, status_code: int, detail: str) -> HTTPException:
+    metrics.SCAN_REJECTED.inc((reason,))
+    return HTTPException(status_code=status_code, detail=detail)
+
+
+def parse_scan(payload: str) -> uuid.UUID:
+    """Signed QR payload -> verification code, or 400 without touching the DB."""
+    if "." not in payload and not settings.QR_ACCEPT_UNSIGNED:
+        raise _reject("unsigned", status.HTTP_400_BAD_REQUEST, "Invalid or tampered QR code")
+    code = verify_qr_payload(payload)
+    if code is None:
+        raise _reject("bad_signature", status.HTTP_400_BAD_REQUEST, "Invalid or tampered QR code")
+    try:
+        return uuid.UUID(code)
+    except ValueError:
+        raise _reject("malformed", status.HTTP_400_BAD_REQUEST, "Invalid verification code format")
+
+
+def check_not_missing(code: uuid.UUID) -> None:
+    """404 if this code recently matched nothing."""
+    expires = _missing.get(code)
+    if expires is None:
+        return
+    if expires <= time.monotonic():
+        del _missing[code]
+        return
+    raise _reject(
+        "negative_cache", status.HTTP_404_NOT_FOUND,
+        "No booking or ticket found for this verification code",
+    )
+
+
+def remember_missing(code: uuid.UUID) -> None:
+    if settings.SCAN_NEGATIVE_TTL_SECONDS <= 0:
+        return
+    _missing[code] = time.monotonic() + settings.SCAN_NEGATIVE_TTL_SECONDS
+    _missing.move_to_end(code)
+    while len(_missing) > settings.SCAN_NEGATIVE_CACHE_SIZE:
+        _missing.popitem(last=False)
@@ -22,6 +22,18 @@ def get_password_hash(password: str) -> str:
     ).decode("utf-8")
 
 
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """verify_password on the bounded crypto pool — use from request handlers."""
+    from app.core.crypto_executor import run_crypto
+    return await run_crypto(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """get_password_hash on the bounded crypto pool — use from request handlers."""
+    from app.core.crypto_executor import run_crypto
+    return await run_crypto(get_password_hash, password)
+
+
 def create_access_token(subject: str | Any, extra_claims: dict | None = None, expires_minutes: int | None = None) -> str:
     expire = datetime.now(timezone.utc) + timedelta(
         minutes=expires_minutes or settings.ACCESS_TOKEN_EXPIRE_MINUTES
@@ -53,6 +65,21 @@ def decode_token(token: str) -> dict:
     return jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
 
 
+def decode_token_cached(token: str) -> dict:
+    """
+    decode_token backed by the per-worker verified-payload cache.
+    Use for access tokens on the per-request auth path; the returned
+    dict is shared with the cache and must not be mutated.
+    Raises JWTError on invalid/expired tokens.
+    """
+    from app.core import token_cache
+    payload = token_cache.get(token)
+    if payload is None:
+        payload = decode_token(token)
+        token_cache.put(token, payload)
+    return payload
+
+
 def hash_token(token: str) -> str:
     """Return a SHA-256 hex digest of a token string (used for refresh token storage)."""
     return hashlib.sha256(token.encode("utf-8")).hexdigest()
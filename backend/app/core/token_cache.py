@@ -0,0 +1,82 @@
+"""Per-worker cache of verified JWT payloads.
+
+Every authenticated request used to run python-jose's HMAC verification and
+JSON parsing on its token, although the frontend fires several API calls per
+screen with the same 5-minute access token. This cache maps a SHA-256 digest
+of the raw token to its decoded payload so repeat requests skip both.
+
+- Only tokens that passed full verification are stored; failures are never
+  cached, so a forged token always goes through jose.
+- An entry is valid until the token's own `exp`; expired entries are
+  dropped on lookup.
+- Bounded LRU (TOKEN_CACHE_SIZE entries per worker).
+- `evict_jti()` drops a token the moment it is blacklisted. The blacklist
+  check in dependencies.py still runs on every request, so a revocation
+  on another worker is honoured even while this worker holds the entry.
+"""
+import hashlib
+import time
+from collections import OrderedDict
+
+from app.config import settings
+
+# digest -> (payload, exp)
+_entries: OrderedDict[bytes, tuple[dict, float]] = OrderedDict()
+# jti -> digest, for early eviction on blacklist
+_by_jti: dict[str, bytes] = {}
+
+
+def _digest(token: str) -> bytes:
+    return hashlib.sha256(token.encode("utf-8")).digest()
+
+
+def _drop(digest: bytes) -> None:
+    entry = _entries.pop(digest, None)
+    if entry is not None:
+        jti = entry[0].get("jti")
+        if jti and _by_jti.get(jti) == digest:
+            del _by_jti[jti]
+
+
+def get(token: str) -> dict | None:
+    """Return the cached payload for a token, or None if absent or expired."""
+    digest = _digest(token)
+    entry = _entries.get(digest)
+    if entry is None:
+        return None
+    if entry[1] <= time.time():
+        _drop(digest)
+        return None
+    _entries.move_to_end(digest)
+    return entry[0]
+
+
+def put(token: str, payload: dict) -> None:
+    """Cache a verified payload until its `exp` claim."""
+    exp = payload.get("exp")
+    if not isinstance(exp, (int, float)) or exp <= time.time():
+        return
+    digest = _digest(token)
+    _entries[digest] = (payload, float(exp))
+    _entries.move_to_end(digest)
+    jti = payload.get("jti")
+    if jti:
+        _by_jti[jti] = digest
+    while len(_entries) > settings.TOKEN_CACHE_SIZE:
+        _drop(next(iter(_entries)))
+
+
+def evict_jti(jti: str) -> None:
+    """Forget a token by JTI (called when it is blacklisted)."""
+    digest = _by_jti.get(jti)
+    if digest is not None:
+        _drop(digest)
+
+
+def clear() -> None:
+    _entries.clear()
+    _by_jti.clear()
+
+
+def size() -> int:
+    return len(_entries)
@@ -1,27 +1,98 @@
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+import os
+import time
+import uuid
+
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool
 
 from app.config import settings
+from app.core import metrics, query_stats
 
-engine = create_async_engine(
-    settings.DATABASE_URL,
-    echo=(settings.APP_ENV == "development"),
-    pool_pre_ping=True,
-    # Pool sizing: pool_size × gunicorn_workers must not exceed PG max_connections (default 100).
-    # With workers = 2*CPU+1 (e.g. 5 on 2-core VPS): 5 × 15 = 75 connections max, safely under 100.
-    pool_size=5,
-    max_overflow=10,
-    pool_recycle=300,       # Recycle connections every 5 min (prevents stale idle connections)
-    pool_timeout=30,        # Wait max 30s for a connection from pool before erroring
-)
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Default async pool, plus checkout wait time fed to /metrics."""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            metrics.DB_POOL_WAIT.observe(time.perf_counter() - start)
+
+
+# The engine is created per process, on first use (normally the app
+# lifespan, see app/core/db_warmup.py). With preload_app=True this module is
+# imported in the gunicorn master; an engine built there would be inherited
+# by every forked worker.
+engine: AsyncEngine | None = None
+_engine_pid: int | None = None
 
+# Bound to the engine by get_engine()
 AsyncSessionLocal = async_sessionmaker(
-    engine,
     class_=AsyncSession,
     expire_on_commit=False,
 )
 
 
+def _statement_name() -> str:
+    return f"__asyncpg_{uuid.uuid4().hex}__"
+
+
+def connect_args() -> dict:
+    """asyncpg options for DATABASE_URL (shared with alembic/env.py).
+
+    Behind PgBouncer in transaction pooling, consecutive transactions may
+    land on different server connections, so a statement prepared in one
+    cannot be reused in the next: both asyncpg's and SQLAlchemy's statement
+    caches are off, and the one-shot statements get unique names so they
+    never collide on a server connection shared with other clients.
+    """
+    if not settings.PGBOUNCER_TRANSACTION_MODE:
+        return {}
+    return {
+        "statement_cache_size": 0,
+        "prepared_statement_cache_size": 0,
+        "prepared_statement_name_func": _statement_name,
+    }
+
+
+def _pool_options() -> dict:
+    if settings.PGBOUNCER_TRANSACTION_MODE and settings.DB_POOL_SIZE == 0:
+        # PgBouncer does the pooling; every checkout is a fresh client connection
+        return {"poolclass": NullPool}
+    # Pool sizing: DB_POOL_SIZE × gunicorn_workers must not exceed PG max_connections (default 100).
+    # With workers = 2*CPU+1 (e.g. 5 on 2-core VPS): 5 × 15 = 75 connections max, safely under 100.
+    return {
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_recycle": 300,    # Recycle connections every 5 min (prevents stale idle connections)
+        "pool_timeout": 30,     # Wait max 30s for a connection from pool before erroring
+    }
+
+
+def get_engine() -> AsyncEngine:
+    """This process's engine, created on first call."""
+    global engine, _engine_pid
+    if engine is None or _engine_pid != os.getpid():
+        engine = create_async_engine(
+            settings.DATABASE_URL,
+            echo=(settings.APP_ENV == "development"),
+            pool_pre_ping=True,
+            connect_args=connect_args(),
+            **_pool_options(),
+        )
+        _engine_pid = os.getpid()
+        query_stats.install(engine)
+        AsyncSessionLocal.configure(bind=engine)
+    return engine
+
+
+async def dispose_engine() -> None:
+    if engine is not None and _engine_pid == os.getpid():
+        await engine.dispose()
+
+
 class Base(DeclarativeBase):
     """Base class for all SQLAlchemy models."""
     pass
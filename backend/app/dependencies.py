@@ -7,12 +7,13 @@ from jose import JWTError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
-from app.core.security import decode_token
+from app.core.security import decode_token_cached
 from app.core.rbac import UserRole
 from app.config import settings
 from app.database import get_db
 from app.models.user import User
 from app.models.portal_user import PortalUser
+from app.services import heartbeat_service
 from app.services.token_blacklist import is_blacklisted
 
 # auto_error=False so requests with cookies (no Bearer header) don't get 403
@@ -49,7 +50,7 @@ async def get_current_user(
     )
     token = _extract_token(request, credentials, "ssmspl_access_token")
     try:
-        payload = decode_token(token)
+        payload = decode_token_cached(token)
         if payload.get("type") != "access":
             raise credentials_exception
         user_id: str = payload.get("sub")
@@ -85,14 +86,18 @@ async def get_current_user(
     # Server-side idle timeout: force-logout if no activity for configured duration
     # Skip for TICKET_CHECKER (no heartbeat) and for mobile JWTs (phone lock IS
     # the idle boundary; a 10-min web timer doesn't fit a backgrounded app).
+    # Reads through the heartbeat aggregator so activity recorded on this
+    # worker but not yet flushed still counts.
     now = datetime.now(timezone.utc)
     idle_limit = settings.SESSION_IDLE_TIMEOUT_MINUTES * 60  # seconds
-    if user.session_last_active and user.role != UserRole.TICKET_CHECKER and not is_mobile_jwt:
-        idle_seconds = (now - user.session_last_active).total_seconds()
+    last_active = heartbeat_service.last_active(user.id, sid, user.session_last_active)
+    if last_active and user.role != UserRole.TICKET_CHECKER and not is_mobile_jwt:
+        idle_seconds = (now - last_active).total_seconds()
         if idle_seconds > idle_limit:
             # Full session teardown — revoke all tokens so session cannot resume
             from app.services import user_session_service, token_service
             from app.services.token_blacklist import blacklist_token
+            heartbeat_service.discard(user.id)
             if user.active_session_id:
                 await user_session_service.end_session(db, user.active_session_id, "idle_timeout")
             await token_service.revoke_all_for_user(db, user_id=user.id)
@@ -107,46 +112,20 @@ async def get_current_user(
                 detail="session_idle_timeout",
             )
 
-    # Update session activity (throttle to every 30s to reduce DB writes).
+    # Record session activity (write-behind).
     #
     # Mobile JWTs skip this — they have their own auth boundary and don't
     # participate in the desktop idle timer.
     #
-    # For web JWTs, we issue a direct UPDATE rather than mutating
-    # `user.session_last_active` on the ORM object. The mutation path made
-    # the User row dirty; SQLAlchemy then autoflushed on the next execute(),
-    # which triggered users.updated_at's onupdate=func.now() and expired
-    # that attribute on the in-memory object. The next attribute read in
-    # /me (snap_updated = current_user.updated_at) would attempt a lazy
-    # reload OUTSIDE the original async greenlet → MissingGreenlet 500.
-    # A direct UPDATE bypasses ORM dirty tracking, so updated_at stays
-    # server-side only and the in-memory object is never expired.
-    from sqlalchemy import update as sa_update
-    if not is_mobile_jwt and (
-        not user.session_last_active
-        or (now - user.session_last_active).total_seconds() > 30
-    ):
-        # synchronize_session=False is CRITICAL. The May-10 fix correctly
-        # avoided ORM dirty tracking by going through bulk-UPDATE, BUT
-        # SQLAlchemy 2.x's default `synchronize_session='auto'` then
-        # *expired* every in-session object matching the WHERE clause —
-        # which is exactly `current_user`. Pydantic's model_validate then
-        # touched an expired attribute (updated_at) from inside its Rust
-        # core where no greenlet context exists, raising MissingGreenlet
-        # and 500-ing every /me call. Telling synchronize_session=False
-        # leaves the in-memory User object untouched; the DB-side
-        # `updated_at` (via onupdate=func.now()) is still bumped correctly,
-        # we just don't reflect that staleness back to this request's
-        # user object — it gets re-read fresh on the next request anyway.
-        await db.execute(
-            sa_update(User)
-            .where(User.id == user.id)
-            .values(session_last_active=now)
-            .execution_options(synchronize_session=False)
-        )
-        if user.active_session_id:
-            from app.services.user_session_service import update_heartbeat
-            await update_heartbeat(db, user.active_session_id)
+    # For web JWTs, nothing is written inside the request transaction: the
+    # heartbeat aggregator keeps the latest timestamp per user in memory and
+    # its flush loop writes users.session_last_active and
+    # user_sessions.last_heartbeat for all active users in one bulk UPDATE
+    # every few seconds. This also keeps the in-memory User object clean —
+    # no ORM dirty tracking, no autoflush, no updated_at onupdate expiring
+    # attributes mid-request (the MissingGreenlet 500s on /me).
+    if not is_mobile_jwt and user.active_session_id:
+        heartbeat_service.record(user.id, user.active_session_id, now)
 
     # Admin portal: ADMIN users must be explicitly granted access
     if settings.ADMIN_PORTAL_MODE and user.role == UserRole.ADMIN:
@@ -175,7 +154,7 @@ async def get_current_portal_user(
     )
     token = _extract_token(request, credentials, "ssmspl_portal_access_token")
     try:
-        payload = decode_token(token)
+        payload = decode_token_cached(token)
         if payload.get("type") != "access":
             raise credentials_exception
         user_id: str = payload.get("sub")
@@ -11,10 +11,12 @@ from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from app.config import settings
-from app.database import engine
+from app.database import dispose_engine, get_engine
 from app.middleware.rate_limit import limiter, rate_limit_exceeded_handler, RateLimitExceeded, SLOWAPI_AVAILABLE
+from app.middleware.metrics import MetricsMiddleware
+from app.middleware.profiler import ProfilerMiddleware
 from app.middleware.security import SecurityHeadersMiddleware
-from app.routers import auth, users, boats, branches, routes, items, item_rates, ferry_schedules, payment_modes, tickets, portal_auth, company, booking, portal_bookings, reports, verification, contact, dashboard, portal_payment, portal_theme, settings as settings_router, rate_change_logs, qz, backup, user_sessions
+from app.routers import auth, users, boats, branches, routes, items, item_rates, ferry_schedules, payment_modes, tickets, company, reports, verification, dashboard, settings as settings_router, rate_change_logs, qz, backup, user_sessions
 
 logger = logging.getLogger("ssmspl")
 
@@ -27,10 +29,30 @@ async def lifespan(app: FastAPI):
     # --- Startup ---
     from app.services.booking_expiry_service import expiry_loop
     from app.services.daily_report_service import daily_report_loop
+    from app.services.heartbeat_service import heartbeat_flush_loop
+    from app.services.user_session_service import geo_enrichment_loop
+    from app.services import geo_service
     from app.services.token_blacklist import init_blacklist, close_blacklist
-
+    from app.core.loop_monitor import loop_lag_loop
+    from app.core.memory import memory_loop
+    from app.core.metrics import metrics_snapshot_loop
+    from app.core.db_warmup import warm_up
+    from app.core import qr_cache
+
+    # Engine is created here, after fork, never in the gunicorn master
+    get_engine()
+    await warm_up()
     await init_blacklist()
 
+    loop_monitor_task = asyncio.create_task(loop_lag_loop())
+    memory_task = asyncio.create_task(memory_loop())
+    metrics_task = asyncio.create_task(metrics_snapshot_loop())
+
+    # Every worker aggregates its own session heartbeats, so every worker flushes
+    heartbeat_task = asyncio.create_task(heartbeat_flush_loop())
+    geo_task = asyncio.create_task(geo_enrichment_loop())
+    qr_prerender_task = asyncio.create_task(qr_cache.prerender_loop())
+
     task = None
     report_task = None
     if not settings.ADMIN_PORTAL_MODE:
@@ -56,8 +78,42 @@ async def lifespan(app: FastAPI):
             await report_task
     except asyncio.CancelledError:
         pass
+    heartbeat_task.cancel()
+    try:
+        await heartbeat_task
+    except asyncio.CancelledError:
+        pass
+    geo_task.cancel()
+    try:
+        await geo_task
+    except asyncio.CancelledError:
+        pass
+    qr_prerender_task.cancel()
+    try:
+        await qr_prerender_task
+    except asyncio.CancelledError:
+        pass
+    loop_monitor_task.cancel()
+    try:
+        await loop_monitor_task
+    except asyncio.CancelledError:
+        pass
+    memory_task.cancel()
+    try:
+        await memory_task
+    except asyncio.CancelledError:
+        pass
+    metrics_task.cancel()
+    try:
+        await metrics_task
+    except asyncio.CancelledError:
+        pass
+    await geo_service.close()
+    from app.core import crypto_executor
+    crypto_executor.shutdown()
+    qr_cache.shutdown()
     await close_blacklist()
-    await engine.dispose()
+    await dispose_engine()
     logger.info("Database connections disposed")
 
 
@@ -174,11 +230,17 @@ app.add_middleware(
     allow_origins=settings.allowed_origins_list,
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"],
-    allow_headers=["Authorization", "Content-Type", "Accept", "X-Request-ID"],
-    expose_headers=["X-Request-ID"],
+    allow_headers=["Authorization", "Content-Type", "Accept", "X-Request-ID", "X-Profile"],
+    expose_headers=["X-Request-ID", "X-Profile-Id"],
 )
 
 app.add_middleware(SecurityHeadersMiddleware)
+# Outside CORS/security, so latency covers their handling and error responses
+# too; only the profiler below wraps it
+app.add_middleware(MetricsMiddleware)
+# On-demand SUPER_ADMIN request profiling; outside metrics so the sampler
+# sees every layer. A no-op header scan unless the request asks for it.
+app.add_middleware(ProfilerMiddleware)
 
 
 def _sanitize_errors(errors: list[dict]) -> list[dict]:
@@ -276,14 +338,26 @@ app.include_router(system_health.router)
 from app.routers import system_actions
 app.include_router(system_actions.router)
 
+# Prometheus scrape endpoint — per-route latency, status counts, DB pool.
+# Token-protected; mounted on both deployments.
+from app.routers import metrics as metrics_router
+app.include_router(metrics_router.router)
+
+# Request profiles captured by ProfilerMiddleware — SUPER_ADMIN only,
+# mounted on both deployments.
+from app.routers import profiler as profiler_router
+app.include_router(profiler_router.router)
+
 # Backup events — laptop-side collector POSTs one event per backup attempt
 # (db_dump + snapshot, both servers), mobile app reads the unified feed.
 # Mounted on both deployments so each backend stores its own slice.
 from app.routers import backup_events
 app.include_router(backup_events.router)
 
-# Customer-facing routers — disabled on admin portal (no public site / customer portal)
+# Customer-facing routers — disabled on admin portal (no public site / customer portal).
+# Imported here, not at the top, so each deployment only loads its own modules.
 if not settings.ADMIN_PORTAL_MODE:
+    from app.routers import portal_auth, booking, portal_bookings, portal_payment, portal_theme, contact
     app.include_router(portal_auth.router)
     app.include_router(booking.router)
     app.include_router(portal_bookings.router)
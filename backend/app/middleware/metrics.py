@@ -0,0 +1,54 @@
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core import metrics, query_stats
+
+
+class MetricsMiddleware:
+    """Records per-route latency, status, response size and in-flight requests.
+
+    Also opens the request's SQL accounting (app/core/query_stats.py) and
+    records its query count and DB time per route.
+
+    Pure ASGI so streamed bodies pass straight through. Routes are labelled
+    by their template (`/api/tickets/{ticket_id}`, read from the matched
+    route FastAPI stores in the scope), never by raw path, so label
+    cardinality stays bounded; unmatched paths share one label.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = 500
+        size = 0
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        stats, token = query_stats.start(scope)
+        metrics.HTTP_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            metrics.HTTP_IN_FLIGHT.dec()
+            query_stats.stop(token)
+            route = scope.get("route")
+            labels = (scope["method"], getattr(route, "path", "<unmatched>"))
+            metrics.HTTP_LATENCY.observe(time.perf_counter() - start, labels)
+            metrics.HTTP_RESPONSE_SIZE.observe(size, labels)
+            metrics.HTTP_REQUESTS.inc(labels + (str(status),))
+            if stats.count:
+                metrics.HTTP_DB_QUERIES.observe(stats.count, labels)
+                metrics.HTTP_DB_TIME.observe(stats.seconds, labels)
@@ -0,0 +1,129 @@
+import asyncio
+import logging
+import os
+import sys
+from http.cookies import SimpleCookie
+from urllib.parse import parse_qsl
+
+from jose import JWTError
+from sqlalchemy import select
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core import profiler
+from app.core.rbac import UserRole
+from app.core.security import decode_token_cached
+from app.database import AsyncSessionLocal
+from app.models.user import User
+from app.services.token_blacklist import is_blacklisted
+
+logger = logging.getLogger("ssmspl")
+
+
+def _wants_profile(scope: Scope) -> bool:
+    query = scope.get("query_string", b"")
+    # Substring test first so unflagged requests skip the parse
+    if b"__profile=" in query and ("__profile", "1") in parse_qsl(query.decode("latin-1")):
+        return True
+    return any(name == b"x-profile" and value.strip() == b"1" for name, value in scope["headers"])
+
+
+def _access_token(scope: Scope) -> str | None:
+    cookie = auth = None
+    for name, value in scope["headers"]:
+        if name == b"cookie":
+            cookie = value.decode("latin-1")
+        elif name == b"authorization":
+            auth = value.decode("latin-1")
+    if cookie:
+        morsel = SimpleCookie(cookie).get("ssmspl_access_token")
+        if morsel:
+            return morsel.value
+    if auth and auth.lower().startswith("bearer "):
+        return auth[7:]
+    return None
+
+
+async def _is_super_admin(scope: Scope) -> bool:
+    token = _access_token(scope)
+    if not token:
+        return False
+    try:
+        payload = decode_token_cached(token)
+    except JWTError:
+        return False
+    if payload.get("type") != "access" or payload.get("role") != UserRole.SUPER_ADMIN.value:
+        return False
+    jti = payload.get("jti")
+    if jti and await is_blacklisted(jti):
+        return False
+    # Same account checks as get_current_user: a logged-out, deactivated or
+    # demoted SUPER_ADMIN must not start the sampler, even with Redis down
+    try:
+        async with AsyncSessionLocal() as db:
+            user = (await db.execute(
+                select(User.role, User.is_active, User.active_session_id).where(User.id == payload.get("sub"))
+            )).first()
+    except Exception as e:
+        logger.warning("Profiler: could not check the requesting user: %s", e)
+        return False
+    if user is None or not user.is_active or user.role != UserRole.SUPER_ADMIN:
+        return False
+    if payload.get("mobile"):
+        return True
+    sid = payload.get("sid")
+    return bool(sid) and user.active_session_id == sid
+
+
+class ProfilerMiddleware:
+    """Profiles a single request on demand (app/core/profiler.py).
+
+    Triggered by an `X-Profile: 1` header or a `__profile=1` query
+    parameter, honoured only for a valid, unrevoked SUPER_ADMIN access token
+    of the account's active session, and one request per worker at a time;
+    otherwise the request runs untouched. The response carries
+    `X-Profile-Id`; fetch the flamegraph from /api/profiler/{id}.
+
+    Requests without the flag pay one header scan and nothing else.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not _wants_profile(scope):
+            await self.app(scope, receive, send)
+            return
+        if not await _is_super_admin(scope) or not profiler.try_acquire():
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = os.urandom(8).hex()
+        status = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                message["headers"] = list(message.get("headers", ())) + [
+                    (b"x-profile-id", profile_id.encode("latin-1"))
+                ]
+            await send(message)
+
+        sampler = profiler.RequestSampler(asyncio.current_task(), sys._getframe())
+        sampler.start()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            sampler.stop()
+            profiler.release()
+            route = scope.get("route")
+            meta = {
+                "method": scope["method"],
+                "path": scope["path"],
+                "route": getattr(route, "path", None),
+                "status": status,
+            }
+            try:
+                await asyncio.to_thread(profiler.save, profile_id, sampler, meta)
+            except OSError as e:
+                logger.warning("Could not save profile %s: %s", profile_id, e)
@@ -21,6 +21,28 @@ try:
                 return value.split(",")[0].strip()
         return request.client.host if request.client else "127.0.0.1"
 
+    def get_device_key(request: Request) -> str:
+        """Key per signed-in device (user + session from the access token).
+
+        Falls back to the client IP when there is no valid token; the auth
+        dependency rejects those requests anyway.
+        """
+        from jose import JWTError
+        from app.core.security import decode_token_cached
+
+        token = request.cookies.get("ssmspl_access_token")
+        auth = request.headers.get("authorization", "")
+        if not token and auth.lower().startswith("bearer "):
+            token = auth[7:]
+        if token:
+            try:
+                payload = decode_token_cached(token)
+            except JWTError:
+                payload = None
+            if payload and payload.get("sub"):
+                return f"device:{payload['sub']}:{payload.get('sid') or 'mobile'}"
+        return get_real_ip(request)
+
     limiter = Limiter(key_func=get_real_ip, storage_uri=settings.RATE_LIMIT_STORAGE_URI)
     RateLimitExceeded = _RateLimitExceeded
 
@@ -43,6 +65,9 @@ except ImportError:
                 return func
             return decorator
 
+    def get_device_key(request: Request) -> str:
+        return ""
+
     limiter = _NoOpLimiter()
     RateLimitExceeded = None
 
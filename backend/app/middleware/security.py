@@ -1,48 +1,71 @@
-import uuid
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
-from starlette.responses import Response
+import os
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from app.config import settings
 
 
-class SecurityHeadersMiddleware(BaseHTTPMiddleware):
-    """Injects security headers on every response."""
+def _build_headers(with_csp: bool) -> list[tuple[bytes, bytes]]:
+    headers = [
+        ("X-Content-Type-Options", "nosniff"),
+        ("X-Frame-Options", "DENY"),
+        ("Referrer-Policy", "strict-origin-when-cross-origin"),
+        ("Permissions-Policy", "camera=(), microphone=(), geolocation=()"),
+        ("Server", ""),
+        ("X-XSS-Protection", "0"),
+        ("X-Permitted-Cross-Domain-Policies", "none"),
+    ]
+
+    # HSTS only in non-development environments
+    if settings.APP_ENV != "development":
+        headers.append(("Strict-Transport-Security", "max-age=31536000; includeSubDomains"))
 
-    async def dispatch(self, request: Request, call_next) -> Response:
-        request_id = str(uuid.uuid4())
-        request.state.request_id = request_id
+    if with_csp:
+        headers.append((
+            "Content-Security-Policy",
+            "default-src 'self'; "
+            "script-src 'self'; "
+            "style-src 'self' 'unsafe-inline'; "
+            "img-src 'self' data: blob:; "
+            "font-src 'self'; "
+            "connect-src 'self'; "
+            "frame-ancestors 'none'",
+        ))
+    return [(k.lower().encode("latin-1"), v.encode("latin-1")) for k, v in headers]
 
-        response: Response = await call_next(request)
 
-        response.headers["X-Content-Type-Options"] = "nosniff"
-        response.headers["X-Frame-Options"] = "DENY"
-        response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
-        response.headers["Permissions-Policy"] = (
-            "camera=(), microphone=(), geolocation=()"
-        )
-        response.headers["X-Request-ID"] = request_id
-        response.headers["Server"] = ""
-        response.headers["X-XSS-Protection"] = "0"
-        response.headers["X-Permitted-Cross-Domain-Policies"] = "none"
+class SecurityHeadersMiddleware:
+    """Injects security headers on every response.
 
-        # HSTS only in non-development environments
-        if settings.APP_ENV != "development":
-            response.headers["Strict-Transport-Security"] = (
-                "max-age=31536000; includeSubDomains"
-            )
+    Pure ASGI: headers are added to the `http.response.start` message and
+    body messages pass through untouched, so streamed PDF/backup downloads
+    are never buffered. The header list is built once at startup.
+    """
 
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        self._headers = _build_headers(with_csp=True)
         # Skip CSP for Swagger/ReDoc paths in dev (they need inline scripts)
-        path = request.url.path
-        if not (settings.DEBUG and path in ("/docs", "/redoc", "/openapi.json")):
-            response.headers["Content-Security-Policy"] = (
-                "default-src 'self'; "
-                "script-src 'self'; "
-                "style-src 'self' 'unsafe-inline'; "
-                "img-src 'self' data: blob:; "
-                "font-src 'self'; "
-                "connect-src 'self'; "
-                "frame-ancestors 'none'"
-            )
-
-        return response
+        self._docs_headers = _build_headers(with_csp=False)
+        self._docs_paths = ("/docs", "/redoc", "/openapi.json") if settings.DEBUG else ()
+        self._names = {name for name, _ in self._headers} | {b"x-request-id"}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = os.urandom(16).hex()
+        scope.setdefault("state", {})["request_id"] = request_id
+        extra = self._docs_headers if scope["path"] in self._docs_paths else self._headers
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                # Replace, don't duplicate, any header the app already set
+                headers = [h for h in message.get("headers", ()) if h[0].lower() not in self._names]
+                headers.extend(extra)
+                headers.append((b"x-request-id", request_id.encode("latin-1")))
+                message["headers"] = headers
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
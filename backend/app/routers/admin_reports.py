@@ -25,7 +25,7 @@ from app.schemas.admin_report import (
     ItemwiseLevyReport,
     MonthBranchSummaryReport,
 )
-from app.services import admin_pdf_service, admin_report_service, admin_xlsx_service
+from app.services import admin_report_service
 from app.services.activity_log_service import ActivityAction, log_activity
 
 router = APIRouter(prefix="/api/reports/admin", tags=["Admin Reports"])
@@ -93,6 +93,7 @@ async def itemwise_levy_summary_pdf(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(_admin_roles),
 ):
+    from app.services import admin_pdf_service
     data = await admin_report_service.run_itemwise_levy_summary(
         db, date_from, date_to, route_id
     )
@@ -123,6 +124,7 @@ async def itemwise_levy_summary_xlsx(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(_admin_roles),
 ):
+    from app.services import admin_xlsx_service
     data = await admin_report_service.run_itemwise_levy_summary(
         db, date_from, date_to, route_id
     )
@@ -178,6 +180,7 @@ async def date_branch_summary_pdf(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(_admin_roles),
 ):
+    from app.services import admin_pdf_service
     data = await admin_report_service.run_date_branch_summary(
         db, date_from, date_to, route_id
     )
@@ -208,6 +211,7 @@ async def date_branch_summary_xlsx(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(_admin_roles),
 ):
+    from app.services import admin_xlsx_service
     data = await admin_report_service.run_date_branch_summary(
         db, date_from, date_to, route_id
     )
@@ -263,6 +267,7 @@ async def itemwise_daily_charges_pdf(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(_admin_roles),
 ):
+    from app.services import admin_pdf_service
     data = await admin_report_service.run_itemwise_daily_charges(
         db, date_from, date_to, route_id
     )
@@ -293,6 +298,7 @@ async def itemwise_daily_charges_xlsx(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(_admin_roles),
 ):
+    from app.services import admin_xlsx_service
     data = await admin_report_service.run_itemwise_daily_charges(
         db, date_from, date_to, route_id
     )
@@ -350,6 +356,7 @@ async def month_branch_summary_pdf(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(_admin_roles),
 ):
+    from app.services import admin_pdf_service
     data = await admin_report_service.run_month_branch_summary(
         db, date_from, date_to, branch_ids
     )
@@ -381,6 +388,7 @@ async def month_branch_summary_xlsx(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(_admin_roles),
 ):
+    from app.services import admin_xlsx_service
     data = await admin_report_service.run_month_branch_summary(
         db, date_from, date_to, branch_ids
     )
@@ -1,6 +1,7 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config import settings
 from app.database import get_db
 from app.dependencies import get_current_portal_user
 from app.models.portal_user import PortalUser
@@ -9,6 +10,28 @@ from app.services import booking_service
 router = APIRouter(prefix="/api/booking", tags=["Booking Data"])
 
 
+@router.get(
+    "/network",
+    summary="Booking form master data in one call",
+    description="Active branches, route adjacency, online items with rates per route and schedules per "
+                "branch. The browser may reuse it for CATALOGUE_CACHE_TTL_SECONDS; after that, send "
+                "the ETag back as If-None-Match to get 304 when nothing changed.",
+    responses={304: {"description": "Not modified"}},
+)
+async def network(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_db),
+    _: PortalUser = Depends(get_current_portal_user),
+):
+    etag, graph = await booking_service.get_network_graph(db)
+    headers = {"ETag": etag, "Cache-Control": f"private, max-age={settings.CATALOGUE_CACHE_TTL_SECONDS}"}
+    if etag in request.headers.get("if-none-match", ""):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return graph
+
+
 @router.get(
     "/branches",
     summary="Get all active departure branches",
@@ -37,15 +60,24 @@ async def to_branches(
 @router.get(
     "/items/{from_branch_id}/{to_branch_id}",
     summary="Get bookable items with rates for a route",
-    description="Returns items with online_visibility=true and their current rates for the route between two branches.",
+    description="Returns items with online_visibility=true and their current rates for the route between two branches. "
+                "Send the ETag back as If-None-Match to get 304 when nothing changed.",
+    responses={304: {"description": "Not modified"}},
 )
 async def items(
+    request: Request,
+    response: Response,
     from_branch_id: int,
     to_branch_id: int,
     db: AsyncSession = Depends(get_db),
     _: PortalUser = Depends(get_current_portal_user),
 ):
-    return await booking_service.get_online_items(db, from_branch_id, to_branch_id)
+    etag, result = await booking_service.get_online_items(db, from_branch_id, to_branch_id)
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag in request.headers.get("if-none-match", ""):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return result
 
 
 @router.get(
@@ -8,13 +8,14 @@ from jose import JWTError
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.security import decode_token
+from app.core.security import decode_token_cached
 from app.database import get_db, AsyncSessionLocal
 from app.dependencies import require_roles
 from app.core.data_cutoff import clamp_single_date
 from app.core.rbac import UserRole
 from app.models.user import User
 from app.schemas.dashboard import TodaySummaryResponse
+from app.services import heartbeat_service
 from app.services.dashboard_service import get_dashboard_stats, get_today_summary
 
 logger = logging.getLogger("ssmspl")
@@ -76,7 +77,7 @@ async def _authenticate_ws(websocket: WebSocket) -> tuple[User | None, str | Non
     if not token:
         return None, None
     try:
-        payload = decode_token(token)
+        payload = decode_token_cached(token)
         if payload.get("type") != "access":
             return None, None
         user_id = payload.get("sub")
@@ -114,8 +115,7 @@ async def dashboard_ws(websocket: WebSocket):
                     await websocket.close(code=4001, reason="Session ended")
                     return
                 # Keep session alive
-                from datetime import datetime, timezone
-                fresh_user.session_last_active = datetime.now(timezone.utc)
+                heartbeat_service.record(fresh_user.id, sid)
                 data = await get_dashboard_stats(db, fresh_user)
                 await db.commit()
             await websocket.send_text(json.dumps(data))
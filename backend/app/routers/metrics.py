@@ -0,0 +1,32 @@
+"""Prometheus scrape endpoint.
+
+Auth: `Authorization: Bearer <METRICS_TOKEN>` (Prometheus `authorization`
+scrape config). Disabled with 503 when METRICS_TOKEN is unset. A scrape
+lands on one gunicorn worker but reports every live worker's series (see
+app/core/metrics.py); each series carries a `worker` label.
+"""
+import hmac
+from typing import Annotated
+
+from fastapi import APIRouter, Header, HTTPException
+from fastapi.responses import PlainTextResponse
+
+from app.config import settings
+from app.core import metrics
+
+router = APIRouter(tags=["Health"])
+
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def prometheus_metrics(
+    authorization: Annotated[str | None, Header()] = None,
+):
+    expected = settings.METRICS_TOKEN
+    if not expected:
+        raise HTTPException(status_code=503, detail="METRICS_TOKEN not configured on this backend")
+    if not authorization or not hmac.compare_digest(authorization, f"Bearer {expected}"):
+        raise HTTPException(status_code=401, detail="Invalid metrics token")
+    return PlainTextResponse(
+        metrics.render_prometheus(),
+        media_type="text/plain; version=0.0.4; charset=utf-8",
+    )
@@ -1,13 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from fastapi.responses import Response
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core import qr_cache
 from app.database import get_db
 from app.dependencies import get_current_portal_user
 from app.models.portal_user import PortalUser
 from app.schemas.booking import BookingCreate, BookingRead, BookingListResponse
 from app.services import booking_service
-from app.services.qr_service import generate_qr_png
 
 router = APIRouter(prefix="/api/portal/bookings", tags=["Portal Bookings"])
 
@@ -74,10 +75,14 @@ async def cancel_booking(
     "/{booking_id}/qr",
     summary="Get QR code for a booking",
     description="Returns a PNG QR code image encoding the booking verification code.",
-    responses={200: {"content": {"image/png": {}}}},
+    responses={200: {"content": {"image/png": {}}}, 304: {"description": "Not modified"}},
 )
 async def get_qr(
+    request: Request,
     booking_id: int,
+    format: Literal["styled", "thermal", "svg", "escpos"] = Query(
+        "styled", description="styled PNG, or plain for thermal printers: 1-bit PNG, SVG, ESC/POS raster",
+    ),
     db: AsyncSession = Depends(get_db),
     current_user: PortalUser = Depends(get_current_portal_user),
 ):
@@ -88,5 +93,4 @@ async def get_qr(
             detail="No verification code for this booking",
         )
 
-    png_bytes = generate_qr_png(booking["verification_code"])
-    return Response(content=png_bytes, media_type="image/png")
+    return await qr_cache.qr_response(request, str(booking["verification_code"]), format)
@@ -0,0 +1,43 @@
+"""On-demand request profiles (SUPER_ADMIN).
+
+Profile any request by repeating it with `X-Profile: 1` (or `?__profile=1`)
+under a SUPER_ADMIN token; the response's `X-Profile-Id` names the profile.
+Profiles are in folded-stack format: open in https://speedscope.app or
+pipe through flamegraph.pl.
+"""
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import PlainTextResponse
+
+from app.core import profiler
+from app.core.rbac import UserRole
+from app.dependencies import require_roles
+from app.models.user import User
+
+router = APIRouter(prefix="/api/profiler", tags=["Health"])
+
+_super_admin_only = require_roles(UserRole.SUPER_ADMIN)
+
+
+@router.get(
+    "",
+    summary="List recent request profiles",
+    description="Newest first. Metadata only; fetch the stacks with /api/profiler/{profile_id}. SUPER_ADMIN only.",
+)
+async def list_profiles(_: User = Depends(_super_admin_only)):
+    return profiler.list_profiles()
+
+
+@router.get(
+    "/{profile_id}",
+    response_class=PlainTextResponse,
+    summary="Download a request profile",
+    description="Folded stacks (`frame;frame;frame weight`), weights in microseconds of wall time. SUPER_ADMIN only.",
+)
+async def get_profile(profile_id: str, _: User = Depends(_super_admin_only)):
+    folded = profiler.read_profile(profile_id)
+    if folded is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profile not found")
+    return PlainTextResponse(
+        folded,
+        headers={"Content-Disposition": f'attachment; filename="{profile_id}.folded"'},
+    )
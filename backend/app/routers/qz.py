@@ -7,21 +7,21 @@ import base64
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from pydantic import BaseModel
-from Crypto.Hash import SHA
-from Crypto.PublicKey import RSA
-from Crypto.Signature import pkcs1_15
 
 from app.config import settings
 from app.dependencies import get_current_user
 
 router = APIRouter(prefix="/api/qz", tags=["QZ Tray"])
 
-_rsa_key: RSA.RsaKey | None = None
+# pycryptodome is imported on first signing request, not at worker start
+_rsa_key = None
 
 
-def _get_rsa_key() -> RSA.RsaKey:
+def _get_rsa_key():
     global _rsa_key
     if _rsa_key is None:
+        from Crypto.PublicKey import RSA
+
         pem = settings.QZ_PRIVATE_KEY_PEM
         if not pem:
             raise RuntimeError("QZ_PRIVATE_KEY_PEM is not configured")
@@ -43,6 +43,9 @@ async def qz_sign(
     Called by the frontend during QZ Tray connection — requires auth so
     only logged-in staff can trigger silent printing.
     """
+    from Crypto.Hash import SHA
+    from Crypto.Signature import pkcs1_15
+
     try:
         key = _get_rsa_key()
         h = SHA.new(body.message.encode("utf-8"))
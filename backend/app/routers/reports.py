@@ -8,6 +8,7 @@ from app.database import get_db
 from app.dependencies import require_roles
 from app.core.rbac import UserRole
 from app.core.data_cutoff import clamp_date_from, clamp_date_to, clamp_single_date
+from app.core.responses import FastJSONResponse
 from app.core.route_scope import get_route_branch_ids, needs_route_scope
 from app.middleware.rate_limit import limiter
 from app.models.user import User
@@ -26,10 +27,13 @@ from app.schemas.report import (
     TicketDetailsReport,
 )
 from sqlalchemy import select
-from app.services import report_service, pdf_service
+from app.services import report_service
 from app.services.activity_log_service import log_activity, ActivityAction
 
-router = APIRouter(prefix="/api/reports", tags=["Reports"])
+# Report services build their dicts in schema shape; the float-only
+# summaries return FastJSONResponse directly and skip re-validation. The
+# Decimal reports still validate (Decimal/int mixes) but render via orjson.
+router = APIRouter(prefix="/api/reports", tags=["Reports"], default_response_class=FastJSONResponse)
 
 _report_roles = require_roles(UserRole.SUPER_ADMIN, UserRole.ADMIN, UserRole.MANAGER, UserRole.BILLING_OPERATOR)
 
@@ -236,7 +240,7 @@ async def revenue_report(
     date_from = clamp_date_from(date_from, current_user.role)
     date_to = clamp_date_to(date_to, current_user.role)
     _log_report(background_tasks, current_user, "revenue", False, date_from=date_from, date_to=date_to, branch_id=branch_id, route_id=route_id, grouping=grouping)
-    return await report_service.get_revenue_report(db, date_from, date_to, branch_id, route_id, grouping)
+    return FastJSONResponse(await report_service.get_revenue_report(db, date_from, date_to, branch_id, route_id, grouping))
 
 
 @limiter.limit("10/minute")
@@ -261,7 +265,7 @@ async def ticket_count_report(
     date_from = clamp_date_from(date_from, current_user.role)
     date_to = clamp_date_to(date_to, current_user.role)
     _log_report(background_tasks, current_user, "ticket_count", False, date_from=date_from, date_to=date_to, branch_id=branch_id, route_id=route_id, group_by=group_by)
-    return await report_service.get_ticket_count_report(db, date_from, date_to, branch_id, route_id, group_by)
+    return FastJSONResponse(await report_service.get_ticket_count_report(db, date_from, date_to, branch_id, route_id, group_by))
 
 
 @limiter.limit("10/minute")
@@ -285,7 +289,7 @@ async def item_breakdown_report(
     date_from = clamp_date_from(date_from, current_user.role)
     date_to = clamp_date_to(date_to, current_user.role)
     _log_report(background_tasks, current_user, "item_breakdown", False, date_from=date_from, date_to=date_to, branch_id=branch_id, route_id=route_id)
-    return await report_service.get_item_breakdown_report(db, date_from, date_to, branch_id, route_id)
+    return FastJSONResponse(await report_service.get_item_breakdown_report(db, date_from, date_to, branch_id, route_id))
 
 
 @limiter.limit("10/minute")
@@ -325,7 +329,7 @@ async def branch_summary_report(
     date_from = clamp_date_from(date_from, current_user.role)
     date_to = clamp_date_to(date_to, current_user.role)
     _log_report(background_tasks, current_user, "branch_summary", False, date_from=date_from, date_to=date_to)
-    return await report_service.get_branch_summary_report(db, date_from, date_to, branch_ids=branch_ids)
+    return FastJSONResponse(await report_service.get_branch_summary_report(db, date_from, date_to, branch_ids=branch_ids))
 
 
 @limiter.limit("10/minute")
@@ -349,7 +353,7 @@ async def payment_mode_report(
     date_from = clamp_date_from(date_from, current_user.role)
     date_to = clamp_date_to(date_to, current_user.role)
     _log_report(background_tasks, current_user, "payment_mode", False, date_from=date_from, date_to=date_to, branch_id=branch_id, route_id=route_id)
-    return await report_service.get_payment_mode_report(db, date_from, date_to, branch_id, route_id)
+    return FastJSONResponse(await report_service.get_payment_mode_report(db, date_from, date_to, branch_id, route_id))
 
 
 @limiter.limit("10/minute")
@@ -530,6 +534,7 @@ async def get_date_wise_amount_pdf(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(_report_roles),
 ):
+    from app.services import pdf_service
     route_id, branch_id = await _scope_route_and_branch(db, current_user, route_id, branch_id)
     date_from = clamp_date_from(date_from, current_user.role)
     date_to = clamp_date_to(date_to, current_user.role)
@@ -559,6 +564,7 @@ async def get_ferry_wise_item_pdf(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(_report_roles),
 ):
+    from app.services import pdf_service
     route_id, branch_id = await _scope_route_and_branch(db, current_user, route_id, branch_id)
     date = clamp_single_date(date, current_user.role)
     data = await report_service.get_ferry_wise_item_summary(db, date, branch_id, payment_mode_id=payment_mode_id, route_id=route_id)
@@ -588,6 +594,7 @@ async def get_itemwise_levy_pdf(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(_report_roles),
 ):
+    from app.services import pdf_service
     route_id, branch_id = await _scope_route_and_branch(db, current_user, route_id, branch_id)
     date_from = clamp_date_from(date_from, current_user.role)
     date_to = clamp_date_to(date_to, current_user.role)
@@ -617,6 +624,7 @@ async def get_payment_mode_pdf(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(_report_roles),
 ):
+    from app.services import pdf_service
     route_id, branch_id = await _scope_route_and_branch(db, current_user, route_id, branch_id)
     date_from = clamp_date_from(date_from, current_user.role)
     date_to = clamp_date_to(date_to, current_user.role)
@@ -671,6 +679,7 @@ async def get_ticket_details_pdf(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(_report_roles),
 ):
+    from app.services import pdf_service
     route_id, branch_id = await _scope_route_and_branch(db, current_user, route_id, branch_id)
     date = clamp_single_date(date, current_user.role)
     data = await report_service.get_ticket_details_report(db, date, branch_id, route_id, payment_mode_id, boat_id)
@@ -700,6 +709,7 @@ async def get_user_wise_summary_pdf(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(_report_roles),
 ):
+    from app.services import pdf_service
     route_id, branch_id = await _scope_route_and_branch(db, current_user, route_id, branch_id)
     if current_user.role == UserRole.BILLING_OPERATOR:
         user_id = str(current_user.id)
@@ -737,6 +747,7 @@ async def get_vehicle_wise_tickets_pdf(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(_report_roles),
 ):
+    from app.services import pdf_service
     route_id, branch_id = await _scope_route_and_branch(db, current_user, route_id, branch_id)
     date = clamp_single_date(date, current_user.role)
     data = await report_service.get_vehicle_wise_tickets(db, date, branch_id, route_id, payment_mode_id, boat_id)
@@ -763,6 +774,7 @@ async def get_branch_summary_pdf(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(_report_roles),
 ):
+    from app.services import pdf_service
     branch_ids: list[int] | None = None
     if needs_route_scope(current_user):
         if not current_user.route_id:
@@ -809,6 +821,7 @@ async def get_branch_item_summary_pdf(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(_report_roles),
 ):
+    from app.services import pdf_service
     route_id, branch_id = await _scope_route_and_branch(db, current_user, route_id, branch_id)
     date_from = clamp_date_from(date_from, current_user.role)
     date_to = clamp_date_to(date_to, current_user.role)
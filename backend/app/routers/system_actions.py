@@ -364,8 +364,8 @@ async def rollback_to_release(
     - Audit-logged with both source and target tags.
     - Push-notifies all SuperAdmins so other operators see the change.
     """
-    got_lock = await release_service.acquire_rollback_lock(db)
-    if not got_lock:
+    lock_session = await release_service.acquire_rollback_lock()
+    if lock_session is None:
         raise HTTPException(status_code=409, detail="Another rollback is already in progress")
 
     try:
@@ -470,7 +470,7 @@ async def rollback_to_release(
             error=host_result.get("error"),
         )
     finally:
-        await release_service.release_rollback_lock(db)
+        await release_service.release_rollback_lock(lock_session)
 
 
 # ─── incident report (one-tap diagnostic bundle) ─────────────────────
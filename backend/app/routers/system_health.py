@@ -16,6 +16,7 @@ from sqlalchemy import desc, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import settings
+from app.core import memory
 from app.core.rbac import UserRole
 from app.database import get_db
 from app.dependencies import get_current_user, require_roles
@@ -28,6 +29,7 @@ from app.schemas.system_health import (
     HealthEventRead,
     PushDeviceCreate,
     PushDeviceRead,
+    TracemallocControl,
 )
 from app.services import push_service, system_health_service
 
@@ -36,6 +38,7 @@ logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/system-health", tags=["System Health"])
 
 _admin_or_super = require_roles(UserRole.SUPER_ADMIN, UserRole.ADMIN)
+_super_admin_only = require_roles(UserRole.SUPER_ADMIN)
 
 
 # ─── Push device registration ────────────────────────────────────────────
@@ -125,6 +128,29 @@ async def status_snapshot(
     return await system_health_service.get_status(db)
 
 
+# ─── Memory diagnostics (app/core/memory.py) ────────────────────────────
+
+
+@router.get("/memory")
+async def memory_diagnostics(_user: Annotated[User, Depends(_super_admin_only)]):
+    """RSS history of the worker answering, plus every worker's latest tracemalloc report.
+
+    Reports refresh once per MEMORY_SAMPLE_SECONDS while tracing is on.
+    `growth_since_baseline` ranks allocation sites by how much they have
+    grown since tracing was (re)started.
+    """
+    return {"rss": memory.rss_status(), **memory.read_reports()}
+
+
+@router.post("/memory/tracemalloc")
+async def control_tracemalloc(
+    body: TracemallocControl,
+    _user: Annotated[User, Depends(_super_admin_only)],
+):
+    """Start/stop tracemalloc in all workers; every call resets the baseline snapshot."""
+    return memory.set_tracing(body.enabled, body.frames)
+
+
 # ─── Events: list (dashboard feed) and ingest (from health_check.sh) ────
 
 
@@ -1,4 +1,5 @@
 from datetime import date
+from typing import Literal
 
 from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request, status
 from fastapi.responses import Response
@@ -7,7 +8,9 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.database import get_db
 from app.dependencies import require_roles
 from app.core.rbac import UserRole
+from app.core import qr_cache
 from app.core.data_cutoff import clamp_date_from, clamp_date_to, is_before_cutoff
+from app.core.responses import FastJSONResponse
 from app.core.route_scope import needs_route_scope, get_route_branch_ids
 from app.core.timezone import today_ist
 from app.middleware.rate_limit import limiter
@@ -16,11 +19,10 @@ from app.schemas.ticket import (
     TicketCreate, TicketRead, TicketUpdate, RateLookupResponse,
     MultiTicketCreate, MultiTicketInitResponse, TicketingStatusResponse,
 )
-from app.services import ticket_service
+from app.services import receipt_service, ticket_service
 from app.services.activity_log_service import log_activity, ActivityAction
-from app.services.qr_service import generate_qr_png
 
-router = APIRouter(prefix="/api/tickets", tags=["Tickets"])
+router = APIRouter(prefix="/api/tickets", tags=["Tickets"], default_response_class=FastJSONResponse)
 
 # Ticketing is accessible to SUPER_ADMIN, ADMIN, MANAGER, BILLING_OPERATOR
 _ticket_roles = require_roles(
@@ -76,12 +78,13 @@ async def list_tickets(
     # Data cutoff: clamp dates for non-SUPER_ADMIN
     date_from = clamp_date_from(date_from, current_user.role)
     date_to = clamp_date_to(date_to, current_user.role)
-    return await ticket_service.get_all_tickets(
+    # Up to 5000 rows; _enrich_ticket already emits the TicketRead shape
+    return FastJSONResponse(await ticket_service.get_all_tickets(
         db, skip, limit, sort_by, sort_order,
         status, branch_filter, route_filter, date_from, date_to,
         id_filter, id_op, id_filter_end, ticket_no_filter,
         is_multi_ticket,
-    )
+    ))
 
 
 @router.get(
@@ -258,6 +261,7 @@ async def create_multi_tickets(
         ActivityAction.TICKET_BATCH,
         {"ticket_count": len(result), "branch_id": result[0]["branch_id"] if result else None},
     )
+    qr_cache.schedule_prerender([t["verification_code"] for t in result])
     return result
 
 
@@ -306,20 +310,30 @@ async def create_ticket(
         ActivityAction.TICKET_CREATE,
         {"ticket_id": str(result["id"]), "ticket_no": result["ticket_no"], "branch_id": result["branch_id"]},
     )
+    qr_cache.schedule_prerender([result["verification_code"]])
     return result
 
 
 @router.get(
     "/{ticket_id}/qr",
     summary="Get QR code image for a ticket",
-    description="Returns a PNG QR code image for the ticket's verification code.",
+    description="Returns a QR code image for the ticket's verification code. "
+                "format=thermal|svg|escpos gives a plain 1-bit rendering for receipt printers.",
     responses={
-        200: {"description": "QR code PNG image", "content": {"image/png": {}}},
+        200: {
+            "description": "QR code image",
+            "content": {"image/png": {}, "image/svg+xml": {}, "application/octet-stream": {}},
+        },
+        304: {"description": "Not modified (If-None-Match matched the ETag)"},
         404: {"description": "Ticket not found or has no verification code"},
     },
 )
 async def get_ticket_qr(
+    request: Request,
     ticket_id: int,
+    format: Literal["styled", "thermal", "svg", "escpos"] = Query(
+        "styled", description="styled PNG, or plain for thermal printers: 1-bit PNG, SVG, ESC/POS raster",
+    ),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(_ticket_roles),
 ):
@@ -335,8 +349,48 @@ async def get_ticket_qr(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Ticket has no verification code",
         )
-    png_bytes = generate_qr_png(verification_code)
-    return Response(content=png_bytes, media_type="image/png")
+    return await qr_cache.qr_response(request, str(verification_code), format)
+
+
+_ESCPOS_RESPONSES = {
+    200: {"description": "ESC/POS byte stream", "content": {"application/octet-stream": {}}},
+    400: {"description": "Cancelled ticket, too many tickets, or bad paper width"},
+    403: {"description": "Ticket not in your assigned route"},
+    404: {"description": "Ticket not found"},
+}
+
+
+@router.get(
+    "/print/escpos",
+    summary="ESC/POS print job for several tickets",
+    description="Ready-to-print ESC/POS receipts for the given tickets (e.g. a multi-ticket batch), "
+                "concatenated in order with a cut after each. Send to QZ Tray as raw data.",
+    responses=_ESCPOS_RESPONSES,
+)
+async def get_tickets_escpos(
+    ids: list[int] = Query(..., description="Ticket IDs, in print order (up to 50)"),
+    paper_width: Literal["58mm", "80mm"] = Query("80mm"),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(_ticket_roles),
+):
+    data = await receipt_service.build_escpos(db, ids, current_user, paper_width)
+    return Response(content=data, media_type="application/octet-stream")
+
+
+@router.get(
+    "/{ticket_id}/escpos",
+    summary="ESC/POS print job for a ticket",
+    description="Ready-to-print ESC/POS receipt for one ticket. Send to QZ Tray as raw data.",
+    responses=_ESCPOS_RESPONSES,
+)
+async def get_ticket_escpos(
+    ticket_id: int,
+    paper_width: Literal["58mm", "80mm"] = Query("80mm"),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(_ticket_roles),
+):
+    data = await receipt_service.build_escpos(db, [ticket_id], current_user, paper_width)
+    return Response(content=data, media_type="application/octet-stream")
 
 
 @router.get(
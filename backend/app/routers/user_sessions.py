@@ -8,11 +8,12 @@ from sqlalchemy import select
 from app.database import get_db
 from app.dependencies import require_roles
 from app.core.rbac import UserRole
+from app.core.responses import FastJSONResponse
 from app.models.user import User
 from app.schemas.user_session import ActiveSessionRead, SessionHistoryRead, ActivitySummary
 from app.services import user_session_service
 
-router = APIRouter(prefix="/api/user-sessions", tags=["User Sessions"])
+router = APIRouter(prefix="/api/user-sessions", tags=["User Sessions"], default_response_class=FastJSONResponse)
 
 _super_admin_only = require_roles(UserRole.SUPER_ADMIN)
 
@@ -28,7 +29,7 @@ async def list_active_sessions(
     _: User = Depends(_super_admin_only),
 ):
     await user_session_service.close_stale_sessions(db)
-    return await user_session_service.get_active_sessions(db)
+    return FastJSONResponse(await user_session_service.get_active_sessions(db))
 
 
 @router.get(
@@ -48,9 +49,9 @@ async def list_session_history(
 ):
     parsed_from = _dt.datetime.combine(date_from, _dt.time.min, tzinfo=_dt.timezone.utc) if date_from else None
     parsed_to = _dt.datetime.combine(date_to, _dt.time(23, 59, 59), tzinfo=_dt.timezone.utc) if date_to else None
-    return await user_session_service.get_session_history(
+    return FastJSONResponse(await user_session_service.get_session_history(
         db, parsed_from, parsed_to, user_id, skip, limit,
-    )
+    ))
 
 
 @router.get(
@@ -84,7 +85,7 @@ async def get_session_activities(
     db: AsyncSession = Depends(get_db),
     _: User = Depends(_super_admin_only),
 ):
-    return await user_session_service.get_session_activity_summary(db, session_id)
+    return FastJSONResponse(await user_session_service.get_session_activity_summary(db, session_id))
 
 
 @router.get(
@@ -1,16 +1,25 @@
+import datetime
 import uuid
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi import APIRouter, Depends, Query, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
 from app.dependencies import require_roles
 from app.core.rbac import UserRole
 from app.models.user import User
-from app.schemas.verification import VerificationResult, CheckInRequest, CheckInResponse
-from app.middleware.rate_limit import limiter
-from app.services import verification_service
-from app.services.qr_service import verify_qr_payload
+from app.schemas.verification import (
+    BulkCheckInRequest,
+    BulkCheckInResponse,
+    CheckInRequest,
+    CheckInResponse,
+    OfflineManifest,
+    VerificationResult,
+)
+from app.config import settings
+from app.core import scan_guard
+from app.middleware.rate_limit import get_device_key, limiter
+from app.services import offline_manifest_service, verification_service
 
 router = APIRouter(prefix="/api/verification", tags=["Ticket Verification"])
 
@@ -19,7 +28,6 @@ _verification_roles = require_roles(
 )
 
 
-@limiter.limit("30/minute")
 @router.get(
     "/booking",
     response_model=VerificationResult,
@@ -27,6 +35,7 @@ _verification_roles = require_roles(
     description="Look up a booking by its QR verification code (UUID).",
     responses={404: {"description": "Booking not found"}},
 )
+@limiter.limit("30/minute", key_func=get_device_key)
 async def lookup_booking(
     request: Request,
     code: uuid.UUID = Query(..., description="Booking verification code (UUID from QR)"),
@@ -36,7 +45,6 @@ async def lookup_booking(
     return await verification_service.lookup_booking_by_code(db, code, current_user)
 
 
-@limiter.limit("30/minute")
 @router.get(
     "/scan",
     response_model=VerificationResult,
@@ -48,29 +56,17 @@ async def lookup_booking(
         404: {"description": "Booking or ticket not found"},
     },
 )
+@limiter.limit(settings.SCAN_RATE_LIMIT, key_func=get_device_key)
 async def scan_qr(
     request: Request,
     payload: str = Query(..., description="Full QR payload string (code.signature)"),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(_verification_roles),
 ):
-    code = verify_qr_payload(payload)
-    if code is None:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Invalid or tampered QR code",
-        )
-    try:
-        code_uuid = uuid.UUID(code)
-    except ValueError:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Invalid verification code format",
-        )
+    code_uuid = scan_guard.parse_scan(payload)
     return await verification_service.lookup_by_code(db, code_uuid, current_user)
 
 
-@limiter.limit("15/minute")
 @router.post(
     "/check-in",
     response_model=CheckInResponse,
@@ -85,6 +81,7 @@ async def scan_qr(
         409: {"description": "Already verified"},
     },
 )
+@limiter.limit(settings.SCAN_RATE_LIMIT, key_func=get_device_key)
 async def check_in(
     request: Request,
     body: CheckInRequest,
@@ -94,7 +91,44 @@ async def check_in(
     return await verification_service.verify(db, body.verification_code, current_user)
 
 
-@limiter.limit("30/minute")
+@router.get(
+    "/manifest",
+    response_model=OfflineManifest,
+    summary="Offline boarding manifest",
+    description="One-way QR digests of every valid booking and ticket for a route and travel date, "
+                "for checkers who validate scans on the device. Pass the returned `cursor` "
+                "as `since` to fetch only what changed.",
+    responses={403: {"description": "Route mismatch - not assigned to this route"}},
+)
+@limiter.limit("30/minute", key_func=get_device_key)
+async def offline_manifest(
+    request: Request,
+    route_id: int = Query(..., description="Route ID"),
+    date: datetime.date = Query(..., description="Travel date (YYYY-MM-DD)"),
+    since: datetime.datetime | None = Query(None, description="Cursor from a previous manifest"),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(_verification_roles),
+):
+    return await offline_manifest_service.build_manifest(db, route_id, date, current_user, since)
+
+
+@router.post(
+    "/check-in/bulk",
+    response_model=BulkCheckInResponse,
+    summary="Upload offline check-ins",
+    description="Apply check-ins queued while offline (up to 500 per call). Idempotent: "
+                "re-uploading a scan reports it as already_verified.",
+)
+@limiter.limit("30/minute", key_func=get_device_key)
+async def bulk_check_in(
+    request: Request,
+    body: BulkCheckInRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(_verification_roles),
+):
+    return await verification_service.bulk_check_in(db, body.scans, current_user)
+
+
 @router.get(
     "/booking-number",
     response_model=VerificationResult,
@@ -102,6 +136,7 @@ async def check_in(
     description="Look up a portal booking by its booking number. Optionally filter by branch.",
     responses={404: {"description": "Booking not found"}},
 )
+@limiter.limit("30/minute", key_func=get_device_key)
 async def lookup_booking_by_number(
     request: Request,
     booking_no: int = Query(..., description="Booking number (e.g. 1, 2, 3...)"),
@@ -112,7 +147,6 @@ async def lookup_booking_by_number(
     return await verification_service.lookup_booking_by_number(db, booking_no, current_user, branch_id)
 
 
-@limiter.limit("30/minute")
 @router.get(
     "/ticket",
     response_model=VerificationResult,
@@ -120,6 +154,7 @@ async def lookup_booking_by_number(
     description="Look up an operator ticket by ticket number and branch ID.",
     responses={404: {"description": "Ticket not found"}},
 )
+@limiter.limit("30/minute", key_func=get_device_key)
 async def lookup_ticket(
     request: Request,
     ticket_no: int = Query(..., description="Ticket number"),
@@ -3,6 +3,8 @@ from uuid import UUID
 
 from pydantic import BaseModel, Field
 
+from app.core.memory import MAX_TRACE_FRAMES
+
 
 class PushDeviceCreate(BaseModel):
     expo_push_token: str = Field(..., min_length=10, max_length=255)
@@ -47,3 +49,10 @@ class HealthEventIngestResponse(BaseModel):
     push_sent: int
     push_devices: int
     push_errors: list[str]
+
+
+class TracemallocControl(BaseModel):
+    """Switch tracemalloc on/off in every worker (and reset their baselines)."""
+
+    enabled: bool
+    frames: int = Field(1, ge=1, le=MAX_TRACE_FRAMES, description="Traceback depth; 1 groups by allocating line")
@@ -38,3 +38,43 @@ class CheckInResponse(BaseModel):
     id: int
     reference_no: int
     checked_in_at: datetime.datetime
+
+
+class OfflineManifest(BaseModel):
+    version: int
+    route_id: int
+    date: datetime.date
+    full: bool = Field(..., description="False for a delta (changes since the given cursor)")
+    cursor: datetime.datetime = Field(..., description="Pass back as `since` for the next delta")
+    count: int
+    record_size: int = Field(..., description="Bytes per record in `codes`")
+    codes: str = Field(..., description="Base64 of sorted records: first 16 bytes of SHA-256 of each QR payload")
+    digest: str = Field(..., description="SHA-256 of the decoded `codes`")
+    detail_fields: list[str]
+    details: list[list] = Field(..., description="One row per record, in `codes` order")
+
+
+class OfflineScan(BaseModel):
+    verification_code: uuid.UUID
+    scanned_at: datetime.datetime | None = Field(None, description="Device time of the offline scan")
+
+
+class BulkCheckInRequest(BaseModel):
+    scans: list[OfflineScan] = Field(..., min_length=1, max_length=500)
+
+
+class BulkCheckInResult(BaseModel):
+    verification_code: uuid.UUID
+    result: str = Field(
+        ..., description="verified | already_verified | cancelled | pending | forbidden | not_found"
+    )
+    source: str | None = None
+    id: int | None = None
+    reference_no: int | None = None
+    checked_in_at: datetime.datetime | None = None
+
+
+class BulkCheckInResponse(BaseModel):
+    applied: int
+    counts: dict[str, int]
+    results: list[BulkCheckInResult]
@@ -5,10 +5,10 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
 from app.config import settings
-from app.core.security import verify_password, get_password_hash, create_access_token, create_refresh_token, create_password_reset_token, decode_token
+from app.core.security import verify_password_async, get_password_hash_async, create_access_token, create_refresh_token, create_password_reset_token, decode_token
 from app.core.rbac import ROLE_MENU_ITEMS, UserRole
 from app.models.user import User
-from app.services import token_service
+from app.services import heartbeat_service, token_service
 
 MAX_FAILED_ATTEMPTS = 5
 LOCKOUT_DURATION_MINUTES = 15
@@ -27,7 +27,7 @@ async def authenticate_user(db: AsyncSession, username: str, password: str) -> U
     if not user.is_active:
         return None
 
-    if not verify_password(password, user.hashed_password):
+    if not await verify_password_async(password, user.hashed_password):
         # Increment failed attempts — commit immediately so the counter persists
         # even when login() raises HTTPException (which would rollback a flush)
         user.failed_login_attempts = (user.failed_login_attempts or 0) + 1
@@ -147,10 +147,12 @@ async def refresh_access_token(
     #     + SecureStore is the security boundary, not a 10-min web timer.
     #     Without this, backgrounding the phone for >10 min force-logs out.
     skip_idle_check = is_mobile_app or user.role == UserRole.TICKET_CHECKER
-    if user.session_last_active and not skip_idle_check:
-        idle_seconds = (datetime.now(timezone.utc) - user.session_last_active).total_seconds()
+    last_active = heartbeat_service.last_active(user.id, user.active_session_id, user.session_last_active)
+    if last_active and not skip_idle_check:
+        idle_seconds = (datetime.now(timezone.utc) - last_active).total_seconds()
         if idle_seconds > settings.SESSION_IDLE_TIMEOUT_MINUTES * 60:
             from app.services import user_session_service
+            heartbeat_service.discard(user.id)
             if user.active_session_id:
                 await user_session_service.end_session(db, user.active_session_id, "idle_timeout")
             user.active_session_id = None
@@ -196,6 +198,7 @@ async def logout(db: AsyncSession, refresh_token: str | None, user: User | None
     if refresh_token:
         await token_service.revoke_token(db, refresh_token)
     if user:
+        heartbeat_service.discard(user.id)
         # Close session tracking record before clearing the session ID
         if user.active_session_id:
             from app.services import user_session_service
@@ -247,9 +250,10 @@ async def reset_password(db: AsyncSession, token: str, new_password: str) -> Non
     if not user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
 
-    user.hashed_password = get_password_hash(new_password)
+    user.hashed_password = await get_password_hash_async(new_password)
 
     # Close active session and revoke all tokens — forces re-login with new password
+    heartbeat_service.discard(user.id)
     if user.active_session_id:
         from app.services import user_session_service
         await user_session_service.end_session(db, user.active_session_id, "password_reset")
@@ -7,6 +7,7 @@ from fastapi import HTTPException, status
 from sqlalchemy import select, func, or_, text
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core import catalogue_cache
 from app.core.timezone import today_ist
 
 from app.models.booking import Booking
@@ -276,44 +277,130 @@ async def get_to_branches(db: AsyncSession, from_branch_id: int) -> list[dict]:
 
 async def get_online_items(
     db: AsyncSession, from_branch_id: int, to_branch_id: int
-) -> list[dict]:
+) -> tuple[str, list[dict]]:
     """
     Find items with online_visibility=True that have active rates
     for the route connecting the two branches.
+    Returns (etag, items); served from the route-keyed catalogue cache.
     """
     route = await _find_route(db, from_branch_id, to_branch_id)
+    cached = catalogue_cache.get(route.id)
+    if cached is not None:
+        return cached
+    read_generation = catalogue_cache.generation()
 
-    # Get all active, online-visible items
-    items_result = await db.execute(
-        select(Item)
+    # One row per item: DISTINCT ON keeps the first active rate, as the
+    # per-item lookup with LIMIT 1 did
+    result = await db.execute(
+        select(Item.id, Item.name, Item.short_name, Item.is_vehicle, ItemRate.rate, ItemRate.levy)
+        .join(
+            ItemRate,
+            (ItemRate.item_id == Item.id)
+            & (ItemRate.route_id == route.id)
+            & (ItemRate.is_active == True),
+        )
         .where(Item.is_active == True, Item.online_visibility == True)
-        .order_by(Item.id)
+        .distinct(Item.id)
+        .order_by(Item.id, ItemRate.id)
     )
-    items = items_result.scalars().all()
-
-    result_items = []
-    for item in items:
-        rate_result = await db.execute(
-            select(ItemRate)
-            .where(
-                ItemRate.item_id == item.id,
-                ItemRate.route_id == route.id,
-                ItemRate.is_active == True,
+    items = [
+        {
+            "id": row.id,
+            "name": row.name,
+            "short_name": row.short_name,
+            "is_vehicle": bool(row.is_vehicle),
+            "rate": float(row.rate) if row.rate is not None else 0,
+            "levy": float(row.levy) if row.levy is not None else 0,
+        }
+        for row in result.all()
+    ]
+    return catalogue_cache.put(route.id, items, read_generation), items
+
+
+async def _build_network_graph(db: AsyncSession) -> dict:
+    branches = (
+        await db.execute(
+            select(Branch.id, Branch.name).where(Branch.is_active == True).order_by(Branch.name)
+        )
+    ).all()
+    active_ids = {b.id for b in branches}
+    names = {b.id: b.name for b in branches}
+
+    routes = [
+        r for r in (
+            await db.execute(
+                select(Route.id, Route.branch_id_one, Route.branch_id_two)
+                .where(Route.is_active == True)
+                .order_by(Route.id)
             )
-            .limit(1)
-        )
-        ir = rate_result.scalar_one_or_none()
-        if ir:
-            result_items.append({
-                "id": item.id,
-                "name": item.name,
-                "short_name": item.short_name,
-                "is_vehicle": bool(item.is_vehicle),
-                "rate": float(ir.rate) if ir.rate is not None else 0,
-                "levy": float(ir.levy) if ir.levy is not None else 0,
-            })
-
-    return result_items
+        ).all()
+        if r.branch_id_one in active_ids and r.branch_id_two in active_ids
+    ]
+    adjacency: dict[int, list[int]] = {}
+    for r in routes:
+        adjacency.setdefault(r.branch_id_one, []).append(r.branch_id_two)
+        adjacency.setdefault(r.branch_id_two, []).append(r.branch_id_one)
+    for to_ids in adjacency.values():
+        to_ids.sort(key=lambda b: names[b])
+
+    # Same rows as get_online_items, for every active route at once
+    items: dict[int, list[dict]] = {r.id: [] for r in routes}
+    item_rows = await db.execute(
+        select(
+            ItemRate.route_id, Item.id, Item.name, Item.short_name, Item.is_vehicle,
+            ItemRate.rate, ItemRate.levy,
+        )
+        .join(ItemRate, (ItemRate.item_id == Item.id) & (ItemRate.is_active == True))
+        .where(
+            Item.is_active == True, Item.online_visibility == True,
+            ItemRate.route_id.in_(list(items)),
+        )
+        .distinct(ItemRate.route_id, Item.id)
+        .order_by(ItemRate.route_id, Item.id, ItemRate.id)
+    )
+    for row in item_rows.all():
+        items[row.route_id].append({
+            "id": row.id,
+            "name": row.name,
+            "short_name": row.short_name,
+            "is_vehicle": bool(row.is_vehicle),
+            "rate": float(row.rate) if row.rate is not None else 0,
+            "levy": float(row.levy) if row.levy is not None else 0,
+        })
+
+    schedules: dict[int, list[dict]] = {}
+    schedule_rows = await db.execute(
+        select(FerrySchedule.branch_id, FerrySchedule.departure)
+        .where(FerrySchedule.branch_id.in_(active_ids))
+        .order_by(FerrySchedule.branch_id, FerrySchedule.departure.asc())
+    )
+    for row in schedule_rows.all():
+        schedules.setdefault(row.branch_id, []).append({"schedule_time": _format_time(row.departure)})
+
+    return {
+        "branches": [{"id": b.id, "name": b.name} for b in branches],
+        "routes": [
+            {"id": r.id, "branch_id_one": r.branch_id_one, "branch_id_two": r.branch_id_two}
+            for r in routes
+        ],
+        "adjacency": adjacency,
+        "items": items,
+        "schedules": schedules,
+    }
+
+
+async def get_network_graph(db: AsyncSession) -> tuple[str, dict]:
+    """Everything the booking form needs up front. Returns (etag, graph).
+
+    Cached per worker in catalogue_cache and dropped on every item, rate,
+    branch, route or schedule write, so a revalidation costs no queries.
+    """
+    cached = catalogue_cache.get_network()
+    if cached is not None:
+        return cached
+    read_generation = catalogue_cache.generation()
+    graph = await _build_network_graph(db)
+    return catalogue_cache.put_network(graph, read_generation), graph
 
 
 async def get_schedules(db: AsyncSession, branch_id: int) -> list[dict]:
@@ -2,6 +2,7 @@ from fastapi import HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func, or_
 
+from app.core import catalogue_cache
 from app.models.branch import Branch
 from app.schemas.branch import BranchCreate, BranchUpdate
 
@@ -133,6 +134,7 @@ async def create_branch(db: AsyncSession, branch_in: BranchCreate) -> Branch:
     )
     db.add(branch)
     await db.commit()
+    await catalogue_cache.invalidate()
     await db.refresh(branch)
     return branch
 
@@ -155,5 +157,6 @@ async def update_branch(db: AsyncSession, branch_id: int, branch_in: BranchUpdat
     for field, value in update_data.items():
         setattr(branch, field, value)
     await db.commit()
+    await catalogue_cache.invalidate()
     await db.refresh(branch)
     return branch
@@ -4,6 +4,7 @@ from fastapi import HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func
 
+from app.core import catalogue_cache
 from app.models.ferry_schedule import FerrySchedule
 from app.models.branch import Branch
 from app.models.boat import Boat
@@ -182,6 +183,7 @@ async def create_schedule(db: AsyncSession, schedule_in: FerryScheduleCreate) ->
     )
     db.add(schedule)
     await db.commit()
+    await catalogue_cache.invalidate()
     await db.refresh(schedule)
     return await get_schedule_by_id(db, schedule.id)
 
@@ -214,5 +216,6 @@ async def update_schedule(db: AsyncSession, schedule_id: int, schedule_in: Ferry
         schedule.boat_id = update_data["boat_id"]
 
     await db.commit()
+    await catalogue_cache.invalidate()
     await db.refresh(schedule)
     return await get_schedule_by_id(db, schedule.id)
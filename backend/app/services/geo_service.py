@@ -1,18 +1,190 @@
+"""IP → location lookup for session tracking.
+
+Lookup order for a public IP:
+1. In-process LRU+TTL cache (operators log in from the same few counters).
+2. Optional offline IP-range database (GEOIP_DB_PATH) — a memory-mapped
+   file of sorted IPv4 ranges, binary-searched. Works with no network, so
+   lookups also work in dev and tests. Build one with
+   scripts/build_geoip_db.py.
+3. ip-api.com over a shared keep-alive client, honouring its rate-limit
+   headers (free tier: 45 requests/minute).
+
+Nothing here runs on the login path: user_session_service enqueues geo
+enrichment after the session row is committed and fills it in afterwards.
+"""
+import bisect
+import ipaddress
 import logging
+import mmap
+import struct
+import time
+from collections import OrderedDict
 
 import httpx
 
+from app.config import settings
+
 logger = logging.getLogger("ssmspl")
 
 _PRIVATE_PREFIXES = ("127.", "10.", "172.", "192.168.", "0.", "::1", "fd", "fe80")
 
+CACHE_SIZE = 4096
+CACHE_TTL_SECONDS = 24 * 3600
+
+# ip -> (expires_at, result)
+_cache: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+_client: httpx.AsyncClient | None = None
+_api_blocked_until = 0.0
+
+
+class GeoIPDatabase:
+    """Read-only, memory-mapped IPv4 range database.
+
+    File layout (little-endian), produced by scripts/build_geoip_db.py:
+        header   MAGIC (8 bytes), record count (u32)
+        records  sorted by range start, RECORD bytes each:
+                 start u32, end u32, lat f32, lon f32,
+                 label offset u32, isp offset u32
+        strings  u16 length + UTF-8 bytes; offsets are from file start,
+                 0xFFFFFFFF means "no value"
+    """
+
+    MAGIC = b"SSGEO1\x00\x00"
+    HEADER = struct.Struct("<8sI")
+    RECORD = struct.Struct("<IIffII")
+    NO_STRING = 0xFFFFFFFF
+
+    class _Starts:
+        """Sequence view over record start IPs, for bisect."""
+
+        def __init__(self, db: "GeoIPDatabase"):
+            self._db = db
+
+        def __len__(self) -> int:
+            return self._db.count
+
+        def __getitem__(self, i: int) -> int:
+            return struct.unpack_from("<I", self._db._mm, self._db._offset(i))[0]
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.count = self.HEADER.unpack_from(self._mm, 0)
+        if magic != self.MAGIC:
+            self._mm.close()
+            raise ValueError(f"{path} is not a GeoIP range database")
+        self._starts = self._Starts(self)
+
+    def _offset(self, i: int) -> int:
+        return self.HEADER.size + i * self.RECORD.size
+
+    def _string(self, offset: int) -> str | None:
+        if offset == self.NO_STRING:
+            return None
+        (length,) = struct.unpack_from("<H", self._mm, offset)
+        return self._mm[offset + 2:offset + 2 + length].decode("utf-8")
+
+    def lookup(self, ip: str) -> dict | None:
+        """Return location data for an IPv4 address, or None if not covered."""
+        try:
+            addr = ipaddress.ip_address(ip)
+        except ValueError:
+            return None
+        if addr.version != 4:
+            return None
+        n = int(addr)
+        i = bisect.bisect_right(self._starts, n) - 1
+        if i < 0:
+            return None
+        start, end, lat, lon, label_off, isp_off = self.RECORD.unpack_from(self._mm, self._offset(i))
+        if n > end:
+            return None
+        return {
+            "city_display": self._string(label_off),
+            "latitude": round(lat, 4),
+            "longitude": round(lon, 4),
+            "isp": self._string(isp_off),
+        }
+
+    def close(self) -> None:
+        self._mm.close()
+
+
+_db: GeoIPDatabase | None = None
+_db_loaded = False
+
+
+def _get_db() -> GeoIPDatabase | None:
+    global _db, _db_loaded
+    if not _db_loaded:
+        _db_loaded = True
+        if settings.GEOIP_DB_PATH:
+            try:
+                _db = GeoIPDatabase(settings.GEOIP_DB_PATH)
+                logger.info("GeoIP database loaded: %d ranges", _db.count)
+            except (OSError, ValueError) as exc:
+                logger.warning("GeoIP database unavailable (%s): %s", settings.GEOIP_DB_PATH, exc)
+    return _db
+
+
+def _cache_get(ip: str) -> dict | None:
+    entry = _cache.get(ip)
+    if entry is None:
+        return None
+    if entry[0] <= time.monotonic():
+        del _cache[ip]
+        return None
+    _cache.move_to_end(ip)
+    return entry[1]
+
+
+def _cache_put(ip: str, result: dict) -> None:
+    _cache[ip] = (time.monotonic() + CACHE_TTL_SECONDS, result)
+    _cache.move_to_end(ip)
+    while len(_cache) > CACHE_SIZE:
+        _cache.popitem(last=False)
+
+
+def _get_client() -> httpx.AsyncClient:
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(timeout=2.0)
+    return _client
+
+
+async def _lookup_api(ip: str) -> dict | None:
+    """Query ip-api.com. Returns None on transient failure (not cached)."""
+    global _api_blocked_until
+    if time.monotonic() < _api_blocked_until:
+        return None
+    resp = await _get_client().get(
+        f"http://ip-api.com/json/{ip}",
+        params={"fields": "status,city,regionName,country,lat,lon,isp"},
+    )
+    # X-Rl = requests left in the window, X-Ttl = seconds until it resets
+    if resp.headers.get("X-Rl") == "0" or resp.status_code == 429:
+        _api_blocked_until = time.monotonic() + int(resp.headers.get("X-Ttl", "60"))
+    if resp.status_code != 200:
+        logger.debug("Geo lookup failed for %s: HTTP %s", ip, resp.status_code)
+        return None
+    data = resp.json()
+    if data.get("status") != "success":
+        return {}
+    parts = [data.get("city"), data.get("regionName"), data.get("country")]
+    city_display = ", ".join(p for p in parts if p) or None
+    return {
+        "city_display": city_display,
+        "latitude": data.get("lat"),
+        "longitude": data.get("lon"),
+        "isp": data.get("isp"),
+    }
+
 
 async def resolve_geo(ip: str | None) -> dict:
-    """Resolve an IP address to location data via ip-api.com.
+    """Resolve an IP address to location data.
 
     Returns a dict with keys: city_display, latitude, longitude, isp.
     Returns empty dict on error, timeout, or private/localhost IPs.
-    Free tier: 45 requests/minute — more than enough for login events.
     """
     if not ip:
         return {}
@@ -21,29 +193,22 @@ async def resolve_geo(ip: str | None) -> dict:
     if any(ip.startswith(p) for p in _PRIVATE_PREFIXES):
         return {}
 
-    try:
-        async with httpx.AsyncClient(timeout=2.0) as client:
-            resp = await client.get(
-                f"http://ip-api.com/json/{ip}",
-                params={"fields": "status,city,regionName,country,lat,lon,isp"},
-            )
-            if resp.status_code != 200:
-                logger.debug("Geo lookup failed for %s: HTTP %s", ip, resp.status_code)
-                return {}
-            data = resp.json()
-            if data.get("status") != "success":
-                return {}
-            parts = [data.get("city"), data.get("regionName"), data.get("country")]
-            city_display = ", ".join(p for p in parts if p) or None
-            return {
-                "city_display": city_display,
-                "latitude": data.get("lat"),
-                "longitude": data.get("lon"),
-                "isp": data.get("isp"),
-            }
-    except Exception as exc:
-        logger.debug("Geo lookup failed for %s: %s", ip, exc)
+    cached = _cache_get(ip)
+    if cached is not None:
+        return cached
+
+    db = _get_db()
+    result = db.lookup(ip) if db else None
+    if result is None:
+        try:
+            result = await _lookup_api(ip)
+        except Exception as exc:
+            logger.debug("Geo lookup failed for %s: %s", ip, exc)
+            result = None
+    if result is None:
         return {}
+    _cache_put(ip, result)
+    return result
 
 
 # Backward-compatible alias
@@ -51,3 +216,15 @@ async def resolve_city(ip: str | None) -> str | None:
     """Resolve an IP to 'City, Region, Country' string. Legacy wrapper."""
     geo = await resolve_geo(ip)
     return geo.get("city_display")
+
+
+async def close() -> None:
+    """Close the shared HTTP client and the database map (lifespan shutdown)."""
+    global _client, _db, _db_loaded
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+    if _db is not None:
+        _db.close()
+        _db = None
+    _db_loaded = False
@@ -0,0 +1,133 @@
+"""
+Write-behind session heartbeat aggregator.
+
+Authenticated web requests used to write `users.session_last_active` and
+`user_sessions.last_heartbeat` inside the request transaction (throttled to
+one pair of writes per user every 30s). Each write leaves a dead tuple on
+both tables and bumped `users.updated_at` through its onupdate hook.
+
+Instead, `record()` keeps only the latest activity timestamp per user in
+process memory, and `heartbeat_flush_loop()` (started per worker at app
+startup) writes everything pending every FLUSH_INTERVAL_SECONDS with one
+`UPDATE ... FROM (VALUES ...)` per table.
+
+Idle-timeout checks read through `last_active()`, which merges the pending
+in-memory value with the DB column, so a user is never timed out because
+their latest heartbeat hasn't been flushed yet. Other workers see the DB
+value, which lags by at most one flush interval — negligible against the
+10-minute idle window.
+
+Flush statements are conditional: `users` rows only update while
+`active_session_id` still matches the recorded session, and `user_sessions`
+rows only while `ended_at IS NULL`. A pending heartbeat therefore can never
+resurrect a session that was closed (logout, idle timeout, password reset)
+between record and flush.
+"""
+import asyncio
+import logging
+import uuid
+from datetime import datetime, timezone
+
+from sqlalchemy import text
+
+from app.database import AsyncSessionLocal
+
+logger = logging.getLogger("ssmspl.heartbeat")
+
+FLUSH_INTERVAL_SECONDS = 5
+
+# user_id -> (session_id, last activity)
+_pending: dict[uuid.UUID, tuple[str, datetime]] = {}
+
+
+def record(user_id: uuid.UUID, session_id: str, at: datetime | None = None) -> None:
+    """Record activity for a user's active session. No DB access."""
+    _pending[user_id] = (session_id, at or datetime.now(timezone.utc))
+
+
+def discard(user_id: uuid.UUID) -> None:
+    """Drop any pending heartbeat for a user whose session is being closed."""
+    _pending.pop(user_id, None)
+
+
+def last_active(user_id: uuid.UUID, session_id: str | None, db_value: datetime | None) -> datetime | None:
+    """Latest known activity: the pending heartbeat for this session, else the DB value."""
+    pending = _pending.get(user_id)
+    if pending is None or pending[0] != session_id:
+        return db_value
+    if db_value is None or pending[1] > db_value:
+        return pending[1]
+    return db_value
+
+
+def _values_clause(rows: list[tuple[uuid.UUID, str, datetime]]) -> tuple[str, dict]:
+    """Build a `(VALUES ...)` list with one bound-parameter triple per row."""
+    parts = []
+    params = {}
+    for i, (user_id, session_id, at) in enumerate(rows):
+        parts.append(f"(CAST(:u{i} AS uuid), CAST(:s{i} AS varchar), CAST(:t{i} AS timestamptz))")
+        params[f"u{i}"] = str(user_id)
+        params[f"s{i}"] = session_id
+        params[f"t{i}"] = at
+    return ", ".join(parts), params
+
+
+async def flush() -> int:
+    """Write all pending heartbeats to the DB. Returns the number of sessions flushed.
+
+    Uses its own DB session so it never commits a request's pending state.
+    Text SQL is deliberate: an ORM/Core UPDATE on `users` would also set
+    `updated_at` through the model's onupdate default. The database trigger
+    `set_users_updated_at` skips updates that change only
+    `session_last_active` (its WHEN clause, see scripts/ddl.sql), so a
+    heartbeat leaves `updated_at` alone.
+    """
+    if not _pending:
+        return 0
+    batch = dict(_pending)
+    _pending.clear()
+    rows = [(user_id, sid, at) for user_id, (sid, at) in batch.items()]
+    values_sql, params = _values_clause(rows)
+    try:
+        async with AsyncSessionLocal() as db:
+            await db.execute(
+                text(
+                    "UPDATE users AS u SET session_last_active = v.at "
+                    f"FROM (VALUES {values_sql}) AS v(user_id, session_id, at) "
+                    "WHERE u.id = v.user_id "
+                    "AND u.active_session_id = v.session_id "
+                    "AND (u.session_last_active IS NULL OR u.session_last_active < v.at)"
+                ),
+                params,
+            )
+            await db.execute(
+                text(
+                    "UPDATE user_sessions AS s SET last_heartbeat = v.at "
+                    f"FROM (VALUES {values_sql}) AS v(user_id, session_id, at) "
+                    "WHERE s.session_id = v.session_id "
+                    "AND s.ended_at IS NULL "
+                    "AND s.last_heartbeat < v.at"
+                ),
+                params,
+            )
+            await db.commit()
+    except Exception:
+        # Put the batch back unless a newer heartbeat arrived meanwhile
+        for user_id, entry in batch.items():
+            current = _pending.get(user_id)
+            if current is None or (current[0] == entry[0] and current[1] < entry[1]):
+                _pending[user_id] = entry
+        logger.exception("Failed to flush %d session heartbeats", len(batch))
+        return 0
+    return len(batch)
+
+
+async def heartbeat_flush_loop():
+    """Flush pending heartbeats every FLUSH_INTERVAL_SECONDS; final flush on cancel."""
+    try:
+        while True:
+            await asyncio.sleep(FLUSH_INTERVAL_SECONDS)
+            await flush()
+    except asyncio.CancelledError:
+        await flush()
+        raise
@@ -4,6 +4,7 @@ from fastapi import HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func, or_, update as sa_update
 
+from app.core import catalogue_cache
 from app.models.item_rate import ItemRate
 from app.models.item import Item
 from app.models.route import Route
@@ -179,6 +180,7 @@ async def create_item_rate(db: AsyncSession, data: ItemRateCreate) -> dict:
     )
     db.add(ir)
     await db.commit()
+    await catalogue_cache.invalidate(data.route_id)
     await db.refresh(ir)
     return await get_item_rate_by_id(db, ir.id)
 
@@ -209,9 +211,12 @@ async def update_item_rate(
                 db, ir.route_id, ir.item_id, old_rate, new_rate, user_id,
             )
 
+    old_route_id = ir.route_id
     for field, value in update_data.items():
         setattr(ir, field, value)
     await db.commit()
+    await catalogue_cache.invalidate(old_route_id)
+    await catalogue_cache.invalidate(new_route_id)
     await db.refresh(ir)
     return await get_item_rate_by_id(db, ir.id)
 
@@ -311,4 +316,5 @@ async def deactivate_rates_for_route(db: AsyncSession, item_id: int, route_id: i
         .values(is_active=False)
     )
     await db.commit()
+    await catalogue_cache.invalidate(route_id)
     return result.rowcount
@@ -2,6 +2,7 @@ from fastapi import HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func, or_
 
+from app.core import catalogue_cache
 from app.models.item import Item
 from app.schemas.item import ItemCreate, ItemUpdate
 
@@ -165,6 +166,7 @@ async def create_item(db: AsyncSession, item_in: ItemCreate, creator_role: str |
         await auto_create_rates_for_new_item(db, item.id, route_ids)
 
     await db.commit()
+    await catalogue_cache.invalidate()
     await db.refresh(item)
     return item
 
@@ -198,5 +200,6 @@ async def update_item(db: AsyncSession, item_id: int, item_in: ItemUpdate) -> It
     for field, value in update_data.items():
         setattr(item, field, value)
     await db.commit()
+    await catalogue_cache.invalidate()
     await db.refresh(item)
     return item
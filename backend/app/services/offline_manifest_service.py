@@ -0,0 +1,138 @@
+"""Offline boarding manifest for ticket checkers.
+
+At jetties with poor connectivity a checker downloads the manifest for
+their route and day once, validates scans on the device, and uploads the
+queued check-ins in bulk (verification_service.bulk_check_in).
+
+Format: `codes` is base64 of fixed 16-byte records, sorted:
+
+    16 bytes  SHA-256 of the full QR payload (`{code}.{signature}`,
+              qr_service.generate_qr_payload), truncated
+
+The device hashes the payload it scans and binary-searches the digest.
+The hash is one-way: the manifest lets a device recognise an issued QR
+but holds neither the signatures nor SECRET_KEY, so it cannot be used to
+print a valid QR. `details[i]` belongs to record i; its columns are
+listed in `detail_fields`. The device takes the verification code for
+the bulk upload from the scanned payload.
+
+Delta sync: every manifest carries a `cursor` (server time). Passing it
+back as `since` returns only rows created or changed after it, cancelled
+ones included so the device can drop them. The window overlaps by
+CURSOR_OVERLAP so a transaction committing late is not skipped; the
+device merges by code, so repeats are harmless.
+"""
+from __future__ import annotations
+
+import base64
+import datetime
+import hashlib
+
+from sqlalchemy import Integer, case, func, literal_column, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.data_cutoff import is_before_cutoff
+from app.models.booking import Booking
+from app.models.booking_item import BookingItem
+from app.models.item import Item
+from app.models.ticket import Ticket, TicketItem
+from app.models.user import User
+from app.services.qr_service import generate_qr_payload
+from app.services.verification_service import check_route_access
+
+MANIFEST_VERSION = 2
+RECORD_SIZE = 16
+CURSOR_OVERLAP = datetime.timedelta(minutes=2)
+DETAIL_FIELDS = ["source", "id", "reference_no", "status", "departure", "passengers", "vehicles", "checked_in_at"]
+
+
+def _source_query(model, item_model, parent_fk, date_column, route_id: int, date, since):
+    """One row per booking/ticket of the route and date, with line item totals."""
+    changed_at = func.coalesce(model.updated_at, model.created_at)
+    stmt = (
+        select(
+            model.id,
+            model.verification_code,
+            (model.booking_no if model is Booking else model.ticket_no).label("reference_no"),
+            case(
+                (model.is_cancelled == True, "CANCELLED"),
+                else_=model.status,
+            ).label("status"),
+            model.departure,
+            model.checked_in_at,
+            func.coalesce(
+                func.sum(item_model.quantity).filter(func.coalesce(Item.is_vehicle, False) == False), 0,
+            ).cast(Integer).label("passengers"),
+            func.string_agg(item_model.vehicle_no, literal_column("','")).label("vehicles"),
+        )
+        .outerjoin(
+            item_model,
+            (parent_fk == model.id) & (item_model.is_cancelled == False),
+        )
+        .outerjoin(Item, Item.id == item_model.item_id)
+        .where(
+            model.route_id == route_id,
+            date_column == date,
+            model.verification_code.is_not(None),
+        )
+        .group_by(model.id)
+    )
+    if since is None:
+        # Full manifest: only rows a checker may still see at the gangway
+        stmt = stmt.where(model.is_cancelled == False, model.status.notin_(("CANCELLED", "PENDING")))
+    else:
+        stmt = stmt.where(changed_at > since - CURSOR_OVERLAP)
+    return stmt
+
+
+async def build_manifest(
+    db: AsyncSession, route_id: int, date: datetime.date, user: User,
+    since: datetime.datetime | None = None,
+) -> dict:
+    """QR-digest manifest (full, or delta when `since` is given) for one route and day."""
+    check_route_access(user, route_id)
+    cursor = datetime.datetime.now(datetime.timezone.utc)
+    rows: list[tuple[str, object]] = []
+
+    bookings = await db.execute(
+        _source_query(Booking, BookingItem, BookingItem.booking_id, Booking.travel_date, route_id, date, since)
+    )
+    rows.extend(("booking", r) for r in bookings.all())
+    if not is_before_cutoff(date, user.role):
+        tickets = await db.execute(
+            _source_query(Ticket, TicketItem, TicketItem.ticket_id, Ticket.ticket_date, route_id, date, since)
+        )
+        rows.extend(("ticket", r) for r in tickets.all())
+
+    keyed = sorted(
+        (hashlib.sha256(generate_qr_payload(str(r.verification_code)).encode()).digest()[:RECORD_SIZE], source, r)
+        for source, r in rows
+    )
+    records = bytearray()
+    details = []
+    for digest, source, r in keyed:
+        records += digest
+        details.append([
+            source,
+            r.id,
+            r.reference_no,
+            r.status,
+            r.departure.strftime("%H:%M") if r.departure else None,
+            r.passengers,
+            r.vehicles,
+            r.checked_in_at.isoformat() if r.checked_in_at else None,
+        ])
+
+    return {
+        "version": MANIFEST_VERSION,
+        "route_id": route_id,
+        "date": date,
+        "full": since is None,
+        "cursor": cursor,
+        "count": len(details),
+        "record_size": RECORD_SIZE,
+        "codes": base64.b64encode(bytes(records)).decode("ascii"),
+        "digest": hashlib.sha256(records).hexdigest(),
+        "detail_fields": DETAIL_FIELDS,
+        "details": details,
+    }
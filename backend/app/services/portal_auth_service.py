@@ -5,7 +5,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
 from app.config import settings
-from app.core.security import verify_password, get_password_hash, create_access_token, create_refresh_token, decode_token
+from app.core.security import verify_password_async, get_password_hash_async, create_access_token, create_refresh_token, decode_token
 from app.models.portal_user import PortalUser
 from app.schemas.portal_user import PortalUserRegister
 from app.services import token_service
@@ -16,7 +16,7 @@ async def authenticate_portal_user(db: AsyncSession, email: str, password: str)
     email = email.lower()
     result = await db.execute(select(PortalUser).where(PortalUser.email == email))
     user = result.scalar_one_or_none()
-    if not user or not verify_password(password, user.password):
+    if not user or not await verify_password_async(password, user.password):
         return None
     return user
 
@@ -65,7 +65,7 @@ async def register(db: AsyncSession, data: PortalUserRegister) -> tuple[PortalUs
         first_name=data.first_name,
         last_name=data.last_name,
         email=email,
-        password=get_password_hash(data.password),
+        password=await get_password_hash_async(data.password),
         mobile=data.mobile,
         is_verified=False,
     )
@@ -195,7 +195,7 @@ async def reset_password(db: AsyncSession, email: str, otp: str, new_password: s
     if not user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
 
-    user.password = get_password_hash(new_password)
+    user.password = await get_password_hash_async(new_password)
     await db.commit()
 
 
@@ -228,12 +228,12 @@ async def change_password(
     user = result.scalar_one_or_none()
     if not user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
-    if not verify_password(old_password, user.password):
+    if not await verify_password_async(old_password, user.password):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Current password is incorrect",
         )
-    user.password = get_password_hash(new_password)
+    user.password = await get_password_hash_async(new_password)
     await db.commit()
 
 
@@ -266,7 +266,7 @@ async def google_signin(
                 first_name=first_name,
                 last_name=last_name,
                 email=email,
-                password=get_password_hash(secrets.token_urlsafe(32)),
+                password=await get_password_hash_async(secrets.token_urlsafe(32)),
                 mobile="",
                 is_verified=True,
                 google_id=google_id,
@@ -0,0 +1,155 @@
+"""Styled QR rendering (qrcode + Pillow).
+
+Split out of qr_service so the signing/verification path — imported by
+the ticket, booking and verification routers in every worker — doesn't
+pull in qrcode and Pillow. Loaded on the first QR image request.
+
+Pure CPU and thread-safe: app/core/qr_cache.py runs it on a thread pool.
+The logo is decoded, resized and composited into overlay layers once per
+process; the cached images are only ever read.
+"""
+import functools
+import io
+from pathlib import Path
+
+import qrcode
+from qrcode.image.styledpil import StyledPilImage
+from qrcode.image.styles.moduledrawers.pil import StyledPilQRModuleDrawer
+from PIL import Image, ImageDraw, ImageEnhance, ImageFilter
+
+_LOGO_PATH = Path(__file__).resolve().parents[2] / "logo.png"
+
+
+# ---------------------------------------------------------------------------
+# Custom QR style drawers
+# ---------------------------------------------------------------------------
+
+class DiamondModuleDrawer(StyledPilQRModuleDrawer):
+    """Draws modules as diamonds (45-degree rotated squares)."""
+
+    def initialize(self, *args, **kwargs):
+        super().initialize(*args, **kwargs)
+        self.imgDraw = ImageDraw.Draw(self.img._img)
+
+    def drawrect(self, box, is_active):
+        if not is_active:
+            return
+        x1, y1 = box[0]
+        x2, y2 = box[1]
+        cx = (x1 + x2) / 2
+        cy = (y1 + y2) / 2
+        half_w = (x2 - x1) / 2 * 0.85
+        half_h = (y2 - y1) / 2 * 0.85
+        diamond = [
+            (cx, cy - half_h),
+            (cx + half_w, cy),
+            (cx, cy + half_h),
+            (cx - half_w, cy),
+        ]
+        self.imgDraw.polygon(diamond, fill=self.img.paint_color)
+
+
+class SolidEyeDrawer(StyledPilQRModuleDrawer):
+    """Draws finder pattern eyes as solid bold filled squares."""
+
+    def initialize(self, *args, **kwargs):
+        super().initialize(*args, **kwargs)
+        self.imgDraw = ImageDraw.Draw(self.img._img)
+
+    def drawrect(self, box, is_active):
+        if is_active:
+            x1, y1 = box[0]
+            x2, y2 = box[1]
+            self.imgDraw.rectangle([x1, y1, x2, y2], fill=self.img.paint_color)
+
+
+# ---------------------------------------------------------------------------
+# Logo overlay
+# ---------------------------------------------------------------------------
+
+@functools.lru_cache(maxsize=1)
+def _load_logo() -> Image.Image | None:
+    """logo.png, decoded once per process."""
+    if not _LOGO_PATH.exists():
+        return None
+    with Image.open(_LOGO_PATH) as logo:
+        return logo.convert("RGBA")
+
+
+@functools.lru_cache(maxsize=4)
+def _logo_overlay(qr_size: tuple[int, int]) -> tuple[Image.Image, Image.Image] | None:
+    """(white backing layer, logo layer) for a QR of this size.
+
+    Every verification code has the same length, so in practice all QRs
+    share one size and this is built once per process.
+    """
+    logo = _load_logo()
+    if logo is None:
+        return None
+    qr_w, qr_h = qr_size
+    logo_size = int(qr_w * 0.45)
+
+    # Resize preserving aspect ratio
+    ratio = logo.width / logo.height
+    if ratio > 1:
+        new_w, new_h = logo_size, int(logo_size / ratio)
+    else:
+        new_h, new_w = logo_size, int(logo_size * ratio)
+    logo = logo.resize((new_w, new_h), Image.LANCZOS)
+
+    # Darken the logo so it prints bold on thermal paper
+    logo = ImageEnhance.Contrast(logo).enhance(1.8)
+    logo = ImageEnhance.Brightness(logo).enhance(0.7)
+
+    # Build a white backing that follows the logo's shape (not a rectangle)
+    # so transparent areas of the logo let QR modules show through
+    logo_alpha = logo.split()[3]
+    expanded_alpha = logo_alpha.filter(ImageFilter.MaxFilter(size=15))
+    white_base = Image.new("RGBA", logo.size, (255, 255, 255, 255))
+    backing = Image.new("RGBA", logo.size, (0, 0, 0, 0))
+    backing.paste(white_base, mask=expanded_alpha)
+
+    lx = (qr_w - new_w) // 2
+    ly = (qr_h - new_h) // 2
+
+    # Composite order: QR → shape-matched white backing → logo
+    backing_layer = Image.new("RGBA", qr_size, (0, 0, 0, 0))
+    backing_layer.paste(backing, (lx, ly))
+    logo_layer = Image.new("RGBA", qr_size, (0, 0, 0, 0))
+    logo_layer.paste(logo, (lx, ly), logo)
+    return backing_layer, logo_layer
+
+
+# ---------------------------------------------------------------------------
+# QR image generation
+# ---------------------------------------------------------------------------
+
+def render_qr_png(data: str) -> bytes:
+    """Render `data` as a styled QR PNG with diamond modules, solid eyes, and blended logo."""
+
+    qr = qrcode.QRCode(
+        version=None,
+        error_correction=qrcode.constants.ERROR_CORRECT_H,
+        box_size=12,
+        border=2,
+    )
+    qr.add_data(data)
+    qr.make(fit=True)
+
+    qr_img = qr.make_image(
+        image_factory=StyledPilImage,
+        module_drawer=DiamondModuleDrawer(),
+        eye_drawer=SolidEyeDrawer(),
+    ).convert("RGBA")
+
+    overlay = _logo_overlay(qr_img.size)
+    if overlay is not None:
+        backing_layer, logo_layer = overlay
+        qr_img = Image.alpha_composite(qr_img, backing_layer)
+        qr_img = Image.alpha_composite(qr_img, logo_layer)
+
+    final = qr_img.convert("RGB")
+    buffer = io.BytesIO()
+    final.save(buffer, format="PNG")
+    buffer.seek(0)
+    return buffer.getvalue()
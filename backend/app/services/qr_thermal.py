@@ -0,0 +1,108 @@
+"""Plain 1-bit QR rendering for thermal receipt printers.
+
+Thermal printers print in black and white, so the styled QR's diamond
+modules, anti-aliased edges and blended logo (qr_image) only add render
+time and bytes. This path draws square modules from the bare QR matrix:
+
+- `png`:    1-bit PNG, one pixel per dot
+- `svg`:    a single <path>, scales to any printer resolution
+- `escpos`: ESC/POS raster bit image (GS v 0), sent to the printer as is
+
+With no logo covering modules, ERROR_CORRECT_M is enough (15% recovery
+against smudges and paper creases, vs 30% for H). That drops a signed
+payload from version 6 to version 4 (45 to 33 modules a side).
+
+BOX_SIZE 8 gives 296 dots across including the quiet zone: about 37 mm on
+a 203 dpi head, which fits both 58 mm and 80 mm paper.
+"""
+import io
+
+import qrcode
+
+BOX_SIZE = 8
+BORDER = 2
+
+FORMATS = ("png", "svg", "escpos")
+
+
+def _matrix(data: str) -> list[list[bool]]:
+    """QR modules including the quiet zone; True is a dark module."""
+    qr = qrcode.QRCode(
+        version=None,
+        error_correction=qrcode.constants.ERROR_CORRECT_M,
+        border=BORDER,
+    )
+    qr.add_data(data)
+    qr.make(fit=True)
+    return qr.get_matrix()
+
+
+def _png(matrix: list[list[bool]]) -> bytes:
+    from PIL import Image
+
+    n = len(matrix)
+    # Mode "1" packs 8 pixels per byte, MSB first, 1 = white
+    rows = bytearray()
+    for row in matrix:
+        bits = 0
+        for dark in row:
+            bits = (bits << 1) | (not dark)
+        pad = -n % 8
+        rows += (bits << pad).to_bytes((n + pad) // 8, "big")
+    img = Image.frombytes("1", (n, n), bytes(rows))
+    img = img.resize((n * BOX_SIZE, n * BOX_SIZE), Image.NEAREST)
+    buffer = io.BytesIO()
+    img.save(buffer, format="PNG", optimize=True)
+    return buffer.getvalue()
+
+
+def _svg(matrix: list[list[bool]]) -> bytes:
+    n = len(matrix)
+    # One horizontal run per stretch of dark modules
+    path = []
+    for y, row in enumerate(matrix):
+        x = 0
+        while x < n:
+            if row[x]:
+                start = x
+                while x < n and row[x]:
+                    x += 1
+                path.append(f"M{start} {y}h{x - start}v1h-{x - start}z")
+            else:
+                x += 1
+    size = n * BOX_SIZE
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{size}" height="{size}" '
+        f'viewBox="0 0 {n} {n}" shape-rendering="crispEdges">'
+        f'<rect width="{n}" height="{n}" fill="#fff"/>'
+        f'<path d="{"".join(path)}" fill="#000"/></svg>'
+    ).encode("ascii")
+
+
+def _escpos(matrix: list[list[bool]]) -> bytes:
+    n = len(matrix)
+    width = n * BOX_SIZE
+    width_bytes = (width + 7) // 8
+    raster = bytearray()
+    for row in matrix:
+        bits = 0
+        for dark in row:
+            # Each module is BOX_SIZE dots wide, 1 = burn
+            bits = (bits << BOX_SIZE) | (((1 << BOX_SIZE) - 1) if dark else 0)
+        line = (bits << (width_bytes * 8 - width)).to_bytes(width_bytes, "big")
+        raster += line * BOX_SIZE
+    height = n * BOX_SIZE
+    header = bytes((0x1D, 0x76, 0x30, 0x00)) + width_bytes.to_bytes(2, "little") + height.to_bytes(2, "little")
+    return header + bytes(raster)
+
+
+def render_qr_thermal(data: str, fmt: str = "png") -> bytes:
+    """Render `data` as a plain 1-bit QR for thermal printing in `fmt` (see FORMATS)."""
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown thermal QR format: {fmt}")
+    matrix = _matrix(data)
+    if fmt == "svg":
+        return _svg(matrix)
+    if fmt == "escpos":
+        return _escpos(matrix)
+    return _png(matrix)
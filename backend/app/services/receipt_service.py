@@ -0,0 +1,273 @@
+"""Ready-to-print ESC/POS receipts for QZ Tray.
+
+The browser path (frontend/src/lib/print-receipt.ts) fetches each ticket
+and its styled QR, lays the receipt out as HTML and has QZ Tray rasterise
+it. For a 20-30 ticket multi-ticket batch that is dozens of requests and
+HTML renders. Here one call returns the whole batch as a raw ESC/POS
+stream (QZ Tray `{type: "raw", format: "base64"}`): text in the printer's
+own fonts, plus the thermal QR raster from qr_cache.
+
+Layout mirrors the HTML receipt. Body text is font A (12x24 dots: 32
+columns on 58 mm paper, 48 on 80 mm); the small print and the item table
+use font B (9x17: 42 / 64 columns), as the HTML uses smaller type there.
+
+Tickets and their items are read in two queries for the whole batch.
+Finished receipts are cached per worker by (ticket, paper width) together
+with a digest of the rows they were built from, so an edited ticket is
+rebuilt and an unchanged one is served from memory.
+
+Receipts are not pre-built at ticket creation: no client prints through
+these endpoints yet, and a build costs a DB read plus a QR raster per
+ticket. Once the counter's QZ Tray path uses them, queue new ticket ids
+on a worker loop after commit (as qr_cache.schedule_prerender does).
+"""
+import datetime
+import hashlib
+import textwrap
+from collections import OrderedDict
+
+from fastapi import HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from app.config import settings
+from app.core import qr_cache
+from app.core.data_cutoff import is_before_cutoff
+from app.core.route_scope import needs_route_scope
+from app.core.timezone import IST
+from app.models.boat import Boat
+from app.models.branch import Branch
+from app.models.item import Item
+from app.models.payment_mode import PaymentMode
+from app.models.route import Route
+from app.models.ticket import Ticket, TicketItem
+from app.models.user import User
+from app.services.ticket_service import _round2
+
+MAX_BATCH = 50
+# (font A columns, font B columns, width of each numeric table column)
+PAPER_COLUMNS = {"58mm": (32, 42, 8), "80mm": (48, 64, 9)}
+
+COMPANY_NAME = "SUVARNADURGA SHIPPING & MARINE SERVICES PVT. LTD."
+APPROVAL = "MAHARASHTRA MARITIME BOARD APPROVAL"
+NOTE = (
+    "NOTE: Tantrik Durustimule Velevar na sutlyas va ushira pohochlyas company "
+    "jababdar rahanar nahi. Ferry Boatit Ticket Dakhvaa."
+)
+FOOTER = "HAPPY JOURNEY - www.carferry.online"
+
+ESC, GS = b"\x1b", b"\x1d"
+INIT = ESC + b"@"
+BOLD_ON = ESC + b"E\x01"
+FONT_A, FONT_B = ESC + b"M\x00", ESC + b"M\x01"
+ALIGN_LEFT, ALIGN_CENTER = ESC + b"a\x00", ESC + b"a\x01"
+FEED_AND_CUT = GS + b"VB\x03"  # feed 3 lines, partial cut
+
+# (ticket_id, paper_width) -> (row digest, receipt bytes)
+_cache: OrderedDict[tuple[int, str], tuple[bytes, bytes]] = OrderedDict()
+
+
+# ─── queries ────────────────────────────────────────────────────────────
+
+async def _fetch(db: AsyncSession, ticket_ids: list[int]) -> tuple[dict[int, object], dict[int, list]]:
+    """Receipt header rows by ticket id, and active line items by ticket id."""
+    BranchOne = aliased(Branch)
+    BranchTwo = aliased(Branch)
+    headers = await db.execute(
+        select(
+            Ticket.id, Ticket.ticket_no, Ticket.ticket_date, Ticket.departure, Ticket.created_at,
+            Ticket.updated_at, Ticket.net_amount, Ticket.route_id, Ticket.branch_id,
+            Ticket.is_cancelled, Ticket.verification_code,
+            Branch.name.label("branch_name"), Branch.contact_nos,
+            Route.branch_id_one, BranchOne.name.label("branch_one_name"),
+            BranchTwo.name.label("branch_two_name"),
+            PaymentMode.description.label("payment_mode_name"),
+            User.username.label("created_by_username"),
+            Boat.name.label("boat_name"),
+        )
+        .join(Branch, Branch.id == Ticket.branch_id)
+        .join(Route, Route.id == Ticket.route_id)
+        .join(BranchOne, BranchOne.id == Route.branch_id_one)
+        .join(BranchTwo, BranchTwo.id == Route.branch_id_two)
+        .outerjoin(PaymentMode, PaymentMode.id == Ticket.payment_mode_id)
+        .outerjoin(User, User.id == Ticket.created_by)
+        .outerjoin(Boat, Boat.id == Ticket.boat_id)
+        .where(Ticket.id.in_(ticket_ids))
+    )
+    by_id = {row.id: row for row in headers.all()}
+
+    items: dict[int, list] = {tid: [] for tid in by_id}
+    if by_id:
+        result = await db.execute(
+            select(
+                TicketItem.ticket_id, TicketItem.id, TicketItem.quantity, TicketItem.rate,
+                TicketItem.levy, TicketItem.vehicle_no,
+                Item.short_name, Item.name.label("item_name"), TicketItem.item_id,
+            )
+            .outerjoin(Item, Item.id == TicketItem.item_id)
+            .where(TicketItem.ticket_id.in_(list(by_id)), TicketItem.is_cancelled == False)
+            .order_by(TicketItem.ticket_id, TicketItem.id)
+        )
+        for row in result.all():
+            items[row.ticket_id].append(row)
+    return by_id, items
+
+
+def _check_access(row, user: User) -> None:
+    """Same rules as the ticket QR endpoint."""
+    if is_before_cutoff(row.ticket_date, user.role):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Ticket {row.id} not found")
+    if needs_route_scope(user) and user.route_id and row.route_id != user.route_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, detail=f"Ticket {row.id} not in your assigned route",
+        )
+
+
+# ─── layout ─────────────────────────────────────────────────────────────
+
+def _text(s: str) -> bytes:
+    return s.encode("ascii", "replace")
+
+
+def _line(s: str) -> bytes:
+    return _text(s) + b"\n"
+
+
+def _wrapped(s: str, width: int) -> bytes:
+    return b"".join(_line(part) for part in textwrap.wrap(s, width) or [""])
+
+
+def _spread(left: str, right: str, width: int) -> bytes:
+    """`left` and `right` on one line, left truncated when they don't fit."""
+    room = max(width - len(right) - 1, 0)
+    if len(left) > room:
+        left = left[: max(room - 1, 0)] + "~" if room else ""
+    return _line(left + " " * (width - len(left) - len(right)) + right)
+
+
+def _num(n) -> str:
+    return f"{float(n or 0):.2f}"
+
+
+def _receipt_time(row) -> str:
+    if row.departure:
+        return row.departure.strftime("%H:%M")
+    created = row.created_at or datetime.datetime.now(datetime.timezone.utc)
+    return created.astimezone(IST).strftime("%H:%M")
+
+
+def _layout(row, items: list, paper_width: str) -> bytes:
+    """ESC/POS text of one receipt, up to (not including) the QR."""
+    cols_a, cols_b, num_w = PAPER_COLUMNS[paper_width]
+    desc_w = cols_b - 4 * num_w
+
+    from_to = (
+        f"{row.branch_one_name} To {row.branch_two_name}"
+        if row.branch_id == row.branch_id_one
+        else f"{row.branch_two_name} To {row.branch_one_name}"
+    )
+    # Mobile numbers only: STD landlines (leading 0) are not printed
+    phones = ", ".join(
+        p.strip() for p in (row.contact_nos or "").split(",") if p.strip() and not p.strip().startswith("0")
+    )
+
+    out = bytearray(INIT + BOLD_ON + ALIGN_CENTER)
+    out += FONT_B + _wrapped(COMPANY_NAME, cols_b)
+    out += FONT_A + _wrapped((row.branch_name or "").upper(), cols_a)
+    out += FONT_B + _wrapped(APPROVAL, cols_b)
+    out += FONT_A + _wrapped(from_to, cols_a)
+    if row.boat_name:
+        out += _wrapped(f"FERRY: {row.boat_name.upper()}", cols_a)
+
+    out += ALIGN_LEFT
+    out += _spread(f"Ph: {phones}", f"TIME: {_receipt_time(row)}", cols_a)
+    out += _spread(f"Memo No: {row.ticket_no}", f"DATE: {row.ticket_date.strftime('%d-%m-%Y')}", cols_a)
+    out += _spread(f"Pay: {row.payment_mode_name or '-'}", f"BY: {row.created_by_username or ''}", cols_a)
+    out += _line("-" * cols_a)
+
+    out += FONT_B
+    out += _line("Description".ljust(desc_w) + "".join(h.rjust(num_w) for h in ("Qty", "Rate", "Levy", "Amt")))
+    out += _line("-" * cols_b)
+    for it in items:
+        rate = float(it.rate or 0)
+        levy = float(it.levy or 0)
+        quantity = it.quantity or 0
+        amount = _round2(quantity * (rate + levy))
+        name_lines = textwrap.wrap(it.short_name or it.item_name or f"Item #{it.item_id}", desc_w) or [""]
+        out += _line(
+            name_lines[0].ljust(desc_w)
+            + "".join(_num(v).rjust(num_w) for v in (quantity, rate, levy, amount))
+        )
+        for extra in name_lines[1:]:
+            out += _line(extra)
+        if it.vehicle_no:
+            out += _line(f"    {it.vehicle_no}")
+
+    out += FONT_A + _line("-" * cols_a)
+    out += _spread("NET TOTAL INCL.TAX:", _num(row.net_amount), cols_a)
+    out += _line("-" * cols_a)
+    out += FONT_B + _wrapped(NOTE, cols_b)
+    out += ALIGN_CENTER + _wrapped(FOOTER, cols_b)
+    out += FONT_A + _line("-" * cols_a)
+    return bytes(out)
+
+
+def _digest(row, items: list) -> bytes:
+    return hashlib.sha256(repr((tuple(row), [tuple(i) for i in items])).encode()).digest()
+
+
+def _remember(key: tuple[int, str], digest: bytes, receipt: bytes) -> None:
+    if settings.PRINT_CACHE_SIZE <= 0:
+        return
+    _cache[key] = (digest, receipt)
+    _cache.move_to_end(key)
+    while len(_cache) > settings.PRINT_CACHE_SIZE:
+        _cache.popitem(last=False)
+
+
+async def _receipt(row, items: list, paper_width: str) -> bytes:
+    """One ticket's cut receipt, from the cache when its rows are unchanged."""
+    key = (row.id, paper_width)
+    digest = _digest(row, items)
+    cached = _cache.get(key)
+    if cached is not None and cached[0] == digest:
+        _cache.move_to_end(key)
+        return cached[1]
+
+    receipt = _layout(row, items, paper_width)
+    if row.verification_code:
+        qr = await qr_cache.get_qr(str(row.verification_code), "escpos")
+        receipt += ALIGN_CENTER + qr + b"\n" + ALIGN_LEFT
+    receipt += FEED_AND_CUT
+    _remember(key, digest, receipt)
+    return receipt
+
+
+# ─── public ─────────────────────────────────────────────────────────────
+
+async def build_escpos(db: AsyncSession, ticket_ids: list[int], user: User, paper_width: str = "80mm") -> bytes:
+    """ESC/POS stream printing the given tickets in order, one cut receipt each."""
+    if not ticket_ids:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="No tickets to print")
+    if len(ticket_ids) > MAX_BATCH:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=f"At most {MAX_BATCH} tickets per print job",
+        )
+    if paper_width not in PAPER_COLUMNS:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="paper_width must be 58mm or 80mm")
+
+    by_id, items = await _fetch(db, ticket_ids)
+    stream = bytearray()
+    for ticket_id in ticket_ids:
+        row = by_id.get(ticket_id)
+        if row is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Ticket {ticket_id} not found")
+        _check_access(row, user)
+        if row.is_cancelled:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail=f"Ticket {ticket_id} is cancelled",
+            )
+        stream += await _receipt(row, items[ticket_id], paper_width)
+    return bytes(stream)
+
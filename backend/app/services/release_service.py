@@ -79,16 +79,34 @@ def find_release(tag: str) -> dict | None:
     return None
 
 
-async def acquire_rollback_lock(db: AsyncSession) -> bool:
-    """Try to grab the rollback advisory lock. Returns False if another
-    rollback is already in flight."""
-    r = await db.execute(text("SELECT pg_try_advisory_lock(:k)"), {"k": _ROLLBACK_LOCK_KEY})
-    got = bool(r.scalar())
-    return got
+async def acquire_rollback_lock() -> AsyncSession | None:
+    """Try to grab the rollback advisory lock. Returns the session holding
+    it, or None if another rollback is already in flight.
+
+    The lock is transaction-scoped (works behind PgBouncer in transaction
+    pooling, unlike a session lock) and held by its own session, so commits
+    on the request session during the rollback don't release it.
+    """
+    from app.database import AsyncSessionLocal
+
+    lock_session = AsyncSessionLocal()
+    try:
+        r = await lock_session.execute(
+            text("SELECT pg_try_advisory_xact_lock(:k)"), {"k": _ROLLBACK_LOCK_KEY}
+        )
+        if r.scalar():
+            return lock_session
+    except Exception:
+        await lock_session.close()
+        raise
+    await lock_session.close()
+    return None
 
 
-async def release_rollback_lock(db: AsyncSession) -> None:
-    await db.execute(text("SELECT pg_advisory_unlock(:k)"), {"k": _ROLLBACK_LOCK_KEY})
+async def release_rollback_lock(lock_session: AsyncSession) -> None:
+    # Ending the transaction releases the xact lock
+    await lock_session.rollback()
+    await lock_session.close()
 
 
 def alembic_head_compatible(target_head: str | None, current_head: str | None) -> tuple[bool, str]:
@@ -2,6 +2,7 @@ from fastapi import HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func, or_
 
+from app.core import catalogue_cache
 from app.models.route import Route
 from app.models.branch import Branch
 from app.schemas.route import RouteCreate, RouteUpdate
@@ -190,6 +191,7 @@ async def create_route(db: AsyncSession, route_in: RouteCreate) -> dict:
     await auto_create_rates_for_route(db, route.id)
 
     await db.commit()
+    await catalogue_cache.invalidate()
     await db.refresh(route)
     return await get_route_by_id(db, route.id)
 
@@ -213,5 +215,6 @@ async def update_route(db: AsyncSession, route_id: int, route_in: RouteUpdate) -
     for field, value in update_data.items():
         setattr(route, field, value)
     await db.commit()
+    await catalogue_cache.invalidate()
     await db.refresh(route)
     return await get_route_by_id(db, route.id)
@@ -6,6 +6,9 @@ Read-only. Reads:
 - backup recency + history from BACKUP_DIR
 - recent ticket activity + today's revenue from DB
 - replication state (admin DB only)
+- per-route latency + DB pool usage of this worker (app/core/metrics.py)
+- event-loop lag + captured stalls of this worker (app/core/loop_monitor.py)
+- RSS over time of this worker + siblings (app/core/memory.py)
 
 Container-level health is reported via the host-side health_check.sh, which
 POSTs events to /api/system-health/events. We don't introspect Docker from
@@ -25,11 +28,16 @@ from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import settings
+from app.core import loop_monitor, memory, metrics
 
 logger = logging.getLogger(__name__)
 
 _NET_BASELINE: dict[str, float] = {}
 
+# cpu_percent(interval=None) compares against the previous call instead of
+# sleeping on the event loop; prime it so the first snapshot is meaningful.
+psutil.cpu_percent(interval=None)
+
 
 def _server_name() -> str:
     return "server-2-admin" if settings.ADMIN_PORTAL_MODE else "server-1-prod"
@@ -147,7 +155,7 @@ def _system_info() -> dict:
             la1 = la5 = la15 = 0.0
 
         cpu_count = psutil.cpu_count() or 1
-        cpu_pct = psutil.cpu_percent(interval=0.2)
+        cpu_pct = psutil.cpu_percent(interval=None)
 
         # Net throughput: rate since last call (best-effort; first call shows 0).
         nio = psutil.net_io_counters()
@@ -291,6 +299,48 @@ async def _replication_status(db: AsyncSession) -> dict:
     return out
 
 
+def _http_status() -> dict:
+    """This worker's request metrics; WARN on a sustained 5xx rate."""
+    try:
+        out = metrics.http_summary()
+        out["db_pool"] = metrics.pool_stats()
+    except Exception as e:  # noqa: BLE001
+        return {"severity": "WARN", "error": str(e)[:120]}
+    error_pct = out["errors_5xx"] / out["requests"] * 100 if out["requests"] else 0
+    out["error_pct"] = round(error_pct, 2)
+    out["severity"] = "WARN" if out["requests"] >= 100 and error_pct > 5 else "OK"
+    return out
+
+
+def _event_loop_status() -> dict:
+    """This worker's loop lag; WARN on any recent stall, CRIT on a multi-second one."""
+    try:
+        out = loop_monitor.get_stats()
+    except Exception as e:  # noqa: BLE001
+        return {"severity": "WARN", "error": str(e)[:120]}
+    if not out["running"]:
+        out["severity"] = "WARN"
+    elif out["lag_max_ms"] and out["lag_max_ms"] >= 2000:
+        out["severity"] = "CRIT"
+    elif out["stalls_in_window"]:
+        out["severity"] = "WARN"
+    else:
+        out["severity"] = "OK"
+    return out
+
+
+def _worker_memory_status() -> dict:
+    """WARN once a worker nears WORKER_MAX_RSS_MB (it will recycle itself past it)."""
+    try:
+        out = memory.rss_status()
+    except Exception as e:  # noqa: BLE001
+        return {"severity": "WARN", "error": str(e)[:120]}
+    limit = out["limit_mb"]
+    peak = max([out["rss_mb"]] + [w["rss_mb"] for w in out.get("workers", [])])
+    out["severity"] = "WARN" if limit and peak > limit * 0.9 else "OK"
+    return out
+
+
 async def get_status(db: AsyncSession) -> dict:
     payload = {
         "server": _server_name(),
@@ -303,6 +353,9 @@ async def get_status(db: AsyncSession) -> dict:
         "today": await _today_activity(db),
         "ticketing": await _ticket_freshness(db),
         "replication": await _replication_status(db),
+        "http": _http_status(),
+        "event_loop": _event_loop_status(),
+        "worker_memory": _worker_memory_status(),
     }
     severities = [v["severity"] for v in payload.values() if isinstance(v, dict) and "severity" in v]
     payload["overall_severity"] = (
@@ -142,6 +142,7 @@ async def _enrich_ticket(db: AsyncSession, ticket: Ticket, include_items: bool =
         "boat_name": boat_name,
         "verification_code": str(ticket.verification_code) if ticket.verification_code else None,
         "created_at": ticket.created_at,
+        "updated_at": ticket.updated_at,
         "created_by_username": created_by_username,
         "is_multi_ticket": ticket.is_multi_ticket,
         "generated_at": ticket.generated_at,
@@ -4,46 +4,181 @@ When a user logs out, their access token's JTI is added to Redis with a TTL
 matching the token's remaining lifetime. On every authenticated request,
 the JTI is checked against the blacklist before granting access.
 
+Revocations happen a few times a day, but the check runs on every request,
+so each worker keeps a local copy of the recently revoked JTIs:
+
+- `blacklist_token()` writes `bl:<jti>` and publishes the JTI on the
+  REVOCATION_CHANNEL pub/sub channel.
+- A per-worker listener task subscribes to that channel and adds every
+  published JTI to the local set (and evicts it from the verified-token
+  cache). On each (re)subscribe it re-seeds the set from the `bl:*` keys,
+  so revocations published while it was disconnected are not missed.
+- A quiet subscription is PINGed every PING_INTERVAL_SECONDS. If neither
+  a message nor the PONG arrives within the next interval, the socket is
+  treated as dead (a dropped idle connection never raises on its own) and
+  the listener reconnects.
+- While the subscription is live, `is_blacklisted()` answers from the
+  local set with no network hop. While it is down (startup, Redis blip),
+  it falls back to a direct Redis EXISTS per request.
+
+Other modules can broadcast over the same subscription: they register a
+handler for their own channel with `subscribe_channel()` (at import time)
+and send with `publish()`. A handler gets each message's data, and None
+after every (re)subscribe, when messages may have been missed.
+
 If Redis is unavailable or REDIS_URL is empty, the blacklist is disabled
 and the system falls back to the existing session-ID enforcement.
 """
+import asyncio
 import logging
+import time
 from datetime import datetime, timezone
+from typing import Callable
 
 import redis.asyncio as redis
 
 from app.config import settings
+from app.core import token_cache
 
 logger = logging.getLogger(__name__)
 
+REVOCATION_CHANNEL = "bl:revocations"
+RESUBSCRIBE_DELAY_SECONDS = 5
+PING_INTERVAL_SECONDS = 15
+
 _redis_client: redis.Redis | None = None
+_listener_task: asyncio.Task | None = None
+
+# jti -> exp (unix seconds) of tokens revoked while they were still valid
+_revoked: dict[str, float] = {}
+# True only while the pub/sub subscription is up and the set is seeded
+_stream_live = False
+# channel -> handler, for broadcasts of other modules (subscribe_channel())
+_channel_handlers: dict[str, Callable[[str | None], None]] = {}
+
+
+def _remember(jti: str, exp: float) -> None:
+    now = time.time()
+    if exp > now:
+        _revoked[jti] = exp
+    token_cache.evict_jti(jti)
+    # Opportunistic prune — the set only ever holds a few entries
+    for stale in [j for j, e in _revoked.items() if e <= now]:
+        del _revoked[stale]
+
+
+async def _seed_from_redis() -> None:
+    """Load every live `bl:*` key into the local set."""
+    now = time.time()
+    async for key in _redis_client.scan_iter(match="bl:*", count=500):
+        ttl = await _redis_client.ttl(key)
+        if ttl > 0:
+            _remember(key[3:], now + ttl)
+
+
+async def _revocation_listener() -> None:
+    """Keep the local revoked set current; mark the stream down on any error."""
+    global _stream_live
+    while True:
+        pubsub = _redis_client.pubsub()
+        try:
+            await pubsub.subscribe(REVOCATION_CHANNEL, *_channel_handlers)
+            # Subscribe before seeding so nothing published in between is lost
+            await _seed_from_redis()
+            for handler in _channel_handlers.values():
+                handler(None)
+            _stream_live = True
+            logger.info("Token revocation stream subscribed")
+            awaiting_pong = False
+            while True:
+                message = await pubsub.get_message(timeout=PING_INTERVAL_SECONDS)
+                if message is None:
+                    if awaiting_pong:
+                        raise ConnectionError(f"no PONG within {PING_INTERVAL_SECONDS}s")
+                    await pubsub.ping()
+                    awaiting_pong = True
+                    continue
+                # Any traffic, the PONG included, shows the socket is alive
+                awaiting_pong = False
+                if message.get("type") != "message":
+                    continue
+                handler = _channel_handlers.get(message["channel"])
+                if handler is not None:
+                    handler(message["data"])
+                    continue
+                jti, _, exp = str(message["data"]).partition(":")
+                try:
+                    _remember(jti, float(exp))
+                except ValueError:
+                    _remember(jti, time.time() + settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning("Token revocation stream disconnected: %s", e)
+        finally:
+            _stream_live = False
+            try:
+                await pubsub.aclose()
+            except Exception:
+                pass
+        await asyncio.sleep(RESUBSCRIBE_DELAY_SECONDS)
+
+
+def subscribe_channel(channel: str, handler: Callable[[str | None], None]) -> None:
+    """Deliver messages on `channel` to `handler` (register before startup)."""
+    _channel_handlers[channel] = handler
+
+
+async def publish(channel: str, data: str) -> None:
+    """Broadcast `data` on `channel` to every worker; a no-op without Redis."""
+    if not _redis_client:
+        return
+    try:
+        await _redis_client.publish(channel, data)
+    except Exception as e:
+        logger.warning("Failed to publish on %s: %s", channel, e)
 
 
 async def init_blacklist() -> None:
-    """Initialize the Redis connection for token blacklisting."""
-    global _redis_client
+    """Initialize the Redis connection and start the revocation listener."""
+    global _redis_client, _listener_task
     if not settings.REDIS_URL:
         logger.info("REDIS_URL not set — token blacklist disabled")
         return
     try:
-        _redis_client = redis.from_url(settings.REDIS_URL, decode_responses=True)
+        # TCP keepalive lets the kernel reap dead sockets too; the listener's
+        # own PING (PING_INTERVAL_SECONDS) is what marks the stream down
+        _redis_client = redis.from_url(
+            settings.REDIS_URL, decode_responses=True, socket_keepalive=True
+        )
         await _redis_client.ping()
         logger.info("Token blacklist connected to Redis")
     except Exception as e:
         logger.warning("Failed to connect to Redis for token blacklist: %s", e)
         _redis_client = None
+        return
+    _listener_task = asyncio.create_task(_revocation_listener())
 
 
 async def close_blacklist() -> None:
-    """Close the Redis connection."""
-    global _redis_client
+    """Stop the revocation listener and close the Redis connection."""
+    global _redis_client, _listener_task
+    if _listener_task:
+        _listener_task.cancel()
+        try:
+            await _listener_task
+        except asyncio.CancelledError:
+            pass
+        _listener_task = None
     if _redis_client:
         await _redis_client.aclose()
         _redis_client = None
+    _revoked.clear()
 
 
 async def blacklist_token(jti: str, exp: int) -> None:
     """Add a token's JTI to the blacklist with TTL = remaining lifetime."""
+    _remember(jti, exp)
     if not _redis_client:
         return
     try:
@@ -51,16 +186,29 @@ async def blacklist_token(jti: str, exp: int) -> None:
         ttl = max(exp - now, 0)
         if ttl > 0:
             await _redis_client.setex(f"bl:{jti}", ttl, "1")
+            await _redis_client.publish(REVOCATION_CHANNEL, f"{jti}:{exp}")
     except Exception as e:
         logger.warning("Failed to blacklist token: %s", e)
 
 
 async def is_blacklisted(jti: str) -> bool:
     """Check if a token's JTI is in the blacklist."""
-    if not _redis_client:
+    exp = _revoked.get(jti)
+    if exp is not None and exp > time.time():
+        return True
+    if not _redis_client or _stream_live:
         return False
     try:
         return await _redis_client.exists(f"bl:{jti}") > 0
     except Exception as e:
         logger.warning("Failed to check token blacklist: %s", e)
         return False  # Fail open -- session-ID enforcement is the backup
+
+
+def get_stats() -> dict:
+    """Blacklist mode for health reporting."""
+    return {
+        "enabled": _redis_client is not None,
+        "stream_live": _stream_live,
+        "local_revoked": len(_revoked),
+    }
@@ -4,7 +4,7 @@ from fastapi import HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func, or_
 
-from app.core.security import get_password_hash, verify_password
+from app.core.security import get_password_hash_async, verify_password_async
 from app.core.rbac import UserRole
 from app.core.route_scope import needs_route_scope
 from app.models.user import User
@@ -246,7 +246,7 @@ async def create_user(db: AsyncSession, user_in: UserCreate, current_user: User
         username=user_in.username,
         full_name=user_in.full_name,
         mobile_number=user_in.mobile_number,
-        hashed_password=get_password_hash(user_in.password),
+        hashed_password=await get_password_hash_async(user_in.password),
         role=user_in.role,
         route_id=user_in.route_id,
     )
@@ -305,12 +305,12 @@ async def update_user(db: AsyncSession, user_id: uuid.UUID, user_in: UserUpdate,
 
 
 async def change_password(db: AsyncSession, user: User, current_password: str, new_password: str) -> User:
-    if not verify_password(current_password, user.hashed_password):
+    if not await verify_password_async(current_password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Current password is incorrect",
         )
-    user.hashed_password = get_password_hash(new_password)
+    user.hashed_password = await get_password_hash_async(new_password)
     await db.commit()
     await db.refresh(user)
     return user
@@ -343,7 +343,7 @@ async def admin_reset_password(
                 detail="Access denied. Cannot reset password for users on a different route.",
             )
 
-    user.hashed_password = get_password_hash(new_password)
+    user.hashed_password = await get_password_hash_async(new_password)
     await db.commit()
     await db.refresh(user)
 
@@ -1,8 +1,11 @@
+import asyncio
+import logging
 import uuid
 from datetime import datetime, timezone, timedelta
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, update as sa_update, case
+from sqlalchemy import event, select, func, update as sa_update, case
+from sqlalchemy.orm import Session
 
 from app.config import settings
 from app.database import AsyncSessionLocal
@@ -14,8 +17,15 @@ from app.models.user_activity_log import UserActivityLog
 from app.core.rbac import UserRole
 from app.services.geo_service import resolve_geo
 
+logger = logging.getLogger("ssmspl")
+
 STALE_TIMEOUT = timedelta(minutes=15)
 
+# Geo enrichment jobs: (session_id, ip). Bounded — if ip-api is slow and
+# logins pile up, newer sessions just stay without location data.
+GEO_QUEUE_SIZE = 256
+_geo_queue: asyncio.Queue[tuple[str, str]] | None = None
+
 
 async def start_session(
     db: AsyncSession,
@@ -26,8 +36,12 @@ async def start_session(
     branch_id: int | None = None,
     route_id: int | None = None,
 ) -> UserSession:
-    """Create a new session row. Geo data resolved async from IP."""
-    geo = await resolve_geo(ip_address)
+    """Create a new session row.
+
+    Location columns start empty; once the caller's transaction commits,
+    a background job resolves the IP and fills them in (see
+    geo_enrichment_loop), so login latency never depends on ip-api.com.
+    """
     now = datetime.now(timezone.utc)
     session = UserSession(
         user_id=user_id,
@@ -35,19 +49,69 @@ async def start_session(
         started_at=now,
         last_heartbeat=now,
         ip_address=ip_address,
-        city=geo.get("city_display"),
         user_agent=user_agent[:255] if user_agent and len(user_agent) > 255 else user_agent,
         branch_id=branch_id,
         route_id=route_id,
-        latitude=geo.get("latitude"),
-        longitude=geo.get("longitude"),
-        isp=geo.get("isp"),
         portal="admin" if settings.ADMIN_PORTAL_MODE else None,
     )
     db.add(session)
+    if ip_address:
+        db.info.setdefault("geo_enrich", []).append((session_id, ip_address))
     return session
 
 
+@event.listens_for(Session, "after_commit")
+def _enqueue_geo_after_commit(session: Session) -> None:
+    """Hand committed sessions to the geo worker; rolled-back ones never reach it."""
+    jobs = session.info.pop("geo_enrich", None)
+    if not jobs or _geo_queue is None:
+        return
+    for job in jobs:
+        try:
+            _geo_queue.put_nowait(job)
+        except asyncio.QueueFull:
+            logger.debug("Geo enrichment queue full — skipping session %s", job[0])
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_geo_after_rollback(session: Session) -> None:
+    session.info.pop("geo_enrich", None)
+
+
+async def enrich_session_geo(session_id: str, ip_address: str) -> None:
+    """Resolve an IP and write its location onto the session row."""
+    geo = await resolve_geo(ip_address)
+    if not geo:
+        return
+    async with AsyncSessionLocal() as _db:
+        await _db.execute(
+            sa_update(UserSession)
+            .where(UserSession.session_id == session_id)
+            .values(
+                city=geo.get("city_display"),
+                latitude=geo.get("latitude"),
+                longitude=geo.get("longitude"),
+                isp=geo.get("isp"),
+            )
+        )
+        await _db.commit()
+
+
+async def geo_enrichment_loop():
+    """Background worker: drain the geo queue one job at a time."""
+    global _geo_queue
+    _geo_queue = asyncio.Queue(maxsize=GEO_QUEUE_SIZE)
+    try:
+        while True:
+            session_id, ip_address = await _geo_queue.get()
+            try:
+                await enrich_session_geo(session_id, ip_address)
+            except Exception:
+                logger.exception("Geo enrichment failed for session %s", session_id)
+    finally:
+        _geo_queue = None
+
+
 async def end_session(
     db: AsyncSession,
     session_id: str,
@@ -65,19 +129,6 @@ async def end_session(
     )
 
 
-async def update_heartbeat(db: AsyncSession, session_id: str) -> None:
-    """Update last_heartbeat for the active session."""
-    now = datetime.now(timezone.utc)
-    await db.execute(
-        sa_update(UserSession)
-        .where(
-            UserSession.session_id == session_id,
-            UserSession.ended_at.is_(None),
-        )
-        .values(last_heartbeat=now)
-    )
-
-
 async def update_session_branch(db: AsyncSession, session_id: str, branch_id: int) -> None:
     """Update branch_id on the active session when user switches branch."""
     await db.execute(
@@ -1,10 +1,13 @@
 import datetime
 import logging
 import uuid
+from collections import Counter
 
 from fastapi import HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import DateTime, Integer, and_, cast, column, exists, func, literal_column, null, select, union_all, update, values
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import aliased
 
 from app.models.booking import Booking
 from app.models.booking_item import BookingItem
@@ -16,6 +19,7 @@ from app.models.boat import Boat
 from app.models.user import User
 from app.core.data_cutoff import is_before_cutoff
 from app.core.rbac import UserRole
+from app.core import scan_guard
 
 log = logging.getLogger("ssmspl.verification")
 
@@ -58,11 +62,13 @@ async def _get_item_details(db: AsyncSession, item_id: int) -> dict:
     return {"name": item.name, "is_vehicle": bool(item.is_vehicle)}
 
 
-def _check_route_access(user: User, ticket_or_booking_route_id: int) -> None:
+_ROUTE_BYPASS_ROLES = {UserRole.SUPER_ADMIN, UserRole.ADMIN, UserRole.MANAGER}
+
+
+def check_route_access(user: User, ticket_or_booking_route_id: int) -> None:
     """Enforce route-based access: TICKET_CHECKER and BILLING_OPERATOR can only
     verify tickets/bookings on their assigned route. Higher roles bypass."""
-    bypass_roles = {UserRole.SUPER_ADMIN, UserRole.ADMIN, UserRole.MANAGER}
-    if user.role in bypass_roles:
+    if user.role in _ROUTE_BYPASS_ROLES:
         return
     if user.route_id is None:
         raise HTTPException(
@@ -76,60 +82,164 @@ def _check_route_access(user: User, ticket_or_booking_route_id: int) -> None:
         )
 
 
-async def lookup_booking_by_code(db: AsyncSession, verification_code: uuid.UUID, user: User) -> dict:
-    """Look up a booking by its QR verification code."""
-    result = await db.execute(
-        select(Booking).where(Booking.verification_code == verification_code)
-    )
-    booking = result.scalar_one_or_none()
-    if not booking:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Booking not found for this verification code",
-        )
+def _by_code_statement(verification_code: uuid.UUID):
+    """Everything a QR scan shows, in one statement.
 
-    _check_route_access(user, booking.route_id)
+    The booking and ticket carrying the code are UNION ALL'ed into one
+    header set. Each header is joined to its active line items (bookings
+    first, then by line) and to the item, route, branch and boat names. The
+    result is one row per line item, or a single row with NULL line columns
+    when there are no items.
+    """
+    hit = union_all(
+        select(
+            literal_column("'booking'").label("source"),
+            Booking.id,
+            Booking.booking_no.label("reference_no"),
+            Booking.status,
+            Booking.is_cancelled,
+            Booking.route_id,
+            Booking.branch_id,
+            Booking.travel_date.label("travel_date"),
+            Booking.departure,
+            Booking.net_amount,
+            Booking.checked_in_at,
+            Booking.verification_code,
+            Booking.created_at,
+            cast(null(), Integer).label("boat_id"),
+        ).where(Booking.verification_code == verification_code),
+        select(
+            literal_column("'ticket'"),
+            Ticket.id,
+            Ticket.ticket_no,
+            Ticket.status,
+            Ticket.is_cancelled,
+            Ticket.route_id,
+            Ticket.branch_id,
+            Ticket.ticket_date,
+            Ticket.departure,
+            Ticket.net_amount,
+            Ticket.checked_in_at,
+            Ticket.verification_code,
+            Ticket.created_at,
+            Ticket.boat_id,
+        ).where(Ticket.verification_code == verification_code),
+    ).subquery("hit")
+
+    lines = union_all(
+        select(
+            literal_column("'booking'").label("source"),
+            BookingItem.booking_id.label("parent_id"),
+            BookingItem.id.label("line_id"),
+            BookingItem.item_id,
+            BookingItem.quantity,
+            BookingItem.vehicle_no,
+        )
+        .join(Booking, Booking.id == BookingItem.booking_id)
+        .where(Booking.verification_code == verification_code, BookingItem.is_cancelled == False),
+        select(
+            literal_column("'ticket'"),
+            TicketItem.ticket_id,
+            TicketItem.id,
+            TicketItem.item_id,
+            TicketItem.quantity,
+            TicketItem.vehicle_no,
+        )
+        .join(Ticket, Ticket.id == TicketItem.ticket_id)
+        .where(Ticket.verification_code == verification_code, TicketItem.is_cancelled == False),
+    ).subquery("lines")
 
-    # Fetch items
-    items_result = await db.execute(
-        select(BookingItem).where(
-            BookingItem.booking_id == booking.id,
-            BookingItem.is_cancelled == False,
+    BranchOne = aliased(Branch)
+    BranchTwo = aliased(Branch)
+    return (
+        select(
+            hit,
+            BranchOne.name.label("branch_one_name"),
+            BranchTwo.name.label("branch_two_name"),
+            Branch.name.label("branch_name"),
+            Boat.name.label("boat_name"),
+            lines.c.line_id,
+            lines.c.quantity,
+            lines.c.vehicle_no,
+            Item.name.label("item_name"),
+            Item.is_vehicle,
         )
+        .select_from(hit)
+        .outerjoin(Route, Route.id == hit.c.route_id)
+        .outerjoin(BranchOne, BranchOne.id == Route.branch_id_one)
+        .outerjoin(BranchTwo, BranchTwo.id == Route.branch_id_two)
+        .outerjoin(Branch, Branch.id == hit.c.branch_id)
+        .outerjoin(Boat, Boat.id == hit.c.boat_id)
+        .outerjoin(lines, and_(lines.c.source == hit.c.source, lines.c.parent_id == hit.c.id))
+        .outerjoin(Item, Item.id == lines.c.item_id)
+        .order_by(hit.c.source, lines.c.line_id)
     )
-    booking_items = items_result.scalars().all()
 
+
+async def _fetch_by_code(db: AsyncSession, verification_code: uuid.UUID) -> dict[str, list]:
+    """Rows of `_by_code_statement`, grouped by source ('booking' / 'ticket')."""
+    result = await db.execute(_by_code_statement(verification_code))
+    grouped: dict[str, list] = {}
+    for row in result.all():
+        grouped.setdefault(row.source, []).append(row)
+    return grouped
+
+
+def _result_from_rows(rows: list) -> dict:
+    """Build a verification result dict from one source's rows."""
+    head = rows[0]
     items = []
     passenger_count = 0
-    for bi in booking_items:
-        details = await _get_item_details(db, bi.item_id)
+    for row in rows:
+        if row.line_id is None:
+            continue
+        is_vehicle = bool(row.is_vehicle)
         items.append({
-            "item_name": details["name"],
-            "quantity": bi.quantity,
-            "is_vehicle": details["is_vehicle"],
-            "vehicle_no": bi.vehicle_no,
+            "item_name": row.item_name if row.item_name is not None else "Unknown",
+            "quantity": row.quantity,
+            "is_vehicle": is_vehicle,
+            "vehicle_no": row.vehicle_no,
         })
-        if not details["is_vehicle"]:
-            passenger_count += bi.quantity
-
-    route_name = await _get_route_display_name(db, booking.route_id)
-    branch_name = await _get_branch_name(db, booking.branch_id)
-
-    return {
-        "source": "booking",
-        "id": booking.id,
-        "reference_no": booking.booking_no,
-        "status": booking.status,
+        if not is_vehicle:
+            passenger_count += row.quantity
+
+    route_name = None
+    if head.branch_one_name is not None and head.branch_two_name is not None:
+        route_name = f"{head.branch_one_name} - {head.branch_two_name}"
+
+    result = {
+        "source": head.source,
+        "id": head.id,
+        "reference_no": head.reference_no,
+        "status": head.status,
         "route_name": route_name,
-        "branch_name": branch_name,
-        "travel_date": booking.travel_date,
-        "departure": _format_time(booking.departure),
-        "net_amount": float(booking.net_amount) if booking.net_amount else 0,
+        "branch_name": head.branch_name,
+        "travel_date": head.travel_date,
+        "departure": _format_time(head.departure),
+        "net_amount": float(head.net_amount) if head.net_amount else 0,
         "passenger_count": passenger_count,
         "items": items,
-        "checked_in_at": booking.checked_in_at,
-        "verification_code": str(booking.verification_code) if booking.verification_code else None,
+        "checked_in_at": head.checked_in_at,
+        "verification_code": str(head.verification_code) if head.verification_code else None,
     }
+    if head.source == "ticket":
+        if head.is_cancelled or head.status == "CANCELLED":
+            result["status"] = "CANCELLED"
+        result["boat_name"] = head.boat_name
+    return result
+
+
+async def lookup_booking_by_code(db: AsyncSession, verification_code: uuid.UUID, user: User) -> dict:
+    """Look up a booking by its QR verification code."""
+    rows = (await _fetch_by_code(db, verification_code)).get("booking")
+    if not rows:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Booking not found for this verification code",
+        )
+
+    check_route_access(user, rows[0].route_id)
+    return _result_from_rows(rows)
 
 
 def _ticket_status(ticket: Ticket) -> str:
@@ -188,47 +298,53 @@ async def _build_ticket_result(db: AsyncSession, ticket: Ticket) -> dict:
     }
 
 
-async def lookup_ticket_by_code(db: AsyncSession, verification_code: uuid.UUID, user: User) -> dict | None:
-    """Look up a ticket by its QR verification code. Returns None if not found (no exception)."""
-    result = await db.execute(
-        select(Ticket).where(Ticket.verification_code == verification_code)
-    )
-    ticket = result.scalar_one_or_none()
-    if not ticket:
+def _ticket_from_rows(rows: list | None, verification_code: uuid.UUID, user: User) -> dict | None:
+    if not rows:
         return None
+    head = rows[0]
     log.info(
         "SCAN ticket_lookup id=%s ticket_no=%s db_status=%r is_cancelled=%s checked_in_at=%s created_at=%s code=%s",
-        ticket.id, ticket.ticket_no, ticket.status, ticket.is_cancelled,
-        ticket.checked_in_at, ticket.created_at, verification_code,
+        head.id, head.reference_no, head.status, head.is_cancelled,
+        head.checked_in_at, head.created_at, verification_code,
     )
-    if is_before_cutoff(ticket.ticket_date, user.role):
+    if is_before_cutoff(head.travel_date, user.role):
         return None
-    _check_route_access(user, ticket.route_id)
-    return await _build_ticket_result(db, ticket)
+    check_route_access(user, head.route_id)
+    return _result_from_rows(rows)
+
+
+async def lookup_ticket_by_code(db: AsyncSession, verification_code: uuid.UUID, user: User) -> dict | None:
+    """Look up a ticket by its QR verification code. Returns None if not found (no exception)."""
+    rows = (await _fetch_by_code(db, verification_code)).get("ticket")
+    return _ticket_from_rows(rows, verification_code, user)
 
 
 async def lookup_by_code(db: AsyncSession, verification_code: uuid.UUID, user: User) -> dict:
-    """Look up a booking or ticket by verification code. Tries booking first, then ticket."""
+    """Look up a booking or ticket by verification code. Booking wins if both match.
+
+    One round-trip: both sources come back from `_by_code_statement`.
+    """
     log.info(
         "SCAN lookup_by_code code=%s checker=%s (role=%s)",
         verification_code, user.username, user.role,
     )
-
-    # Try booking first
-    result = await db.execute(
-        select(Booking).where(Booking.verification_code == verification_code)
-    )
-    booking = result.scalar_one_or_none()
-    if booking:
+    scan_guard.check_not_missing(verification_code)
+    grouped = await _fetch_by_code(db, verification_code)
+    if not grouped:
+        scan_guard.remember_missing(verification_code)
+
+    booking_rows = grouped.get("booking")
+    if booking_rows:
+        head = booking_rows[0]
         log.info(
             "SCAN matched BOOKING id=%s booking_no=%s status=%s checked_in_at=%s code=%s",
-            booking.id, booking.booking_no, booking.status,
-            booking.checked_in_at, verification_code,
+            head.id, head.reference_no, head.status,
+            head.checked_in_at, verification_code,
         )
-        return await lookup_booking_by_code(db, verification_code, user)
+        check_route_access(user, head.route_id)
+        return _result_from_rows(booking_rows)
 
-    # Try ticket
-    ticket_result = await lookup_ticket_by_code(db, verification_code, user)
+    ticket_result = _ticket_from_rows(grouped.get("ticket"), verification_code, user)
     if ticket_result:
         log.info(
             "SCAN matched TICKET id=%s ticket_no=%s status=%s checked_in_at=%s code=%s",
@@ -245,17 +361,67 @@ async def lookup_by_code(db: AsyncSession, verification_code: uuid.UUID, user: U
     )
 
 
-async def verify(db: AsyncSession, verification_code: uuid.UUID, current_user: User) -> dict:
-    """Unified verify (check-in) for both bookings and tickets.
-    Sets status to VERIFIED and records checked_in_at timestamp.
-    QR codes can only be scanned once."""
+def _check_in_where(model, code, user: User) -> list:
+    """Conditions under which a booking/ticket row can still be checked in.
+
+    Not cancelled, not pending, not yet verified, and on the checker's
+    route. A ticket is only eligible when no booking carries the code
+    (bookings take precedence, as in lookups).
+    """
+    where = [
+        model.verification_code == code,
+        model.checked_in_at.is_(None),
+        model.is_cancelled == False,
+    ]
+    if model is Booking:
+        where.append(Booking.status.notin_(("CANCELLED", "PENDING", "VERIFIED")))
+    else:
+        where.append(Ticket.status.notin_(("CANCELLED", "VERIFIED")))
+        where.append(~exists().where(Booking.verification_code == code))
+    if user.role not in _ROUTE_BYPASS_ROLES:
+        # A checker without a route matches nothing (route_id IS NULL); the
+        # diagnostic read then reports the 403
+        where.append(model.route_id == user.route_id)
+    return where
+
+
+def _check_in_cte(model, where: list, checked_in_at, name: str):
+    source = "booking" if model is Booking else "ticket"
+    return (
+        update(model)
+        .where(*where)
+        .values(status="VERIFIED", checked_in_at=checked_in_at)
+        .returning(
+            literal_column(f"'{source}'").label("source"),
+            model.verification_code,
+            model.id,
+            (model.booking_no if model is Booking else model.ticket_no).label("reference_no"),
+            model.checked_in_at,
+        )
+        .cte(name)
+    )
 
-    log.info(
-        "CHECK-IN verify code=%s checker=%s (role=%s)",
-        verification_code, current_user.username, current_user.role,
+
+def _check_in_statement(verification_code: uuid.UUID, user: User):
+    """Check-in as one conditional UPDATE per source, in a single statement.
+
+    Each writable CTE only matches a row that can still be checked in
+    (`_check_in_where`). Two scans of the same code serialise on the row
+    lock, and the loser's WHERE no longer matches once the winner commits.
+
+    Returns one row ('booking' or 'ticket') on success, none otherwise.
+    """
+    checked_booking = _check_in_cte(
+        Booking, _check_in_where(Booking, verification_code, user), func.now(), "checked_booking",
     )
+    checked_ticket = _check_in_cte(
+        Ticket, _check_in_where(Ticket, verification_code, user), func.now(), "checked_ticket",
+    )
+    return union_all(select(checked_booking), select(checked_ticket))
+
 
-    # Try booking first
+async def _explain_check_in_miss(db: AsyncSession, verification_code: uuid.UUID, current_user: User):
+    """The check-in UPDATE matched nothing: read the row and raise the reason."""
     result = await db.execute(
         select(Booking).where(Booking.verification_code == verification_code)
     )
@@ -266,8 +432,7 @@ async def verify(db: AsyncSession, verification_code: uuid.UUID, current_user: U
             "CHECK-IN matched BOOKING id=%s booking_no=%s status=%s checked_in_at=%s",
             booking.id, booking.booking_no, booking.status, booking.checked_in_at,
         )
-        # Route access check
-        _check_route_access(current_user, booking.route_id)
+        check_route_access(current_user, booking.route_id)
 
         if booking.is_cancelled or booking.status == "CANCELLED":
             raise HTTPException(
@@ -279,31 +444,15 @@ async def verify(db: AsyncSession, verification_code: uuid.UUID, current_user: U
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Payment pending — cannot verify until payment is confirmed",
             )
-        if booking.status == "VERIFIED":
-            log.warning(
-                "CHECK-IN ALREADY VERIFIED booking id=%s at %s — duplicate attempt by %s",
-                booking.id, booking.checked_in_at, current_user.username,
-            )
-            raise HTTPException(
-                status_code=status.HTTP_409_CONFLICT,
-                detail=f"Already verified at {booking.checked_in_at.isoformat() if booking.checked_in_at else 'unknown'}",
-            )
-
-        now = datetime.datetime.now(datetime.timezone.utc)
-        booking.status = "VERIFIED"
-        booking.checked_in_at = now
-        await db.flush()
-        log.info("CHECK-IN OK booking id=%s verified at %s by %s", booking.id, now, current_user.username)
-
-        return {
-            "message": "Booking verified successfully",
-            "source": "booking",
-            "id": booking.id,
-            "reference_no": booking.booking_no,
-            "checked_in_at": now,
-        }
+        log.warning(
+            "CHECK-IN ALREADY VERIFIED booking id=%s at %s — duplicate attempt by %s",
+            booking.id, booking.checked_in_at, current_user.username,
+        )
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Already verified at {booking.checked_in_at.isoformat() if booking.checked_in_at else 'unknown'}",
+        )
 
-    # Try ticket
     ticket_result = await db.execute(
         select(Ticket).where(Ticket.verification_code == verification_code)
     )
@@ -315,48 +464,162 @@ async def verify(db: AsyncSession, verification_code: uuid.UUID, current_user: U
             "CHECK-IN matched TICKET id=%s ticket_no=%s db_status=%s effective_status=%s checked_in_at=%s",
             ticket.id, ticket.ticket_no, ticket.status, effective_status, ticket.checked_in_at,
         )
-        # Route access check
-        _check_route_access(current_user, ticket.route_id)
+        check_route_access(current_user, ticket.route_id)
 
         if effective_status == "CANCELLED":
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Cannot verify a cancelled ticket",
             )
-        if effective_status == "VERIFIED":
-            log.warning(
-                "CHECK-IN ALREADY VERIFIED ticket id=%s ticket_no=%s at %s — duplicate attempt by %s",
-                ticket.id, ticket.ticket_no, ticket.checked_in_at, current_user.username,
-            )
-            raise HTTPException(
-                status_code=status.HTTP_409_CONFLICT,
-                detail=f"Already verified at {ticket.checked_in_at.isoformat() if ticket.checked_in_at else 'unknown'}",
-            )
-
-        now = datetime.datetime.now(datetime.timezone.utc)
-        ticket.status = "VERIFIED"
-        ticket.checked_in_at = now
-        await db.flush()
-        log.info(
-            "CHECK-IN OK ticket id=%s ticket_no=%s verified at %s by %s",
-            ticket.id, ticket.ticket_no, now, current_user.username,
+        log.warning(
+            "CHECK-IN ALREADY VERIFIED ticket id=%s ticket_no=%s at %s — duplicate attempt by %s",
+            ticket.id, ticket.ticket_no, ticket.checked_in_at, current_user.username,
+        )
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Already verified at {ticket.checked_in_at.isoformat() if ticket.checked_in_at else 'unknown'}",
         )
-
-        return {
-            "message": "Ticket verified successfully",
-            "source": "ticket",
-            "id": ticket.id,
-            "reference_no": ticket.ticket_no,
-            "checked_in_at": now,
-        }
 
     log.warning("CHECK-IN no match found for code=%s", verification_code)
+    scan_guard.remember_missing(verification_code)
     raise HTTPException(
         status_code=status.HTTP_404_NOT_FOUND,
         detail="No booking or ticket found for this verification code",
     )
 
 
+async def verify(db: AsyncSession, verification_code: uuid.UUID, current_user: User) -> dict:
+    """Unified verify (check-in) for both bookings and tickets.
+    Sets status to VERIFIED and records checked_in_at timestamp.
+    QR codes can only be scanned once: the check-in is a single conditional
+    UPDATE, so concurrent scans of one code yield exactly one success."""
+
+    log.info(
+        "CHECK-IN verify code=%s checker=%s (role=%s)",
+        verification_code, current_user.username, current_user.role,
+    )
+    scan_guard.check_not_missing(verification_code)
+    result = await db.execute(_check_in_statement(verification_code, current_user))
+    row = result.one_or_none()
+    if row is None:
+        await _explain_check_in_miss(db, verification_code, current_user)
+
+    log.info(
+        "CHECK-IN OK %s id=%s ref_no=%s verified at %s by %s",
+        row.source, row.id, row.reference_no, row.checked_in_at, current_user.username,
+    )
+    return {
+        "message": f"{row.source.capitalize()} verified successfully",
+        "source": row.source,
+        "id": row.id,
+        "reference_no": row.reference_no,
+        "checked_in_at": row.checked_in_at,
+    }
+
+
+def _bulk_check_in_statement(scans: list[tuple[uuid.UUID, datetime.datetime]], user: User):
+    """`_check_in_statement` for many codes: UPDATE ... FROM (VALUES ...).
+
+    Each row is stamped with its offline scan time instead of now().
+    """
+    rows = values(
+        column("code", UUID(as_uuid=True)),
+        column("scanned_at", DateTime(timezone=True)),
+        name="scans",
+    ).data(scans)
+    checked_booking = _check_in_cte(
+        Booking, _check_in_where(Booking, rows.c.code, user), rows.c.scanned_at, "checked_booking",
+    )
+    checked_ticket = _check_in_cte(
+        Ticket, _check_in_where(Ticket, rows.c.code, user), rows.c.scanned_at, "checked_ticket",
+    )
+    return union_all(select(checked_booking), select(checked_ticket))
+
+
+def _miss_reason(row, user: User) -> str:
+    """Why an offline scan was not applied (mirrors `_explain_check_in_miss`)."""
+    if user.role not in _ROUTE_BYPASS_ROLES and (user.route_id is None or user.route_id != row.route_id):
+        return "forbidden"
+    if row.is_cancelled or row.status == "CANCELLED":
+        return "cancelled"
+    if row.status == "PENDING":
+        return "pending"
+    return "already_verified"
+
+
+async def bulk_check_in(db: AsyncSession, scans: list, current_user: User) -> dict:
+    """Apply check-ins queued offline (see offline_manifest_service).
+
+    Idempotent: a code already checked in, by this upload's earlier retry
+    or by another checker, is reported as `already_verified` with its
+    recorded time rather than failing the batch. Each code is stamped with
+    its earliest scan time, capped at now.
+    """
+    now = datetime.datetime.now(datetime.timezone.utc)
+    earliest: dict[uuid.UUID, datetime.datetime] = {}
+    for scan in scans:
+        at = scan.scanned_at or now
+        if at.tzinfo is None:
+            at = at.replace(tzinfo=datetime.timezone.utc)
+        at = min(at, now)
+        if scan.verification_code not in earliest or at < earliest[scan.verification_code]:
+            earliest[scan.verification_code] = at
+
+    results: dict[uuid.UUID, dict] = {}
+    applied = await db.execute(_bulk_check_in_statement(list(earliest.items()), current_user))
+    for row in applied.all():
+        results[row.verification_code] = {
+            "verification_code": row.verification_code,
+            "result": "verified",
+            "source": row.source,
+            "id": row.id,
+            "reference_no": row.reference_no,
+            "checked_in_at": row.checked_in_at,
+        }
+
+    missed = [code for code in earliest if code not in results]
+    if missed:
+        found = await db.execute(
+            union_all(
+                select(
+                    literal_column("'booking'").label("source"), Booking.verification_code, Booking.id,
+                    Booking.booking_no.label("reference_no"), Booking.status, Booking.is_cancelled,
+                    Booking.route_id, Booking.checked_in_at,
+                ).where(Booking.verification_code.in_(missed)),
+                select(
+                    literal_column("'ticket'"), Ticket.verification_code, Ticket.id,
+                    Ticket.ticket_no, Ticket.status, Ticket.is_cancelled,
+                    Ticket.route_id, Ticket.checked_in_at,
+                ).where(Ticket.verification_code.in_(missed)),
+            )
+        )
+        for row in found.all():
+            # Bookings take precedence over a ticket with the same code
+            if row.verification_code in results and row.source == "ticket":
+                continue
+            results[row.verification_code] = {
+                "verification_code": row.verification_code,
+                "result": _miss_reason(row, current_user),
+                "source": row.source,
+                "id": row.id,
+                "reference_no": row.reference_no,
+                "checked_in_at": row.checked_in_at,
+            }
+    for code in missed:
+        results.setdefault(code, {"verification_code": code, "result": "not_found"})
+
+    counts = Counter(r["result"] for r in results.values())
+    log.info(
+        "CHECK-IN bulk by %s: %d scans, %s",
+        current_user.username, len(earliest), dict(counts),
+    )
+    return {
+        "applied": counts.get("verified", 0),
+        "counts": dict(counts),
+        "results": [results[code] for code in earliest],
+    }
+
+
 async def lookup_booking_by_number(
     db: AsyncSession, booking_no: int, user: User, branch_id: int | None = None
 ) -> dict:
@@ -374,7 +637,7 @@ async def lookup_booking_by_number(
             detail=f"Booking #{booking_no} not found",
         )
 
-    _check_route_access(user, booking.route_id)
+    check_route_access(user, booking.route_id)
 
     # Fetch items
     items_result = await db.execute(
@@ -435,6 +698,6 @@ async def lookup_ticket_by_number(
             detail=f"Ticket #{ticket_no} not found for branch {branch_id}",
         )
 
-    _check_route_access(user, ticket.route_id)
+    check_route_access(user, ticket.route_id)
 
     return await _build_ticket_result(db, ticket)
@@ -17,9 +17,12 @@ keepalive = 5
 # Graceful restart timeout
 graceful_timeout = 30
 
-# Restart workers periodically to prevent memory leaks
-max_requests = 5000
-max_requests_jitter = 500
+# Workers are recycled on memory, not request count: each worker restarts
+# itself once its RSS stays above WORKER_MAX_RSS_MB (app/core/memory.py).
+# Fixed max_requests restarts threw away warm caches and DB pools at random
+# moments mid-peak. GUNICORN_MAX_REQUESTS re-enables them as a fallback.
+max_requests = int(os.environ.get("GUNICORN_MAX_REQUESTS", "0"))
+max_requests_jitter = max_requests // 10
 
 # Logging
 accesslog = "-"
@@ -35,3 +38,9 @@ preload_app = True
 # IPs within it is acceptable. If deploying outside Docker, set FORWARDED_ALLOW_IPS
 # to the specific nginx IP address(es).
 forwarded_allow_ips = os.environ.get("FORWARDED_ALLOW_IPS", "*")
+
+
+def post_fork(server, worker):
+    # Lets the app know it may SIGTERM itself for RSS recycling; the
+    # master will fork a replacement.
+    os.environ["SSMSPL_GUNICORN_WORKER"] = "1"
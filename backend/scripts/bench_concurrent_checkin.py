@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Concurrent check-in race: N checkers scan the same QR at once
+=============================================================
+Fires --concurrency simultaneous verification_service.verify() calls for
+one verification code, each in its own session/transaction (as separate
+gangway scanners would), and checks that exactly one succeeds while every
+other scan gets 409 "Already verified".
+
+Needs a real database (DATABASE_URL, dev/staging only) holding a
+booking or ticket with that code. --reset first puts the row back to
+CONFIRMED / not checked in, so the script can be re-run on the same code.
+
+Usage:
+    python scripts/bench_concurrent_checkin.py --code <uuid> --reset
+    python scripts/bench_concurrent_checkin.py --code <uuid> --reset --concurrency 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+import time
+import uuid
+from collections import Counter
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+async def _reset(code: uuid.UUID) -> None:
+    from sqlalchemy import update
+
+    from app.database import AsyncSessionLocal
+    from app.models.booking import Booking
+    from app.models.ticket import Ticket
+
+    async with AsyncSessionLocal() as db:
+        for model in (Booking, Ticket):
+            await db.execute(
+                update(model)
+                .where(model.verification_code == code, model.status == "VERIFIED")
+                .values(status="CONFIRMED", checked_in_at=None)
+            )
+        await db.commit()
+
+
+async def _scan(code: uuid.UUID, checker: SimpleNamespace, start: asyncio.Event) -> str:
+    from fastapi import HTTPException
+
+    from app.database import AsyncSessionLocal
+    from app.services import verification_service
+
+    async with AsyncSessionLocal() as db:
+        await start.wait()
+        try:
+            await verification_service.verify(db, code, checker)
+            await db.commit()
+            return "200"
+        except HTTPException as e:
+            await db.rollback()
+            return str(e.status_code)
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--code", type=uuid.UUID, required=True)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--reset", action="store_true", help="un-verify the row before the run")
+    args = parser.parse_args()
+
+    from app.core.rbac import UserRole
+    from app.database import dispose_engine, get_engine
+
+    get_engine().echo = False
+    if args.reset:
+        await _reset(args.code)
+
+    checker = SimpleNamespace(id=uuid.uuid4(), username="race-bench", role=UserRole.SUPER_ADMIN, route_id=None)
+    start = asyncio.Event()
+    tasks = [asyncio.create_task(_scan(args.code, checker, start)) for _ in range(args.concurrency)]
+    await asyncio.sleep(0.1)
+    t0 = time.perf_counter()
+    start.set()
+    outcomes = Counter(await asyncio.gather(*tasks))
+    elapsed = time.perf_counter() - t0
+    await dispose_engine()
+
+    print(f"{args.concurrency} concurrent scans in {elapsed * 1000:.0f} ms: "
+          + ", ".join(f"{status} x{n}" for status, n in sorted(outcomes.items())))
+    ok = outcomes["200"] == 1 and outcomes["409"] == args.concurrency - 1
+    print("PASS: exactly one check-in" if ok else "FAIL: expected one 200 and the rest 409")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -462,10 +462,14 @@ BEGIN
 END;
 $$ LANGUAGE plpgsql;
 
+-- Heartbeat flushes change only session_last_active and must not stamp
+-- updated_at (app/services/heartbeat_service.py)
 DROP TRIGGER IF EXISTS set_users_updated_at ON users;
 CREATE TRIGGER set_users_updated_at
     BEFORE UPDATE ON users
     FOR EACH ROW
+    WHEN ((to_jsonb(OLD) - 'session_last_active' - 'updated_at')
+          IS DISTINCT FROM (to_jsonb(NEW) - 'session_last_active' - 'updated_at'))
     EXECUTE FUNCTION update_updated_at_column();
 
 -- ============================================================
@@ -0,0 +1,44 @@
+"""Shared fixtures for the backend tests.
+
+Tests that touch the database skip their whole module when DATABASE_URL is
+not set; point it at a disposable dev database (never production). App
+modules are imported inside the fixtures, since app.config needs the
+environment to load.
+"""
+import os
+from types import SimpleNamespace
+
+import pytest
+
+requires_db = pytest.mark.skipif(not os.getenv("DATABASE_URL"), reason="DATABASE_URL not set")
+
+
+@pytest.fixture(scope="session")
+async def engine():
+    from app.database import dispose_engine, get_engine
+
+    engine = get_engine()
+    engine.echo = False
+    yield engine
+    await dispose_engine()
+
+
+@pytest.fixture
+def super_admin():
+    from app.core.rbac import UserRole
+
+    return SimpleNamespace(id=None, role=UserRole.SUPER_ADMIN, route_id=None, username="pytest")
+
+
+@pytest.fixture
+async def client(engine, super_admin):
+    """ASGI client for the full app (middleware included), signed in as SUPER_ADMIN."""
+    import httpx
+
+    from app.dependencies import get_current_user
+    from app.main import app
+
+    app.dependency_overrides[get_current_user] = lambda: super_admin
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        yield client
+    app.dependency_overrides.pop(get_current_user, None)
@@ -0,0 +1,88 @@
+"""Concurrent check-in: N scans of one QR at once yield exactly one success.
+
+Mirrors scripts/bench_concurrent_checkin.py. The fixture inserts its own
+ticket (a negative id, dated 2000-01-01, so it can never collide with or
+be mistaken for a real one) and deletes it afterwards; existing rows are
+only read, for foreign keys.
+"""
+import asyncio
+import datetime
+import uuid
+from collections import Counter
+from types import SimpleNamespace
+
+import pytest
+
+from tests.conftest import requires_db
+
+pytestmark = [requires_db, pytest.mark.asyncio(loop_scope="session")]
+
+CONCURRENCY = 10
+
+
+async def _scan(code: uuid.UUID, checker, start: asyncio.Event) -> int:
+    from fastapi import HTTPException
+
+    from app.database import AsyncSessionLocal
+    from app.services import verification_service
+
+    async with AsyncSessionLocal() as db:
+        await start.wait()
+        try:
+            await verification_service.verify(db, code, checker)
+            await db.commit()
+            return 200
+        except HTTPException as e:
+            await db.rollback()
+            return e.status_code
+
+
+@pytest.fixture
+async def new_ticket(engine):
+    from sqlalchemy import delete, select
+
+    from app.database import AsyncSessionLocal
+    from app.models.branch import Branch
+    from app.models.payment_mode import PaymentMode
+    from app.models.route import Route
+    from app.models.ticket import Ticket
+
+    async with AsyncSessionLocal() as db:
+        refs = (await db.execute(
+            select(
+                select(Route.id).limit(1).scalar_subquery(),
+                select(Branch.id).limit(1).scalar_subquery(),
+                select(PaymentMode.id).limit(1).scalar_subquery(),
+            )
+        )).one()
+    if None in refs:
+        pytest.skip("needs a route, a branch and a payment mode in the database")
+    route_id, branch_id, payment_mode_id = refs
+
+    ticket_id = -(uuid.uuid4().int % 2**62) - 1
+    code = uuid.uuid4()
+    async with AsyncSessionLocal() as db:
+        db.add(Ticket(
+            id=ticket_id, branch_id=branch_id, ticket_no=0, ticket_date=datetime.date(2000, 1, 1),
+            route_id=route_id, amount=0, discount=0, payment_mode_id=payment_mode_id,
+            is_cancelled=False, net_amount=0, status="CONFIRMED", verification_code=code,
+        ))
+        await db.commit()
+    try:
+        yield code
+    finally:
+        async with AsyncSessionLocal() as db:
+            await db.execute(delete(Ticket).where(Ticket.id == ticket_id))
+            await db.commit()
+
+
+async def test_concurrent_verify_checks_in_once(new_ticket):
+    from app.core.rbac import UserRole
+
+    checker = SimpleNamespace(id=uuid.uuid4(), username="pytest", role=UserRole.SUPER_ADMIN, route_id=None)
+    start = asyncio.Event()
+    tasks = [asyncio.create_task(_scan(new_ticket, checker, start)) for _ in range(CONCURRENCY)]
+    await asyncio.sleep(0.1)
+    start.set()
+    outcomes = Counter(await asyncio.gather(*tasks))
+    assert outcomes == {200: 1, 409: CONCURRENCY - 1}
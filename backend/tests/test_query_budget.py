@@ -0,0 +1,43 @@
+"""Query budgets for the hot verification endpoints (app/core/query_stats.py)."""
+import uuid
+
+import pytest
+
+from tests.conftest import requires_db
+
+pytestmark = [requires_db, pytest.mark.asyncio(loop_scope="session")]
+
+
+def _signed(code: uuid.UUID) -> str:
+    from app.services.qr_service import generate_qr_payload
+
+    return generate_qr_payload(str(code))
+
+
+async def test_scan_miss_is_one_query_then_cached(client):
+    from app.core.query_stats import query_budget
+
+    payload = _signed(uuid.uuid4())
+    with query_budget(1):
+        r = await client.get("/api/verification/scan", params={"payload": payload})
+    assert r.status_code == 404
+    # The negative cache answers the repeat scan without the database
+    with query_budget(0):
+        r = await client.get("/api/verification/scan", params={"payload": payload})
+    assert r.status_code == 404
+
+
+async def test_check_in_miss_budget(client):
+    from app.core.query_stats import query_budget
+
+    with query_budget(3):
+        r = await client.post("/api/verification/check-in", json={"verification_code": str(uuid.uuid4())})
+    assert r.status_code == 404
+
+
+async def test_budget_counts_queries_inside_the_request(client):
+    from app.core.query_stats import QueryBudgetExceeded, query_budget
+
+    with pytest.raises(QueryBudgetExceeded):
+        with query_budget(0):
+            await client.get("/api/verification/scan", params={"payload": _signed(uuid.uuid4())})
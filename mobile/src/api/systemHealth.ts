@@ -35,6 +35,16 @@ export type ReplicationStatus = {
   subscriptions?: { name: string; enabled: boolean; alive: boolean; lag_s: number; severity: Severity }[];
   severity?: Severity;
 };
+export type EventLoopStall = {
+  at: string; task: string | null; blocked_ms: number | null; stack: string;
+};
+export type EventLoopStatus = {
+  running: boolean; interval_ms: number; threshold_ms: number; window_s: number;
+  lag_p99_ms: number | null; lag_max_ms: number | null;
+  stalls_total: number; stalls_in_window: number;
+  recent_stalls: EventLoopStall[];
+  severity: Severity; error?: string;
+};
 
 export type StatusSnapshot = {
   server: string;
@@ -47,6 +57,8 @@ export type StatusSnapshot = {
   today: TodayActivity;
   ticketing: TicketingStatus;
   replication: ReplicationStatus;
+  // Absent on servers older than the loop watchdog
+  event_loop?: EventLoopStatus;
   overall_severity: Severity;
 };
 
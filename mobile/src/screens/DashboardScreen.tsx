@@ -13,6 +13,7 @@ import {
 import {
   fetchEvents,
   fetchStatus,
+  type EventLoopStatus,
   type HealthEvent,
   type StatusSnapshot,
 } from '../api/systemHealth';
@@ -348,6 +349,14 @@ export default function DashboardScreen({
             </View>
           </View>
 
+          {snapshot.event_loop && (
+            <HealthTile
+              title="Event loop (this worker)"
+              severity={snapshot.event_loop.severity}
+              rows={eventLoopRows(snapshot.event_loop)}
+            />
+          )}
+
           <Text style={styles.sectionTitle}>Database</Text>
           <HealthTile
             title="Connections"
@@ -498,6 +507,33 @@ function JumpCard({
   );
 }
 
+function eventLoopRows(loop: EventLoopStatus): { label: string; value: string }[] {
+  if (loop.error) return [{ label: 'Error', value: loop.error.slice(0, 60) }];
+  const mins = Math.round(loop.window_s / 60);
+  const rows = [
+    { label: `Lag p99 · ${mins} min`, value: loop.lag_p99_ms == null ? '—' : `${loop.lag_p99_ms} ms` },
+    { label: `Max lag · ${mins} min`, value: loop.lag_max_ms == null ? '—' : `${loop.lag_max_ms} ms` },
+    { label: 'Stalls', value: `${loop.stalls_in_window} recent · ${loop.stalls_total} total` },
+  ];
+  const last = loop.recent_stalls[0];
+  if (last) {
+    rows.push({
+      label: 'Last stall',
+      value: `${last.blocked_ms ?? '?'} ms · ${last.task ?? 'no task'}`,
+    });
+    rows.push({ label: 'Blocked in', value: innermostFrame(last.stack) });
+  }
+  return rows;
+}
+
+// Last "File ..., line N, in fn" of a Python stack → "file.py:N fn"
+function innermostFrame(stack: string): string {
+  const frames = [...stack.matchAll(/File "([^"]+)", line (\d+), in (\S+)/g)];
+  const f = frames[frames.length - 1];
+  if (!f) return '—';
+  return `${f[1].split('/').pop()}:${f[2]} ${f[3]}`;
+}
+
 function statusHeadline(sev: string, crits: number): string {
   if (sev === 'CRIT' || crits > 0) return crits > 0 ? `${crits} CRITICAL alert${crits === 1 ? '' : 's'}` : 'Critical issue';
   if (sev === 'WARN') return 'Degraded — needs attention';